@@ -0,0 +1,84 @@
+"""Render all README trees in one process, so they share a single directory scan.
+
+Sections are reused from the cache in tree.py while the scanned directories,
+the descriptions, and the renderer are unchanged, so an up-to-date README
+costs a few stats. test.sh runs `--check`.
+
+    python .github/scripts/all_trees.py            # print every section
+    python .github/scripts/all_trees.py --update   # splice changed sections into README.md
+    python .github/scripts/all_trees.py --check    # exit 1 if README.md is out of date
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+import repo_structure
+import shell_files
+import utility_scripts
+
+README = Path("README.md")
+GENERATORS = {
+    "repo_structure": repo_structure,
+    "shell_files": shell_files,
+    "utility_scripts": utility_scripts,
+}
+
+
+def _section(name: str) -> re.Pattern:
+    """The generated output of `name` in the README, between its markers."""
+    return re.compile(
+        rf"(<!-- python3 \.github/scripts/{name}\.py -->\n<!-- CODE:END -->\n\n"
+        r"<!-- OUTPUT:START -->\n<!-- .*? -->\n)(.*?)(\n\n<!-- OUTPUT:END -->)",
+        re.DOTALL,
+    )
+
+
+def splice(readme: str, name: str, output: str) -> str:
+    """Replace the generated output of `name` in `readme`."""
+    pattern = _section(name)
+    if not pattern.search(readme):
+        sys.exit(f"❌ No section for {name}.py in {README}")
+    return pattern.sub(lambda m: m.group(1) + output + m.group(3), readme, count=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render the README trees.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--update", action="store_true", help="Write changed sections to README.md."
+    )
+    mode.add_argument(
+        "--check", action="store_true", help="Exit 1 if README.md is out of date."
+    )
+    args = parser.parse_args()
+
+    outputs = {name: generator.render() for name, generator in GENERATORS.items()}
+    if not (args.update or args.check):
+        for output in outputs.values():
+            print(output)
+        return
+
+    readme = README.read_text()
+    updated = readme
+    for name, output in outputs.items():
+        updated = splice(updated, name, output)
+    stale = [
+        name
+        for name in outputs
+        if _section(name).search(readme).group(2) != outputs[name]
+    ]
+    if args.check:
+        if stale:
+            print(f"❌ Out of date in {README}: {', '.join(stale)}")
+            print("Run `python .github/scripts/all_trees.py --update`.")
+            sys.exit(1)
+        return
+    if updated != readme:
+        README.write_text(updated)
+        print(f"✅ Updated {', '.join(stale)} in {README}")
+
+
+if __name__ == "__main__":
+    main()
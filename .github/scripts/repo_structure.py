@@ -1,4 +1,4 @@
-from tree import print_with_comments, list_files
+from tree import render_section
 
 # Directory and file descriptions
 descriptions = {
@@ -37,8 +37,18 @@ descriptions = {
 }
 
 
+def render() -> str:
+    return render_section(
+        "repo_structure",
+        folder=".",
+        descriptions=descriptions,
+        excludes=["^secrets$", "^scripts/.+$", r"^\..+$"],
+    )
+
+
+def main() -> None:
+    print(render())
+
+
 if __name__ == "__main__":
-    tree = list_files(folder=".", excludes=["^secrets$", "^scripts/.+$", r"^\..+$"])
-    print("```bash")
-    print_with_comments(tree, descriptions)
-    print("```")
+    main()
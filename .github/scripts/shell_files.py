@@ -1,4 +1,4 @@
-from tree import print_with_comments, list_files
+from tree import render_section
 
 # Directory and file descriptions
 descriptions = {
@@ -14,8 +14,16 @@ descriptions = {
     "70_zsh_plugins.sh": "ZSH plugins setup",
 }
 
+
+def render() -> str:
+    return render_section(
+        "shell_files", folder="configs/shell", descriptions=descriptions, level=3
+    )
+
+
+def main() -> None:
+    print(render())
+
+
 if __name__ == "__main__":
-    tree = list_files(folder="configs/shell", level=3)
-    print("```bash")
-    print_with_comments(tree, descriptions)
-    print("```")
+    main()
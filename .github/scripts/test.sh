@@ -2,6 +2,5 @@
 
 set -e
 
-uv run .github/scripts/repo_structure.py
-uv run .github/scripts/shell_files.py
-uv run .github/scripts/utility_scripts.py
+uv run .github/scripts/all_trees.py --check
+uv run .github/scripts/test_rsync_time_machine.py
@@ -0,0 +1,102 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "rich",
+# ]
+# ///
+"""Check that scripts/rsync-time-machine.py parses rsync's progress and stats.
+
+Covers plain rsync output and rsync-time-machine's `--verbose` echo of it
+(as printed by rsync-time-machine 1.4.2). Run by test.sh.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import re
+from pathlib import Path
+
+SCRIPT = Path(__file__).parents[2] / "scripts" / "rsync-time-machine.py"
+
+_spec = importlib.util.spec_from_file_location("rsync_time_machine", SCRIPT)
+assert _spec is not None and _spec.loader is not None
+rtm = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(rtm)
+
+STATS = """
+Number of files: 3 (reg: 2, dir: 1)
+Number of created files: 2 (reg: 2)
+Number of regular files transferred: 2
+Total file size: 2,048 bytes
+Total transferred file size: 2,048 bytes
+Total bytes sent: 2,321
+"""
+EXPECTED_STATS = {
+    "files": 3,
+    "files_transferred": 2,
+    "total_size": 2048,
+    "bytes_transferred": 2048,
+    "bytes_sent": 2321,
+}
+PROGRESS = (
+    "          1,024  50%    1.00MB/s    0:00:01 (xfr#1, to-chk=1/2)\r"
+    "          2,048 100%    2.00MB/s    0:00:01 (xfr#2, to-chk=0/2)"
+)
+
+
+def _time_machine(line: str) -> str:
+    """`line` as rsync-time-machine --verbose prints it."""
+    return (
+        "\x1b[1mrsync-time-machine.py\x1b[0m: Command output: "
+        f"\x1b[1m\x1b[95m{line}\x1b[0m"
+    )
+
+
+def _parse(output: str) -> rtm.TreeResult:
+    """Feed `output` to parse_line the way back_up splits it."""
+    result = rtm.TreeResult("a", "/src/a", "/dst/a")
+    for line in re.split(r"[\r\n]", output):
+        if line.strip():
+            rtm.parse_line(result, line)
+    return result
+
+
+def test_plain_rsync() -> None:
+    result = _parse(PROGRESS + "\n" + STATS)
+    assert (result.percent, result.rate) == (100, "2.00MB/s")
+    assert result.stats == EXPECTED_STATS
+
+
+def test_time_machine() -> None:
+    df = "/dev/vda       ext4 264212084 18616140  83679988  19% /"
+    lines = [df, PROGRESS, *STATS.strip().splitlines()]
+    result = _parse("\n".join(_time_machine(line) for line in lines))
+    assert (result.percent, result.rate) == (100, "2.00MB/s")
+    assert result.stats == EXPECTED_STATS
+    assert result.tail == [df, "Number of created files: 2 (reg: 2)"]
+
+
+def test_human_readable_is_not_misread() -> None:
+    result = _parse(
+        "          1.23G  45%   12.34MB/s    0:00:10\nTotal file size: 1.23G bytes"
+    )
+    assert (result.percent, result.rate) == (45, "12.34MB/s")
+    assert "total_size" not in result.stats
+
+
+def test_time_machine_flags() -> None:
+    command = rtm.backup_command(Path("/src/a"), Path("/dst/a"), plain=False)
+    assert "--verbose" in command
+    (flags,) = [arg for arg in command if arg.startswith("--rsync-set-flags=")]
+    assert "--human-readable" not in flags
+    assert "--stats" in flags
+    assert "--info=progress2" in flags
+
+
+if __name__ == "__main__":
+    tests = [
+        value for name, value in list(globals().items()) if name.startswith("test_")
+    ]
+    for test in tests:
+        test()
+    print(f"{len(tests)} tests passed.")
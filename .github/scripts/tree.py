@@ -1,18 +1,99 @@
-import subprocess
+import fnmatch
+import hashlib
+import json
+import os
+import re
+from functools import cache
+from pathlib import Path
+
+BRANCH, LAST, PIPE, SPACE = "├── ", "└── ", "│   ", "    "
+CACHE_FILE = Path.home() / ".cache" / "dotfiles-readme" / "trees.json"
+
+
+@cache
+def _gitignore() -> list[tuple[re.Pattern, bool]]:
+    """The patterns of the root .gitignore as (regex, negated), in file order.
+
+    Only the root .gitignore is read (nested ones are not), and a trailing `/`
+    is dropped, so a directory-only pattern also matches a file of that name.
+    """
+    try:
+        with open(".gitignore") as f:
+            lines = [line.strip() for line in f]
+    except OSError:
+        return []
+    patterns = []
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        line = line.removeprefix("!").rstrip("/")
+        if line.startswith("/"):  # Anchored to the repository root
+            regex = fnmatch.translate(line[1:])
+        else:  # Matches the basename anywhere
+            regex = r"(?:.*/)?" + fnmatch.translate(line)
+        patterns.append((re.compile(regex), negated))
+    return patterns
+
+
+def _is_ignored(path: str) -> bool:
+    """Whether the last matching .gitignore pattern ignores `path`."""
+    ignored = False
+    for pattern, negated in _gitignore():
+        if pattern.fullmatch(path):
+            ignored = not negated
+    return ignored
+
+
+@cache
+def _scandir(path: str) -> tuple[tuple[str, bool], ...]:
+    """The (name, is_dir) entries of a directory in byte order, like tre, cached so every tree shares one scan."""
+    try:
+        with os.scandir(path) as it:
+            entries = [(e.name, e.is_dir()) for e in it]
+    except OSError:
+        return ()
+    return tuple(sorted(entries))
+
+
+def _render_tree(folder: str, excludes, level: int) -> tuple[str, list[str]]:
+    """The tree of `folder` and the directories that were scanned to render it."""
+    exclude = re.compile("|".join(f"(?:{e})" for e in excludes)) if excludes else None
+    lines = [folder]
+    scanned = []
+
+    def walk(path: str, rel: str, prefix: str, depth: int) -> None:
+        scanned.append(path)
+        entries = []
+        for name, is_dir in _scandir(path):
+            child_rel = f"{rel}/{name}" if rel else name
+            repo_rel = os.path.normpath(os.path.join(folder, child_rel))
+            if name == ".git" or _is_ignored(repo_rel):
+                continue
+            if exclude and exclude.search(child_rel):
+                continue
+            entries.append((name, is_dir, child_rel))
+        for i, (name, is_dir, child_rel) in enumerate(entries):
+            last = i == len(entries) - 1
+            lines.append(f"{prefix}{LAST if last else BRANCH}{name}")
+            if is_dir and depth < level:
+                walk(
+                    os.path.join(path, name),
+                    child_rel,
+                    prefix + (SPACE if last else PIPE),
+                    depth + 1,
+                )
+
+    walk(folder, "", "", 1)
+    return "\n".join(lines) + "\n", scanned
 
 
 def list_files(folder: str = ".", excludes=(), level: int = 2) -> str:
-    # Use tre command with exclusions
-    cmd = ["tre", "-l", str(level)]
-    for exclude in excludes:
-        cmd.append("-E")
-        cmd.append(exclude)
-    cmd.append(folder)
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    return result.stdout
+    """Render `folder` like `tre -l level -E exclude...`, without the external binary."""
+    return _render_tree(folder, excludes, level)[0]
 
 
-def print_with_comments(result: str, descriptions: dict) -> str:
+def render_with_comments(result: str, descriptions: dict) -> str:
     """Add comments to lines based on the descriptions dictionary."""
     lines = result.strip().split("\n")
     output_lines = []
@@ -22,17 +103,74 @@ def print_with_comments(result: str, descriptions: dict) -> str:
 
     used = set()
     for line in lines:
-        processed_line = line
-        for item, desc in descriptions.items():
-            if line.strip().endswith(f"── {item}") and item in descriptions:
-                padding = " " * (max_length - len(line))
-                processed_line = f"{line}{padding}# {desc}"
-                used.add(item)
-                break
-
-        output_lines.append(processed_line)
+        _, sep, name = line.rpartition("── ")
+        desc = descriptions.get(name) if sep else None
+        if desc is not None:
+            padding = " " * (max_length - len(line))
+            line = f"{line}{padding}# {desc}"
+            used.add(name)
+        output_lines.append(line)
     unused = set(descriptions.keys()) - used
     if unused:
         print(f"❌ Unused descriptions: {unused}")
 
-    print("\n".join(output_lines))
+    return "\n".join(output_lines)
+
+
+def print_with_comments(result: str, descriptions: dict) -> None:
+    """Print the tree with comments based on the descriptions dictionary."""
+    print(render_with_comments(result, descriptions))
+
+
+def _mtimes(paths) -> dict[str, int | None]:
+    mtimes: dict[str, int | None] = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def _load_cache() -> dict:
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def render_section(
+    name: str, folder: str, descriptions: dict, excludes=(), level: int = 2
+) -> str:
+    """The README section of a generator, reused from the cache while its inputs are unchanged.
+
+    The cache keeps the mtime of every directory that was scanned (an added,
+    removed, or renamed entry changes its directory's mtime) and a hash of the
+    arguments, the descriptions, and this renderer's source.
+    """
+    key = f"{os.getcwd()}:{name}"
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(json.dumps([folder, list(excludes), level, descriptions]).encode())
+    inputs = digest.hexdigest()
+    cache = _load_cache()
+    entry = cache.get(key)
+    if (
+        entry
+        and entry["inputs"] == inputs
+        and _mtimes(entry["mtimes"]) == entry["mtimes"]
+    ):
+        return entry["output"]
+
+    tree, scanned = _render_tree(folder, excludes, level)
+    output = f"```bash\n{render_with_comments(tree, descriptions)}\n```"
+    cache[key] = {
+        "inputs": inputs,
+        "mtimes": _mtimes([".gitignore", *scanned]),
+        "output": output,
+    }
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_FILE.write_text(json.dumps(cache))
+    except OSError:
+        pass  # The cache is only an optimization
+    return output
@@ -1,5 +1,24 @@
 # main.sh - can be sourced in .bash_profile/.bashrc or .zshrc
 
+# -- Opt-in: source the single bundle of the fragments below instead (zcompiled
+# for zsh), built by `scripts/shell-profile.py bundle`, unless a fragment is newer.
+if [ -n "$DOTFILES_SHELL_BUNDLE" ]; then
+    if [ -n "$ZSH_VERSION" ]; then
+        _bundle=~/.cache/dotfiles/shell/init.zsh
+    else
+        _bundle=~/.cache/dotfiles/shell/init.bash
+    fi
+    for _fragment in ~/dotfiles/configs/shell/*.sh; do
+        [ "$_fragment" -nt "$_bundle" ] && _bundle=
+    done
+    if [ -f "$_bundle" ]; then
+        source "$_bundle"
+        unset _bundle _fragment
+        return
+    fi
+    unset _bundle _fragment
+fi
+
 [ -n "$BASH_VERSION" ] && source ~/dotfiles/configs/shell/00_prefer_zsh.sh  # no-op in zsh
 [ -n "$ZSH_VERSION" ] && source ~/dotfiles/configs/shell/05_zsh_completions.sh
 source ~/dotfiles/configs/shell/10_aliases.sh
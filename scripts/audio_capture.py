@@ -0,0 +1,326 @@
+"""Shared microphone capture for the Wyoming streaming scripts.
+
+Capture starts as soon as the input stream is open and is buffered in an
+`asyncio.Queue`, so audio recorded while the ASR connection (or anything
+else) is still being set up is not lost. The sender drains the queue once
+the connection is ready.
+
+The device is opened at its native sample rate and channel count (USB and
+Bluetooth mics often only do 44.1 or 48 kHz, and PortAudio's conversion to
+16 kHz is slow or fails to open), and every chunk is downmixed and
+resampled to 16 kHz mono with a streaming polyphase filter in NumPy, in
+the capture thread.
+
+`AudioStats` holds counters that the capture and the sender update, and
+`live_status` redraws them (duration, input level, and a warning when
+capture or sending stalls) at a fixed rate in its own task, so the terminal
+is never written to from the audio path.
+
+    python audio_capture.py bench     # CPU time per second of audio
+
+Used by transcribe.py and voice_clipboard_assistant.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from math import gcd, log10
+
+import numpy as np
+import pyaudio
+from rich.console import Console
+from rich.live import Live
+from rich.text import Text
+
+TARGET_RATE = 16000  # What the Wyoming ASR servers expect, mono int16
+MAX_CHANNELS = 2  # Multichannel interfaces: only the first two are mixed
+TAPS_PER_PHASE = 48  # Filter length per output sample; quality vs. CPU
+ROLLOFF = 0.9  # Pass band, of the output Nyquist frequency (7.2 kHz at 16 kHz)
+
+# --- Status display ---
+UI_FPS = 8  # Redraws per second, independent of the chunk rate
+STALL_AFTER = 0.5  # Seconds without audio, or of unsent backlog, shown as stalled
+METER_WIDTH = 20
+METER_FLOOR = -60.0  # dBFS at the left end of the meter
+
+
+def level(chunk: bytes) -> tuple[float, float]:
+    """The RMS and peak of a chunk of int16 samples, in sample units."""
+    samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+    if not samples.size:
+        return 0.0, 0.0
+    return float(np.sqrt(np.mean(samples * samples))), float(np.abs(samples).max())
+
+
+@dataclass
+class AudioStats:
+    """Counters shared by the capture, the sender, and the status display."""
+
+    captured: float = 0.0  # Seconds of audio captured
+    sent: float = 0.0  # Seconds of audio the sender has taken care of
+    rms: float = 0.0  # Level of the last chunk, in sample units
+    peak: float = 0.0
+    last_capture: float = field(default_factory=time.monotonic)
+
+    def add_captured(self, chunk: bytes) -> None:
+        self.captured += len(chunk) / (TARGET_RATE * 2)
+        self.last_capture = time.monotonic()
+
+    def add_sent(self, chunk: bytes) -> None:
+        self.sent += len(chunk) / (TARGET_RATE * 2)
+
+    def stalled(self) -> str | None:
+        """What is falling behind, if anything."""
+        if time.monotonic() - self.last_capture > STALL_AFTER:
+            return "no audio from the microphone"
+        if self.captured - self.sent > STALL_AFTER:
+            return f"sending {self.captured - self.sent:.1f}s behind"
+        return None
+
+
+def _dbfs(value: float) -> float:
+    return 20 * log10(max(value, 1.0) / 32768)
+
+
+def status_line(stats: AudioStats, label: str) -> Text:
+    """The label, the duration, a level meter, and a stall warning."""
+    rms, peak = _dbfs(stats.rms), _dbfs(stats.peak)
+    filled = round(METER_WIDTH * min(max(1 - rms / METER_FLOOR, 0), 1))
+    color = "red" if peak > -1 else "yellow" if rms > -12 else "green"
+    text = Text(f"{label} ({stats.captured:.1f}s) ", style="blue")
+    text.append("█" * filled, style=color)
+    text.append("░" * (METER_WIDTH - filled), style="dim")
+    text.append(f" {rms:4.0f} dB, peak {peak:4.0f} dB", style="dim")
+    if (stall := stats.stalled()) is not None:
+        text.append(f"  ⚠️ stalled: {stall}", style="bold red")
+    return text
+
+
+async def _redraw(live: Live, stats: AudioStats, label: str) -> None:
+    while True:
+        await asyncio.sleep(1 / UI_FPS)
+        live.update(status_line(stats, label), refresh=True)
+
+
+@asynccontextmanager
+async def live_status(
+    stats: AudioStats, console: Console | None, label: str
+) -> AsyncGenerator[None, None]:
+    """Show the status line, redrawn at `UI_FPS`, for the lifetime of the context."""
+    if console is None:
+        yield
+        return
+    with Live(
+        status_line(stats, label), console=console, transient=True, auto_refresh=False
+    ) as live:
+        task = asyncio.create_task(_redraw(live, stats, label))
+        try:
+            yield
+        finally:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+
+def native_format(p: pyaudio.PyAudio, device_index: int | None) -> tuple[int, int]:
+    """The sample rate and number of channels the input device runs at."""
+    info = (
+        p.get_default_input_device_info()
+        if device_index is None
+        else p.get_device_info_by_index(device_index)
+    )
+    rate = int(info.get("defaultSampleRate") or TARGET_RATE)
+    channels = min(max(int(info.get("maxInputChannels") or 1), 1), MAX_CHANNELS)
+    return rate, channels
+
+
+class Resampler:
+    """Downmix int16 audio to mono and resample it to `TARGET_RATE`, chunk by chunk.
+
+    A windowed-sinc low-pass filter is split into `up` polyphase branches, so
+    every output sample is one dot product of `TAPS_PER_PHASE` input samples;
+    a whole chunk is computed at once. The last input samples are kept
+    between chunks, so the output is continuous across chunk boundaries.
+    """
+
+    def __init__(
+        self, rate: int, channels: int = 1, target_rate: int = TARGET_RATE
+    ) -> None:
+        self.rate = rate
+        self.channels = channels
+        self.target_rate = target_rate
+        g = gcd(rate, target_rate)
+        self.up, self.down = target_rate // g, rate // g
+        self.passthrough = self.up == self.down and channels == 1
+
+        # Cut off below the lower of the two Nyquist frequencies, in units of
+        # the Nyquist frequency of the `up` times upsampled signal.
+        cutoff = ROLLOFF / max(self.up, self.down)
+        n = TAPS_PER_PHASE * self.up
+        t = np.arange(n) - (n - 1) / 2
+        h = self.up * cutoff * np.sinc(cutoff * t) * np.kaiser(n, 8.0)
+        # phases[p, k] weighs input sample `base - k`; reversed to match the
+        # order of a sliding window that ends at `base`.
+        self.phases = h.reshape(TAPS_PER_PHASE, self.up).T[:, ::-1].astype(np.float32)
+
+        self._history = np.zeros(TAPS_PER_PHASE - 1, dtype=np.float32)
+        self._consumed = 0  # Input samples seen so far
+        self._produced = 0  # Output samples returned so far
+
+    def input_frames(self, output_frames: int) -> int:
+        """The frames to read per chunk to get about `output_frames` out."""
+        return max(1, round(output_frames * self.rate / self.target_rate))
+
+    def process(self, chunk: bytes) -> bytes:
+        """Resample one chunk of interleaved int16 frames."""
+        if self.passthrough:
+            return chunk
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+        if self.up == self.down:
+            return np.rint(samples).astype(np.int16).tobytes()
+        buffer = np.concatenate([self._history, samples.astype(np.float32)])
+        start = self._consumed - len(self._history)  # Input index of buffer[0]
+        self._consumed += len(buffer) - len(self._history)
+
+        # Output sample m is centered on input sample m * down / up; produce
+        # every one whose input has arrived.
+        end = (self._consumed * self.up - 1) // self.down + 1
+        m = np.arange(self._produced, end, dtype=np.int64)
+        self._produced = end
+        bases = m * self.down // self.up - start
+        windows = np.lib.stride_tricks.sliding_window_view(buffer, TAPS_PER_PHASE)
+        out = np.einsum(
+            "nk,nk->n",
+            windows[bases - (TAPS_PER_PHASE - 1)],
+            self.phases[m * self.down % self.up],
+        )
+        self._history = buffer[len(buffer) - len(self._history) :]
+        return np.clip(np.rint(out), -32768, 32767).astype(np.int16).tobytes()
+
+
+def _read(
+    stream: pyaudio.Stream,
+    frames: int,
+    resampler: Resampler | None,
+    stats: AudioStats | None,
+) -> bytes:
+    chunk = stream.read(frames, False)
+    if resampler:
+        chunk = resampler.process(chunk)
+    if stats:  # Measured here, in the capture thread, off the event loop
+        stats.rms, stats.peak = level(chunk)
+    return chunk
+
+
+async def _capture(
+    stream: pyaudio.Stream,
+    chunk_size: int,
+    queue: asyncio.Queue[bytes | None],
+    stop_event: asyncio.Event,
+    closing: asyncio.Event,
+    logger: logging.Logger,
+    resampler: Resampler | None,
+    stats: AudioStats | None,
+) -> None:
+    """Read from the mic into the queue until stopped, then enqueue a `None` sentinel."""
+    try:
+        while not stop_event.is_set() and not closing.is_set():
+            chunk = await asyncio.to_thread(_read, stream, chunk_size, resampler, stats)
+            queue.put_nowait(chunk)
+            if stats:
+                stats.add_captured(chunk)
+    except Exception as e:
+        logger.error("Audio capture failed: %s", e)
+        raise
+    finally:
+        queue.put_nowait(None)
+        logger.debug("Audio capture stopped (%d chunk(s) buffered)", queue.qsize())
+
+
+@asynccontextmanager
+async def capture_audio(
+    stream: pyaudio.Stream,
+    chunk_size: int,
+    stop_event: asyncio.Event,
+    logger: logging.Logger,
+    resampler: Resampler | None = None,
+    stats: AudioStats | None = None,
+) -> AsyncGenerator[asyncio.Queue[bytes | None], None]:
+    """
+    Capture audio in the background for the lifetime of the context.
+
+    Yields a queue of raw chunks that ends with `None` once `stop_event` is set.
+    `chunk_size` is in frames of the stream; with a `resampler`, the chunks in
+    the queue are already converted to 16 kHz mono. `stats`, if given, gets
+    the captured duration and the level of every chunk.
+    On exit the capture task is stopped and awaited, so the stream can be
+    closed safely afterwards.
+    """
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+    closing = asyncio.Event()
+    task = asyncio.create_task(
+        _capture(
+            stream, chunk_size, queue, stop_event, closing, logger, resampler, stats
+        )
+    )
+    try:
+        yield queue
+    finally:
+        closing.set()
+        try:
+            await task
+        except Exception:
+            pass  # Already logged in `_capture`
+
+
+def bench(seconds: float, chunk_frames: int) -> None:
+    """Time the resampler on common device formats, per second of audio."""
+    import time
+
+    print(f"{seconds:.0f}s of noise per format, chunks of {chunk_frames} output frames")
+    print(f"{'format':>16} {'CPU per s of audio':>20} {'real-time factor':>18}")
+    rng = np.random.default_rng(0)
+    for rate, channels in [(16000, 1), (16000, 2), (44100, 1), (48000, 2), (96000, 2)]:
+        resampler = Resampler(rate, channels)
+        frames = resampler.input_frames(chunk_frames)
+        audio = rng.integers(-8000, 8000, int(seconds * rate) * channels, np.int16)
+        chunks = [
+            audio[i : i + frames * channels].tobytes()
+            for i in range(0, len(audio), frames * channels)
+        ]
+        t_start = time.process_time()
+        out = sum(len(resampler.process(chunk)) for chunk in chunks)
+        cpu = time.process_time() - t_start
+        assert abs(out / 2 - seconds * TARGET_RATE) <= TAPS_PER_PHASE
+        print(
+            f"{rate:>9} Hz x{channels} {cpu / seconds * 1000:>17.3f}ms "
+            f"{seconds / max(cpu, 1e-9):>17.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Audio capture and resampler.")
+    subparsers = parser.add_subparsers(dest="command")
+    bench_parser = subparsers.add_parser(
+        "bench", help="CPU cost of resampling to 16 kHz mono."
+    )
+    bench_parser.add_argument(
+        "--seconds", type=float, default=60, help="Audio per format (default: 60)."
+    )
+    bench_parser.add_argument(
+        "--chunk", type=int, default=1024, help="Output frames per chunk."
+    )
+    args = parser.parse_args()
+    if args.command == "bench":
+        bench(args.seconds, args.chunk)
+    else:
+        parser.print_help()
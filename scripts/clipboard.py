@@ -0,0 +1,241 @@
+"""Clipboard access for the scripts, with the backend detected once per process.
+
+pyperclip re-detects its backend and spawns a helper with pipes on every
+call; with wl-copy and xclip, which keep running in the background to serve
+the selection, that can block until the helper exits. Here the backend is
+picked once (pbcopy/pbpaste on macOS, wl-copy/wl-paste on Wayland, xclip or
+xsel on X11, pyperclip elsewhere), text is encoded once and written straight
+to the helper's stdin, and copy helpers get no pipes to hold open.
+
+The async API runs the helpers with asyncio subprocesses, so clipboard I/O
+overlaps with audio capture and LLM requests instead of blocking the loop.
+
+    python clipboard.py               # show the detected backend
+    python clipboard.py bench         # compare round trips against pyperclip
+
+Used by commit.py, fix_my_text_ollama.py, transcribe.py, and voice_clipboard_assistant.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import shutil
+import subprocess
+import sys
+from typing import NamedTuple
+
+# Substrings of helper errors that mean the clipboard can't be reached at all
+# (as opposed to simply being empty).
+CONNECTION_ERRORS = (b"display", b"connect", b"wayland")
+
+
+class ClipboardError(Exception):
+    """The clipboard could not be read or written."""
+
+
+class Backend(NamedTuple):
+    """Commands that copy (text on stdin) and paste (text on stdout)."""
+
+    name: str
+    copy_cmd: list[str] | None  # None means pyperclip
+    paste_cmd: list[str] | None
+
+
+def _detect() -> Backend:
+    candidates = []
+    if sys.platform == "darwin":
+        candidates.append(Backend("pbcopy", ["pbcopy"], ["pbpaste"]))
+    if os.getenv("WAYLAND_DISPLAY"):
+        candidates.append(
+            Backend("wl-clipboard", ["wl-copy"], ["wl-paste", "--no-newline"])
+        )
+    if os.getenv("DISPLAY"):
+        candidates.append(
+            Backend(
+                "xclip",
+                ["xclip", "-selection", "clipboard", "-in"],
+                ["xclip", "-selection", "clipboard", "-out"],
+            )
+        )
+        candidates.append(
+            Backend(
+                "xsel",
+                ["xsel", "--clipboard", "--input"],
+                ["xsel", "--clipboard", "--output"],
+            )
+        )
+    for candidate in candidates:
+        assert candidate.copy_cmd is not None and candidate.paste_cmd is not None
+        if shutil.which(candidate.copy_cmd[0]) and shutil.which(candidate.paste_cmd[0]):
+            return candidate
+    return Backend("pyperclip", None, None)
+
+
+@functools.cache
+def backend() -> Backend:
+    """The clipboard backend of this session, detected on first use."""
+    return _detect()
+
+
+def _decode_paste(returncode: int, stdout: bytes, stderr: bytes) -> str:
+    if returncode != 0:
+        if any(error in stderr.lower() for error in CONNECTION_ERRORS):
+            raise ClipboardError(stderr.decode(errors="replace").strip())
+        return ""  # The helpers fail when the clipboard is empty
+    return stdout.decode("utf-8", errors="replace")
+
+
+def _check_copy(returncode: int, name: str) -> None:
+    if returncode != 0:
+        raise ClipboardError(f"{name} exited with status {returncode}")
+
+
+def paste() -> str:
+    """Return the clipboard text."""
+    b = backend()
+    if b.paste_cmd is None:
+        return _pyperclip_paste()
+    try:
+        result = subprocess.run(b.paste_cmd, capture_output=True, check=False)
+    except OSError as e:
+        raise ClipboardError(str(e)) from e
+    return _decode_paste(result.returncode, result.stdout, result.stderr)
+
+
+def copy(text: str) -> None:
+    """Put `text` on the clipboard."""
+    b = backend()
+    if b.copy_cmd is None:
+        _pyperclip_copy(text)
+        return
+    try:
+        # No stdout/stderr pipes: wl-copy and xclip fork a process that serves the
+        # selection, and it would keep them open (and us waiting) until replaced.
+        result = subprocess.run(
+            b.copy_cmd,
+            input=text.encode(),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+    except OSError as e:
+        raise ClipboardError(str(e)) from e
+    _check_copy(result.returncode, b.name)
+
+
+async def paste_async() -> str:
+    """Return the clipboard text without blocking the event loop."""
+    b = backend()
+    if b.paste_cmd is None:
+        return await asyncio.to_thread(_pyperclip_paste)
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *b.paste_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+    except OSError as e:
+        raise ClipboardError(str(e)) from e
+    stdout, stderr = await process.communicate()
+    assert process.returncode is not None
+    return _decode_paste(process.returncode, stdout, stderr)
+
+
+async def copy_async(text: str) -> None:
+    """Put `text` on the clipboard without blocking the event loop."""
+    b = backend()
+    if b.copy_cmd is None:
+        await asyncio.to_thread(_pyperclip_copy, text)
+        return
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *b.copy_cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+    except OSError as e:
+        raise ClipboardError(str(e)) from e
+    await process.communicate(text.encode())
+    assert process.returncode is not None
+    _check_copy(process.returncode, b.name)
+
+
+def _pyperclip_paste() -> str:
+    import pyperclip
+
+    try:
+        return pyperclip.paste()
+    except pyperclip.PyperclipException as e:
+        raise ClipboardError(str(e)) from e
+
+
+def _pyperclip_copy(text: str) -> None:
+    import pyperclip
+
+    try:
+        pyperclip.copy(text)
+    except pyperclip.PyperclipException as e:
+        raise ClipboardError(str(e)) from e
+
+
+def bench(sizes: list[int], repeat: int) -> None:
+    """Time copy + paste round trips of this module against pyperclip."""
+    import time
+
+    import pyperclip
+
+    def timed(copy_fn, paste_fn, text: str) -> float:
+        t_start = time.perf_counter()
+        for _ in range(repeat):
+            copy_fn(text)
+            if paste_fn() != text:
+                raise ClipboardError("Round trip changed the text")
+        return (time.perf_counter() - t_start) / repeat
+
+    async def timed_async(text: str) -> float:
+        t_start = time.perf_counter()
+        for _ in range(repeat):
+            await copy_async(text)
+            await paste_async()
+        return (time.perf_counter() - t_start) / repeat
+
+    print(f"Backend: {backend().name}, {repeat} round trip(s) per size")
+    print(
+        f"{'size':>10} {'clipboard':>12} {'async':>12} {'pyperclip':>12} {'speedup':>8}"
+    )
+    for size in sizes:
+        text = ("x" * 79 + "\n") * (size // 80) + "x" * (size % 80)
+        ours = timed(copy, paste, text)
+        ours_async = asyncio.run(timed_async(text))
+        theirs = timed(pyperclip.copy, pyperclip.paste, text)
+        print(
+            f"{size:>10} {ours * 1000:>10.2f}ms {ours_async * 1000:>10.2f}ms "
+            f"{theirs * 1000:>10.2f}ms {theirs / ours:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Clipboard backend and benchmark.")
+    subparsers = parser.add_subparsers(dest="command")
+    bench_parser = subparsers.add_parser(
+        "bench", help="Compare copy/paste round trips against pyperclip."
+    )
+    bench_parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 10_000, 1_000_000],
+        help="Payload sizes in characters.",
+    )
+    bench_parser.add_argument(
+        "--repeat", "-n", type=int, default=20, help="Round trips per size."
+    )
+    args = parser.parse_args()
+    if args.command == "bench":
+        bench(args.sizes, args.repeat)
+    else:
+        b = backend()
+        print(f"{b.name}: copy={b.copy_cmd}, paste={b.paste_cmd}")
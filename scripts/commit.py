@@ -19,17 +19,16 @@ import tempfile
 import time
 import textwrap
 
-import pyperclip
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
 from rich.console import Console
 from rich.panel import Panel
 from rich.status import Status
 
+import clipboard
+from llm_backend import build_model, get_pool, served_by
+
 # --- Configuration ---
-MY_OLLAMA_HOST = os.getenv("MY_OLLAMA_HOST", "http://localhost:11434")
 DEFAULT_MODEL = "devstral:24b"
 
 # The agent's core identity and immutable rules.
@@ -208,13 +207,8 @@ def build_agent(model: str, custom_prompt: str | None = None) -> Agent:
             f"\n\nIMPORTANT: You must also follow this instruction: {custom_prompt}"
         )
 
-    ollama_provider = OpenAIProvider(base_url=f"{MY_OLLAMA_HOST}/v1")
-    ollama_model = OpenAIModel(
-        model_name=model,
-        provider=ollama_provider,
-    )
     return Agent(
-        model=ollama_model,
+        model=build_model(model),
         system_prompt=SYSTEM_PROMPT,
         instructions=agent_instructions,
         output_type=ConventionalCommit,
@@ -276,7 +270,7 @@ def main() -> None:
                 title="[bold green]🚀 Generated Commit Message[/bold green]",
                 border_style="green",
                 padding=(1, 2),
-                subtitle=f"[dim]took {elapsed:.2f}s[/dim]",
+                subtitle=f"[dim]took {elapsed:.2f}s{served_by()}[/dim]",
             )
         )
 
@@ -303,14 +297,14 @@ def main() -> None:
 
         elif args.copy:
             try:
-                pyperclip.copy(commit_message)
+                clipboard.copy(commit_message)
                 console.print(
                     "\n[bold green]✅ Commit message copied to clipboard.[/bold green]"
                 )
                 console.print(
                     "💡 [bold]Run `git commit -F -` and paste the message to commit.[/bold]"
                 )
-            except pyperclip.PyperclipException:
+            except clipboard.ClipboardError:
                 console.print(
                     "[bold red]❌ Could not copy to clipboard. Is a tool like xclip or pbcopy installed?[/bold red]"
                 )
@@ -375,7 +369,7 @@ def main() -> None:
     except Exception as e:
         console.print(f"❌ [bold red]An unexpected error occurred: {e}[/bold red]")
         console.print(
-            f"   Please check that your Ollama server is running at [bold cyan]{MY_OLLAMA_HOST}[/bold cyan]"
+            f"   Please check that your Ollama server is running at [bold cyan]{get_pool().describe()}[/bold cyan]"
         )
         sys.exit(1)
 
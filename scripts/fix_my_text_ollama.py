@@ -10,9 +10,40 @@
 
 Usage:
     python fix_my_text_ollama.py
+    python fix_my_text_ollama.py --file notes.md --output notes.fixed.md
+    cat notes.md | python fix_my_text_ollama.py --stdin > notes.fixed.md
 
 Environment variables:
     MY_OLLAMA_HOST: The host of the Ollama server. Default is "http://localhost:11434".
+    MY_OLLAMA_HOSTS: Comma-separated Ollama hosts; requests go to the least-loaded healthy one.
+
+The text is split into paragraphs and each corrected paragraph is cached on disk (keyed on its
+content, the model, and the prompts). Re-running after editing one paragraph only sends that
+paragraph to the model. Use --no-cache to skip the cache and --cache-stats to see the hit rate.
+
+Before calling the model, each paragraph goes through a fast local pre-check (dictionary lookups
+and simple punctuation/repeated-word rules). Paragraphs without anything suspicious are returned
+as-is; use --force to always send everything to the model.
+
+With --file or --stdin, large documents are streamed paragraph by paragraph through a bounded pool
+of concurrent requests, and the output is written in order as soon as each prefix is complete.
+When writing to --output, progress is checkpointed so an interrupted run resumes where it stopped.
+
+Batch mode:
+    python fix_my_text_ollama.py --recursive notes/ --glob '*.md' > fixes.diff
+    python fix_my_text_ollama.py --recursive notes/ --in-place
+
+    Corrects every matching file under a directory, leaving front matter and fenced code blocks
+    untouched. Prints unified diffs, or rewrites the files with --in-place. A manifest of file
+    hashes and results is kept, so re-runs only process files that changed.
+
+Daemon mode:
+    python fix_my_text_ollama.py --daemon --watch-clipboard
+
+    Keeps the agent and its HTTP connection pool warm and accepts "correct now" requests over a
+    Unix socket. A normal (hotkey) invocation uses the daemon automatically when it is running,
+    and skips importing pydantic-ai altogether. With --watch-clipboard, the daemon corrects new
+    clipboard text speculatively in the background, so the hotkey returns an already computed result.
 
 
 Example:
@@ -22,22 +53,66 @@ Pro-tip:
     Use Keyboard Maestro on macOS or AutoHotkey on Windows to run this script with a hotkey.
 """
 
+from __future__ import annotations
+
 import argparse
+import asyncio
+import difflib
+import hashlib
+import json
 import os
+import re
+import socket
 import sys
 import time
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO, NamedTuple, TextIO
 
-import pyperclip
-from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
 from rich.console import Console
 from rich.panel import Panel
 from rich.status import Status
 
+import clipboard
+from llm_cache import ResultCache, cache_key, prompt_version, text_hash
+from text_precheck import WordSet, find_issues, load_wordset
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
 # --- Configuration ---
-MY_OLLAMA_HOST = os.getenv("MY_OLLAMA_HOST", "http://localhost:11434")
 DEFAULT_MODEL = "gemma3:latest"
+MAX_CONCURRENT_REQUESTS = 4
+
+# Daemon settings
+SOCKET_PATH = (
+    Path(os.getenv("XDG_RUNTIME_DIR", Path.home() / ".cache")) / "fix_my_text.sock"
+)
+WATCH_INTERVAL = 1.0  # seconds between clipboard polls
+WATCH_MAX_CHARS = 20_000  # Don't speculatively correct huge clipboards
+MAX_TRACKED_TASKS = 32
+MAX_REQUEST_BYTES = 256 * 1024 * 1024  # Longest request line, for large files
+# How long the client waits for the daemon's answer before correcting in-process
+DAEMON_TIMEOUT = 30.0  # seconds, plus DAEMON_TIMEOUT_PER_CHAR for every character
+DAEMON_TIMEOUT_PER_CHAR = 0.02  # generous for a local model (~50 characters/s)
+
+# Batch mode settings
+MANIFEST_DIR = Path.home() / ".cache" / "dotfiles-llm" / "manifests"
+DEFAULT_GLOB = "*.md"
+MANIFEST_SAVE_INTERVAL = 10.0  # seconds between manifest saves during a run
+# YAML front matter at the very start of a document.
+FRONT_MATTER = re.compile(
+    r"\A---[ \t]*\n.*?^(?:---|\.\.\.)[ \t]*$\n?", re.DOTALL | re.MULTILINE
+)
+# Fenced code blocks; an unclosed fence runs to the end of the document.
+CODE_FENCE = re.compile(
+    r"^ {0,3}(`{3,}|~{3,})[^\n]*\n(?:.*?^ {0,3}\1[ \t]*$\n?|.*\Z)",
+    re.DOTALL | re.MULTILINE,
+)
+
+# Paragraphs are separated by blank lines; the separators are kept verbatim.
+PARAGRAPH_SEPARATOR = re.compile(r"(\n[ \t]*\n\s*)")
 
 # The agent's core identity and immutable rules.
 SYSTEM_PROMPT = """\
@@ -54,6 +129,10 @@ Return only the corrected text. Do not include any introductory phrases like "He
 Do not wrap the output in markdown or code blocks.
 """
 
+# Part of the result cache key, so changing a prompt invalidates cached results.
+PROMPT_VERSION = prompt_version(SYSTEM_PROMPT, AGENT_INSTRUCTIONS)
+CACHE_TASK = "correct"
+
 # --- Main Application Logic ---
 
 
@@ -74,29 +153,841 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_MODEL,
         help=f"The Ollama model to use. Default is {DEFAULT_MODEL}.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't look up or store results in the result cache.",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Show the result cache size and hit rate and exit.",
+    )
+    parser.add_argument(
+        "--force",
+        "-f",
+        action="store_true",
+        help="Skip the local pre-check and always send the text to the model.",
+    )
+    input_group = parser.add_mutually_exclusive_group()
+    input_group.add_argument(
+        "--file",
+        type=Path,
+        help="Correct this file instead of the clipboard.",
+    )
+    input_group.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Correct text read from stdin instead of the clipboard.",
+    )
+    input_group.add_argument(
+        "--recursive",
+        "-r",
+        type=Path,
+        metavar="DIR",
+        help="Correct all files matching --glob under this directory.",
+    )
+    parser.add_argument(
+        "--glob",
+        default=DEFAULT_GLOB,
+        help=f"With --recursive, the files to correct (default: {DEFAULT_GLOB!r}).",
+    )
+    parser.add_argument(
+        "--in-place",
+        "-i",
+        action="store_true",
+        help="With --recursive, rewrite the files instead of printing unified diffs.",
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        help=(
+            "With --file/--stdin, write here instead of stdout (resumable). "
+            "With --recursive, write the diffs here."
+        ),
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=MAX_CONCURRENT_REQUESTS,
+        help=f"Maximum number of requests in flight (default: {MAX_CONCURRENT_REQUESTS}).",
+    )
+    daemon_group = parser.add_argument_group("daemon")
+    daemon_group.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run as a resident daemon that serves correction requests over a Unix socket.",
+    )
+    daemon_group.add_argument(
+        "--watch-clipboard",
+        action="store_true",
+        help="With --daemon, pre-correct new clipboard text in the background.",
+    )
+    daemon_group.add_argument(
+        "--watch-interval",
+        type=float,
+        default=WATCH_INTERVAL,
+        help=f"Seconds between clipboard polls (default: {WATCH_INTERVAL}).",
+    )
+    daemon_group.add_argument(
+        "--socket",
+        type=Path,
+        default=SOCKET_PATH,
+        help=f"Path of the daemon's Unix socket (default: {SOCKET_PATH}).",
+    )
+    daemon_group.add_argument(
+        "--no-daemon",
+        action="store_true",
+        help="Don't use a running daemon; always correct in this process.",
+    )
+    args = parser.parse_args()
+    if args.output and not (args.file or args.stdin or args.recursive):
+        parser.error("--output requires --file, --stdin, or --recursive")
+    if args.in_place and not args.recursive:
+        parser.error("--in-place requires --recursive")
+    if args.in_place and args.output:
+        parser.error("--in-place and --output are mutually exclusive")
+    return args
 
 
 def build_agent(model: str) -> Agent:
     """Construct and return a PydanticAI agent configured for local Ollama."""
-    ollama_provider = OpenAIProvider(base_url=f"{MY_OLLAMA_HOST}/v1")
-    ollama_model = OpenAIModel(
-        model_name=model,
-        provider=ollama_provider,
-    )
+    # Imported here because it is slow, and the daemon client path doesn't need it.
+    from pydantic_ai import Agent
+
+    from llm_backend import build_model
+
     return Agent(
-        model=ollama_model,
+        model=build_model(model),
         system_prompt=SYSTEM_PROMPT,
         instructions=AGENT_INSTRUCTIONS,
     )
 
 
-def process_text(agent: Agent, text: str) -> tuple[str, float]:
-    """Run the agent synchronously and return corrected text along with elapsed seconds."""
+class Correction(NamedTuple):
+    """Corrected text with timing and how much of it skipped the model."""
+
+    text: str
+    elapsed: float
+    n_segments: int
+    n_cached: int
+    n_clean: int = 0  # Paragraphs that passed the local pre-check
+
+
+def split_segments(text: str) -> list[str]:
+    """
+    Split text into paragraphs and the whitespace between them.
+    Paragraphs are at even indices, so `"".join(split_segments(text)) == text`.
+    """
+    return PARAGRAPH_SEPARATOR.split(text)
+
+
+def _segment_key(segment: str, model: str) -> str:
+    return cache_key(text_hash(segment), CACHE_TASK, model, PROMPT_VERSION)
+
+
+async def correct_text(
+    agent: Agent,
+    text: str,
+    model: str,
+    cache: ResultCache | None = None,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    words: WordSet | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+) -> Correction:
+    """
+    Correct text paragraph by paragraph, only sending uncached paragraphs to the model.
+    Uncached paragraphs are corrected concurrently, and the original whitespace around
+    every paragraph is preserved. With a dictionary (`words`), paragraphs that pass the
+    local pre-check are kept as they are. Pass a `semaphore` to share the concurrency
+    limit with other calls.
+    """
     t_start = time.monotonic()
-    result = agent.run_sync(text)
-    t_end = time.monotonic()
-    return result.output, t_end - t_start
+    parts = split_segments(text)
+    semaphore = semaphore or asyncio.Semaphore(max_concurrency)
+    n_segments = n_cached = n_clean = 0
+
+    async def correct(segment: str) -> str:
+        async with semaphore:
+            result = await agent.run(segment)
+        corrected = result.output.strip()
+        if cache is not None:
+            cache.set(_segment_key(segment, model), corrected)
+        return corrected
+
+    pending: dict[int, asyncio.Task[str]] = {}
+    for i in range(0, len(parts), 2):
+        segment = parts[i].strip()
+        if not segment:
+            continue
+        n_segments += 1
+        if words is not None and not find_issues(segment, words):
+            n_clean += 1
+            continue
+        cached = cache.get(_segment_key(segment, model)) if cache is not None else None
+        if cached is not None:
+            n_cached += 1
+            parts[i] = parts[i].replace(segment, cached, 1)
+        else:
+            pending[i] = asyncio.create_task(correct(segment))
+
+    try:
+        outputs = await asyncio.gather(*pending.values())
+    finally:
+        # If a paragraph failed, don't leave the others running.
+        for task in pending.values():
+            task.cancel()
+    for i, output in zip(pending, outputs):
+        parts[i] = parts[i].replace(parts[i].strip(), output, 1)
+    if cache is not None and words is not None:
+        cache.bump("precheck_segments", n_segments)
+        cache.bump("precheck_clean", n_clean)
+    return Correction(
+        "".join(parts), time.monotonic() - t_start, n_segments, n_cached, n_clean
+    )
+
+
+def process_text(
+    agent: Agent,
+    text: str,
+    model: str = DEFAULT_MODEL,
+    cache: ResultCache | None = None,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    words: WordSet | None = None,
+) -> Correction:
+    """Run the correction synchronously and return it along with elapsed seconds."""
+    return asyncio.run(correct_text(agent, text, model, cache, max_concurrency, words))
+
+
+# --- File / Stdin Streaming ---
+
+
+def iter_paragraphs(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Group lines into paragraphs, each including the blank lines that follow it.
+    Concatenating the yielded paragraphs reproduces the input exactly.
+    """
+    paragraph: list[str] = []
+    in_gap = False
+    for line in lines:
+        blank = not line.strip()
+        if in_gap and not blank:
+            yield "".join(paragraph)
+            paragraph = []
+        in_gap = blank and bool(paragraph)
+        paragraph.append(line)
+    if paragraph:
+        yield "".join(paragraph)
+
+
+class Checkpoint:
+    """
+    Progress of a streaming run that writes to a file.
+
+    Records how many paragraphs were written, the output size at that point, and a
+    hash of the consumed input, so a resumed run can verify it sees the same input.
+    """
+
+    def __init__(self, output: Path, model: str) -> None:
+        self.path = output.with_name(output.name + ".checkpoint.json")
+        self.model = model
+        self.n_done = 0
+        self.n_bytes = 0
+        self.input_hash = hashlib.sha256()
+
+    def load(self) -> dict | None:
+        """Return the stored checkpoint if it belongs to this model."""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        return data if data.get("model") == self.model else None
+
+    def advance(self, paragraph: str) -> None:
+        """Account for one more consumed input paragraph."""
+        self.n_done += 1
+        self.input_hash.update(paragraph.encode())
+
+    def save(self, n_bytes: int) -> None:
+        """Persist the checkpoint atomically."""
+        self.n_bytes = n_bytes
+        data = {
+            "model": self.model,
+            "n_done": self.n_done,
+            "n_bytes": n_bytes,
+            "input_hash": self.input_hash.hexdigest(),
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        tmp.replace(self.path)
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+def _resume(
+    paragraphs: Iterator[str], checkpoint: Checkpoint, out: BinaryIO
+) -> list[str]:
+    """
+    Skip the paragraphs a previous run already wrote and truncate the output to match.
+    Returns paragraphs that were read but must still be processed (on a mismatch, all of
+    them, and the output starts over).
+    """
+    stored = checkpoint.load()
+    if stored is None or not stored["n_done"]:
+        out.truncate(0)
+        return []
+    consumed = []
+    for paragraph in paragraphs:
+        consumed.append(paragraph)
+        checkpoint.advance(paragraph)
+        if checkpoint.n_done == stored["n_done"]:
+            break
+    if (
+        checkpoint.n_done == stored["n_done"]
+        and checkpoint.input_hash.hexdigest() == stored["input_hash"]
+    ):
+        out.truncate(stored["n_bytes"])
+        out.seek(stored["n_bytes"])
+        checkpoint.n_bytes = stored["n_bytes"]
+        return []
+    # The input changed since the checkpoint, so start from scratch.
+    checkpoint.n_done = 0
+    checkpoint.input_hash = hashlib.sha256()
+    out.truncate(0)
+    out.seek(0)
+    return consumed
+
+
+async def stream_corrections(
+    agent: Agent,
+    paragraphs: Iterator[str],
+    out: BinaryIO,
+    model: str,
+    cache: ResultCache | None,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    checkpoint: Checkpoint | None = None,
+    on_progress=None,
+    words: WordSet | None = None,
+) -> tuple[int, int]:
+    """
+    Correct paragraphs with at most `max_concurrency` requests in flight and write the
+    results in order as soon as each prefix is complete.
+    Returns the number of paragraphs processed and how many of them skipped the model
+    (served from the cache or passed the pre-check).
+    """
+    pending: deque[tuple[str, asyncio.Task[Correction]]] = deque()
+    n_done = n_skipped = 0
+
+    async def write_oldest() -> None:
+        nonlocal n_done, n_skipped
+        paragraph, task = pending.popleft()
+        correction = await task
+        out.write(correction.text.encode())
+        out.flush()
+        n_done += 1
+        n_skipped += correction.n_cached + correction.n_clean
+        if checkpoint is not None:
+            checkpoint.advance(paragraph)
+            checkpoint.save(out.tell())
+        if on_progress is not None:
+            on_progress(n_done, n_skipped)
+
+    while True:
+        # Reading may block (e.g. a slow pipe), so keep it off the event loop.
+        paragraph = await asyncio.to_thread(next, paragraphs, None)
+        if paragraph is None:
+            break
+        task = asyncio.create_task(
+            correct_text(agent, paragraph, model, cache, 1, words)
+        )
+        pending.append((paragraph, task))
+        if len(pending) >= max_concurrency:
+            await write_oldest()
+    while pending:
+        await write_oldest()
+    return n_done, n_skipped
+
+
+def correct_stream(
+    args: argparse.Namespace,
+    agent: Agent,
+    cache: ResultCache | None,
+    words: WordSet | None,
+    console: Console | None,
+) -> None:
+    """Correct --file/--stdin input and write it to --output or stdout."""
+    source: TextIO = args.file.open(encoding="utf-8") if args.file else sys.stdin
+    paragraphs = iter_paragraphs(source)
+    checkpoint = None
+    if args.output:
+        args.output.touch()
+        out = args.output.open("r+b")
+        checkpoint = Checkpoint(args.output, args.model)
+        replay = _resume(paragraphs, checkpoint, out)
+        if checkpoint.n_done and console is not None:
+            console.print(
+                f"⏩ [bold]Resuming after {checkpoint.n_done} paragraph(s).[/bold]"
+            )
+        paragraphs = iter([*replay, *paragraphs])
+    else:
+        out = sys.stdout.buffer
+
+    t_start = time.monotonic()
+    status = (
+        console.status("[bold yellow]🤖 Correcting...[/bold yellow]")
+        if console is not None
+        else None
+    )
+
+    def on_progress(n_done: int, n_skipped: int) -> None:
+        if status is not None:
+            status.update(
+                f"[bold yellow]🤖 Corrected {n_done} paragraph(s) ({n_skipped} without the model)...[/bold yellow]"
+            )
+
+    try:
+        if status is not None:
+            status.start()
+        n_done, n_skipped = asyncio.run(
+            stream_corrections(
+                agent,
+                paragraphs,
+                out,
+                args.model,
+                cache,
+                args.max_concurrency,
+                checkpoint,
+                on_progress,
+                words,
+            )
+        )
+    finally:
+        if status is not None:
+            status.stop()
+        if args.output:
+            out.close()
+        if args.file:
+            source.close()
+
+    if checkpoint is not None:
+        checkpoint.remove()
+    if console is not None:
+        elapsed = time.monotonic() - t_start
+        target = args.output or "stdout"
+        console.print(
+            f"✅ [bold green]Corrected {n_done} paragraph(s) into {target}[/bold green] "
+            f"[bold yellow](took {elapsed:.2f} seconds, {n_skipped} without the model)[/bold yellow]"
+        )
+
+
+# --- Batch Mode ---
+
+
+def split_document(text: str) -> list[tuple[str, bool]]:
+    """
+    Split a document into `(chunk, is_prose)` pairs, where front matter and fenced
+    code blocks are not prose. Concatenating the chunks reproduces the document.
+    """
+    chunks: list[tuple[str, bool]] = []
+    position = 0
+    front_matter = FRONT_MATTER.match(text)
+    if front_matter:
+        chunks.append((front_matter.group(0), False))
+        position = front_matter.end()
+    for fence in CODE_FENCE.finditer(text, position):
+        if fence.start() > position:
+            chunks.append((text[position : fence.start()], True))
+        chunks.append((fence.group(0), False))
+        position = fence.end()
+    if position < len(text):
+        chunks.append((text[position:], True))
+    return chunks
+
+
+def count_words(text: str) -> int:
+    return sum(
+        len(chunk.split()) for chunk, is_prose in split_document(text) if is_prose
+    )
+
+
+async def correct_document(
+    agent: Agent,
+    text: str,
+    model: str,
+    cache: ResultCache | None,
+    semaphore: asyncio.Semaphore,
+    words: WordSet | None = None,
+) -> Correction:
+    """Correct the prose of a document, leaving front matter and code blocks as they are."""
+    t_start = time.monotonic()
+    chunks = split_document(text)
+    tasks = [
+        asyncio.create_task(
+            correct_text(agent, chunk, model, cache, words=words, semaphore=semaphore)
+        )
+        for chunk, is_prose in chunks
+        if is_prose
+    ]
+    try:
+        corrections = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    results = iter(corrections)
+    parts = [next(results).text if is_prose else chunk for chunk, is_prose in chunks]
+    return Correction(
+        "".join(parts),
+        time.monotonic() - t_start,
+        sum(c.n_segments for c in corrections),
+        sum(c.n_cached for c in corrections),
+        sum(c.n_clean for c in corrections),
+    )
+
+
+class Manifest:
+    """
+    Results of earlier batch runs over a directory, keyed on the relative file path.
+
+    Each entry holds the hash of the input and, if the correction changed anything, the
+    corrected text. A file is up to date when it still hashes to the recorded input, or
+    to the recorded output (after --in-place). The manifest lives outside the directory.
+    """
+
+    def __init__(self, root: Path, model: str) -> None:
+        self.path = MANIFEST_DIR / f"{text_hash(str(root.resolve()))[:16]}.json"
+        self.model = model
+        self.files: dict[str, dict[str, str]] = {}
+        self.dirty = False
+        self.saved_at = time.monotonic()
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get("model") == model and data.get("prompt_version") == PROMPT_VERSION:
+            self.files = data["files"]
+
+    def lookup(self, name: str, text: str) -> str | None:
+        """Return the recorded correction of `text`, or None if it must be (re)processed."""
+        entry = self.files.get(name)
+        if entry is None:
+            return None
+        digest = text_hash(text)
+        if digest == entry["input"]:
+            return entry.get("output", text)
+        if "output" in entry and digest == text_hash(entry["output"]):
+            return text  # Already corrected in place
+        return None
+
+    def record(self, name: str, text: str, corrected: str) -> None:
+        entry = {"input": text_hash(text)}
+        if corrected != text:
+            entry["output"] = corrected
+        if self.files.get(name) != entry:
+            self.files[name] = entry
+            self.dirty = True
+
+    def save_if_due(self) -> None:
+        """Save at most every MANIFEST_SAVE_INTERVAL seconds, not after every file."""
+        if self.dirty and time.monotonic() - self.saved_at >= MANIFEST_SAVE_INTERVAL:
+            self.save()
+
+    def save(self) -> None:
+        """Persist the manifest atomically, if anything changed."""
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "model": self.model,
+            "prompt_version": PROMPT_VERSION,
+            "files": self.files,
+        }
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        tmp.replace(self.path)
+        self.dirty = False
+        self.saved_at = time.monotonic()
+
+
+async def correct_tree(
+    args: argparse.Namespace,
+    agent: Agent,
+    cache: ResultCache | None,
+    words: WordSet | None,
+    out: TextIO,
+    on_progress=None,
+) -> tuple[int, int, int, int]:
+    """
+    Correct every file matching --glob under --recursive through a shared pool of at
+    most --max-concurrency requests. Diffs are written in file order; with --in-place,
+    files are rewritten as soon as they are done.
+    Returns the number of files, how many came from the manifest, how many changed,
+    and the number of prose words sent through the correction.
+    """
+    root: Path = args.recursive
+    paths = sorted(p for p in root.rglob(args.glob) if p.is_file())
+    manifest = Manifest(root, args.model)
+    semaphore = asyncio.Semaphore(args.max_concurrency)
+    n_done = n_unchanged = n_changed = n_words = 0
+
+    async def process(path: Path) -> tuple[str, str, bool]:
+        nonlocal n_words
+        text = await asyncio.to_thread(path.read_text, encoding="utf-8")
+        name = path.relative_to(root).as_posix()
+        corrected = manifest.lookup(name, text)
+        from_manifest = corrected is not None
+        if corrected is None:
+            n_words += count_words(text)
+            correction = await correct_document(
+                agent, text, args.model, cache, semaphore, words
+            )
+            corrected = correction.text
+            manifest.record(name, text, corrected)
+        if args.in_place and corrected != text:
+            tmp = path.with_name(path.name + ".tmp")
+            await asyncio.to_thread(tmp.write_text, corrected, encoding="utf-8")
+            tmp.replace(path)
+            manifest.record(name, corrected, corrected)
+        manifest.save_if_due()
+        return text, corrected, from_manifest
+
+    tasks = [asyncio.create_task(process(path)) for path in paths]
+    try:
+        for path, task in zip(paths, tasks):
+            text, corrected, from_manifest = await task
+            n_done += 1
+            n_unchanged += from_manifest
+            if corrected != text:
+                n_changed += 1
+                if not args.in_place:
+                    name = path.relative_to(root).as_posix()
+                    out.writelines(
+                        difflib.unified_diff(
+                            text.splitlines(keepends=True),
+                            corrected.splitlines(keepends=True),
+                            fromfile=f"a/{name}",
+                            tofile=f"b/{name}",
+                        )
+                    )
+                    out.flush()
+            if on_progress is not None:
+                on_progress(n_done, len(paths))
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Also on failure or Ctrl+C, so the files done so far are not redone.
+        manifest.save()
+    return n_done, n_unchanged, n_changed, n_words
+
+
+def correct_directory(
+    args: argparse.Namespace,
+    agent: Agent,
+    cache: ResultCache | None,
+    words: WordSet | None,
+    console: Console | None,
+) -> None:
+    """Run batch mode and report the throughput."""
+    if not args.recursive.is_dir():
+        raise NotADirectoryError(f"Not a directory: {args.recursive}")
+    out = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    t_start = time.monotonic()
+    status = (
+        console.status("[bold yellow]🤖 Correcting files...[/bold yellow]")
+        if console is not None
+        else None
+    )
+
+    def on_progress(n_done: int, n_total: int) -> None:
+        if status is not None:
+            status.update(
+                f"[bold yellow]🤖 Corrected {n_done}/{n_total} file(s)...[/bold yellow]"
+            )
+
+    try:
+        if status is not None:
+            status.start()
+        n_done, n_unchanged, n_changed, n_words = asyncio.run(
+            correct_tree(args, agent, cache, words, out, on_progress)
+        )
+    finally:
+        if status is not None:
+            status.stop()
+        if args.output:
+            out.close()
+
+    if console is not None:
+        elapsed = time.monotonic() - t_start
+        rate = n_words / elapsed if elapsed > 0 else 0.0
+        action = "rewrote" if args.in_place else "diffs for"
+        console.print(
+            f"✅ [bold green]Corrected {n_done} file(s), {action} {n_changed} changed file(s)[/bold green] "
+            f"[bold yellow](took {elapsed:.2f} seconds, {n_unchanged} unchanged since the last run, "
+            f"{n_words} words at {rate:.0f} words/s)[/bold yellow]"
+        )
+
+
+# --- Daemon ---
+
+
+def correct_via_daemon(
+    path: Path, text: str, model: str, force: bool
+) -> Correction | None:
+    """Ask a running daemon to correct `text`.
+
+    Returns None if no daemon is listening or it could not handle the request,
+    so the caller falls back to correcting in-process.
+    """
+    t_start = time.monotonic()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1.0)
+            sock.connect(str(path))
+            # A daemon that accepts but hangs must not freeze the caller.
+            sock.settimeout(DAEMON_TIMEOUT + DAEMON_TIMEOUT_PER_CHAR * len(text))
+            request = {"text": text, "model": model, "force": force}
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as f:
+                response = json.loads(f.readline())
+    except (OSError, ValueError):  # No daemon, it went away, or it timed out
+        return None
+    if "error" in response:
+        print(f"⚠️  Daemon error, correcting here: {response['error']}", file=sys.stderr)
+        return None
+    # Report the time this request took, not when the (speculative) correction ran.
+    response["elapsed"] = time.monotonic() - t_start
+    return Correction(**response)
+
+
+async def run_daemon(args: argparse.Namespace, console: Console | None) -> None:
+    """Serve correction requests over a Unix socket with warm agents."""
+    if correct_via_daemon(args.socket, "", args.model, True) is not None:
+        raise RuntimeError(f"A daemon is already listening on {args.socket}")
+    args.socket.unlink(missing_ok=True)
+    args.socket.parent.mkdir(parents=True, exist_ok=True)
+
+    agents: dict[str, Agent] = {}
+    cache = None if args.no_cache else ResultCache()
+    words = None if args.force else load_wordset()
+    # Recent corrections by (text hash, model, force), finished or still running.
+    tasks: OrderedDict[tuple[str, str, bool], asyncio.Task[Correction]] = OrderedDict()
+    # Our own results end up on the clipboard, so don't correct them again.
+    recent_outputs: deque[str] = deque(maxlen=MAX_TRACKED_TASKS)
+
+    def finished(task: asyncio.Task[Correction]) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            if console is not None:
+                console.print(f"[red]Correction failed: {task.exception()}[/red]")
+            return
+        recent_outputs.append(text_hash(task.result().text))
+
+    def schedule(text: str, model: str, force: bool) -> asyncio.Task[Correction]:
+        key = (text_hash(text), model, force)
+        task = tasks.get(key)
+        if task is None or (task.done() and task.exception() is not None):
+            if model not in agents:
+                agents[model] = build_agent(model)
+            task = asyncio.create_task(
+                correct_text(
+                    agents[model],
+                    text,
+                    model,
+                    cache,
+                    args.max_concurrency,
+                    None if force else words,
+                )
+            )
+            task.add_done_callback(finished)
+            tasks[key] = task
+        tasks.move_to_end(key)
+        while len(tasks) > MAX_TRACKED_TASKS:
+            tasks.popitem(last=False)
+        return task
+
+    async def handle(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = json.loads(await reader.readline())
+            if not request["text"].strip():  # Used as a liveness probe
+                response = Correction("", 0.0, 0, 0)._asdict()
+            else:
+                task = schedule(
+                    request["text"],
+                    request.get("model", args.model),
+                    request.get("force", False),
+                )
+                # Shielded, so a client that goes away doesn't cancel a shared task.
+                response = (await asyncio.shield(task))._asdict()
+        except Exception as e:
+            response = {"error": str(e)}
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+        writer.close()
+
+    async def watch_clipboard() -> None:
+        last_text = None
+        while True:
+            try:
+                text = await clipboard.paste_async()
+            except clipboard.ClipboardError:
+                text = last_text
+            if (
+                text
+                and text != last_text
+                and text.strip()
+                and len(text) <= WATCH_MAX_CHARS
+                and text_hash(text) not in recent_outputs
+            ):
+                if console is not None:
+                    console.print(
+                        f"[dim]📋 Pre-correcting {len(text)} character(s)[/dim]"
+                    )
+                schedule(text, args.model, args.force)
+            last_text = text
+            await asyncio.sleep(args.watch_interval)
+
+    server = await asyncio.start_unix_server(
+        handle, path=str(args.socket), limit=MAX_REQUEST_BYTES
+    )
+    os.chmod(args.socket, 0o600)
+    if console is not None:
+        console.print(
+            f"🚀 [bold green]Daemon listening on {args.socket}[/bold green] "
+            f"(model {args.model}{', watching the clipboard' if args.watch_clipboard else ''})"
+        )
+    watcher = asyncio.create_task(watch_clipboard()) if args.watch_clipboard else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
+        args.socket.unlink(missing_ok=True)
+
+
+def correct_clipboard_text(
+    args: argparse.Namespace, text: str
+) -> tuple[Correction, ResultCache | None]:
+    """Correct via the daemon if one is running, otherwise in this process.
+
+    Also returns the cache used in this process, which the daemon path never
+    opens (nor loads the word list).
+    """
+    if not args.no_daemon:
+        correction = correct_via_daemon(args.socket, text, args.model, args.force)
+        if correction is not None:
+            return correction, None
+    cache = None if args.no_cache else ResultCache()
+    words = None if args.force else load_wordset()
+    agent = build_agent(args.model)
+    correction = process_text(
+        agent, text, args.model, cache, args.max_concurrency, words
+    )
+    return correction, cache
 
 
 def display_original_text(original_text: str, console: Console | None) -> None:
@@ -119,9 +1010,12 @@ def output_corrected_text(
     elapsed: float,
     simple_output: bool,
     console: Console | None,
+    n_segments: int = 1,
+    n_cached: int = 0,
+    n_clean: int = 0,
 ) -> None:
     """Handle output and clipboard copying based on desired verbosity."""
-    pyperclip.copy(corrected_text)
+    clipboard.copy(corrected_text)
 
     if simple_output:
         if corrected_text.strip() == original_text.strip():
@@ -141,6 +1035,14 @@ def output_corrected_text(
         console.print(
             f"✅ [bold green]Success! Corrected text has been copied to your clipboard. [bold yellow](took {elapsed:.2f} seconds)[/bold yellow][/bold green]"
         )
+        if n_cached:
+            console.print(
+                f"♻️  [dim]{n_cached}/{n_segments} paragraph(s) served from cache.[/dim]"
+            )
+        if n_clean:
+            console.print(
+                f"🔎 [dim]{n_clean}/{n_segments} paragraph(s) passed the local pre-check (model skipped).[/dim]"
+            )
 
 
 def main() -> None:
@@ -148,9 +1050,45 @@ def main() -> None:
     args = parse_args()
     simple_output = args.simple_output
 
+    if args.cache_stats:
+        cache = ResultCache()
+        print(f"🗄️  {cache.summary()}")
+        counters = cache.counters()
+        n_checked = counters.get("precheck_segments", 0)
+        if n_checked:
+            n_clean = counters.get("precheck_clean", 0)
+            print(
+                f"🔎 Pre-check avoided the model for {n_clean}/{n_checked} "
+                f"paragraph(s) ({n_clean / n_checked:.0%})"
+            )
+        return
+
+    if args.daemon:
+        try:
+            asyncio.run(run_daemon(args, Console()))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.file or args.stdin or args.recursive:
+        # The corrected text may go to stdout, so status messages go to stderr.
+        console = Console(stderr=True) if not simple_output else None
+        agent = build_agent(args.model)
+        cache = None if args.no_cache else ResultCache()
+        words = None if args.force else load_wordset()
+        try:
+            if args.recursive:
+                correct_directory(args, agent, cache, words, console)
+            else:
+                correct_stream(args, agent, cache, words, console)
+        except Exception as e:
+            print(f"❌ {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
     console: Console | None = Console() if not simple_output else None
 
-    original_text = pyperclip.paste()
+    original_text = clipboard.paste()
 
     if not original_text or not original_text.strip():
         message = "❌ Clipboard is empty. Nothing to correct."
@@ -163,26 +1101,29 @@ def main() -> None:
 
     display_original_text(original_text, console)
 
-    agent = build_agent(args.model)
-
     try:
         if simple_output:
-            corrected_text, elapsed = process_text(agent, original_text)
+            correction, cache = correct_clipboard_text(args, original_text)
         else:
             assert console is not None
             with Status(
                 "[bold yellow]🤖 Processing text with Ollama model...[/bold yellow]",
                 console=console,
             ):
-                corrected_text, elapsed = process_text(agent, original_text)
+                correction, cache = correct_clipboard_text(args, original_text)
 
         output_corrected_text(
-            corrected_text,
+            correction.text,
             original_text,
-            elapsed,
+            correction.elapsed,
             simple_output,
             console,
+            n_segments=correction.n_segments,
+            n_cached=correction.n_cached,
+            n_clean=correction.n_clean,
         )
+        if console is not None and cache is not None:
+            console.print(f"[dim]🗄️  Cache: {cache.summary()}[/dim]")
 
     except Exception as e:
         if simple_output:
@@ -190,8 +1131,10 @@ def main() -> None:
         else:
             assert console is not None
             console.print(f"❌ [bold red]An unexpected error occurred: {e}[/bold red]")
+            from llm_backend import configured_hosts
+
             console.print(
-                f"   Please check that your Ollama server is running at [bold cyan]{MY_OLLAMA_HOST}[/bold cyan]"
+                f"   Please check that your Ollama server is running at [bold cyan]{', '.join(configured_hosts())}[/bold cyan]"
             )
         sys.exit(1)
 
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""Audit and repair the symlinks of install.conf.yaml without a full dotbot run.
+
+Reads every `link` section once (with the `defaults` and `if` conditions that
+apply to it), looks at all link locations with one directory scan per parent
+directory, and reports the drift:
+
+    ok           the symlink points to the file in this repository
+    missing      nothing there yet
+    wrong        a symlink that points somewhere else
+    in the way   a regular file or directory occupies the location
+    no source    the file in this repository does not exist
+
+`apply` changes only what drifted, following dotbot's `create`, `relink`,
+and `force` options, and records the links in a manifest that uninstall.py
+uses to remove exactly what was installed. `record` only writes the manifest
+(run at the end of ./install, after dotbot created the links).
+
+Usage:
+    python3 scripts/links.py                # status, only the links that drifted
+    python3 scripts/links.py status --all
+    python3 scripts/links.py apply [--dry-run]
+    python3 scripts/links.py bench          # compare against `dotbot --only link`
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+CONFIG = REPO / "install.conf.yaml"
+DOTBOT = REPO / "submodules" / "dotbot" / "bin" / "dotbot"
+MANIFEST = Path.home() / ".local" / "state" / "dotfiles" / "links.json"
+
+try:
+    import yaml
+except ImportError:  # Before anything is installed, use the copy that dotbot vendors
+    sys.path.append(str(REPO / "submodules" / "dotbot" / "lib" / "pyyaml" / "lib"))
+    import yaml
+
+
+@dataclass
+class Link:
+    """One entry of a `link` section, with the options that apply to it."""
+
+    target: str  # The location of the symlink, as written in the config
+    source: str  # Absolute path of the file in this repository
+    create: bool = False
+    relink: bool = False
+    force: bool = False
+    condition: str | None = None
+    state: str = ""
+
+    @property
+    def path(self) -> str:
+        return os.path.expanduser(self.target)
+
+
+def load_links(config: Path = CONFIG, base: Path = REPO) -> list[Link]:
+    """All links of the config, with `defaults` applied like dotbot does."""
+    with open(config) as f:
+        tasks = yaml.safe_load(f) or []
+    defaults: dict = {}
+    links = []
+    for task in tasks:
+        if "defaults" in task:
+            defaults = task["defaults"].get("link", {})
+        for target, spec in (task.get("link") or {}).items():
+            options = {**defaults, **(spec if isinstance(spec, dict) else {})}
+            source = spec.get("path") if isinstance(spec, dict) else spec
+            if source is None:  # `~/.foo:` links to `foo` (without the dot)
+                source = os.path.basename(target).lstrip(".")
+            links.append(
+                Link(
+                    target,
+                    os.path.normpath(os.path.join(base, os.path.expanduser(source))),
+                    create=options.get("create", False),
+                    relink=options.get("relink", False),
+                    force=options.get("force", False),
+                    condition=options.get("if"),
+                )
+            )
+    return links
+
+
+def _points_to(path: str, source: str) -> bool:
+    """Whether the symlink at `path` leads to `source`, however either is spelled.
+
+    ./install gives dotbot the logical path of the repository, which differs
+    from `REPO` when ~/dotfiles is itself reached through a symlink.
+    """
+    return os.path.realpath(path) == os.path.realpath(source)
+
+
+@cache
+def _condition_holds(condition: str) -> bool:
+    return subprocess.run(condition, shell=True, check=False).returncode == 0
+
+
+@cache
+def _entries(directory: str) -> dict[str, os.DirEntry]:
+    """The entries of a directory, scanned once however many links it holds."""
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name: entry for entry in it}
+    except OSError:
+        return {}
+
+
+def audit(links: list[Link]) -> list[Link]:
+    """Set the state of every link and return the ones that apply here."""
+    _entries.cache_clear()
+    active = []
+    for link in links:
+        if link.condition and not _condition_holds(link.condition):
+            continue
+        directory, name = os.path.split(link.path)
+        entry = _entries(directory).get(name)
+        if not os.path.lexists(link.source):
+            link.state = "no source"
+        elif entry is None:
+            link.state = "missing"
+        elif entry.is_symlink():
+            link.state = "ok" if _points_to(link.path, link.source) else "wrong"
+        else:
+            link.state = "in the way"
+        active.append(link)
+    return active
+
+
+def apply(links: list[Link], dry_run: bool = False) -> list[tuple[Link, str]]:
+    """Fix the links that drifted; return what was done (or skipped) per link."""
+    actions = []
+    for link in links:
+        if link.state in ("ok", "no source"):
+            continue
+        path = link.path
+        if link.state == "wrong" and not (link.relink or link.force):
+            actions.append((link, "skipped, relink is off"))
+            continue
+        if link.state == "in the way" and not link.force:
+            actions.append((link, "skipped, force is off"))
+            continue
+        if not link.create and not os.path.isdir(os.path.dirname(path)):
+            actions.append((link, "skipped, parent missing and create is off"))
+            continue
+        actions.append((link, "linked"))
+        if dry_run:
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if link.state == "wrong" or (
+            link.state == "in the way" and not os.path.isdir(path)
+        ):
+            os.unlink(path)
+        elif link.state == "in the way":
+            shutil.rmtree(path)
+        os.symlink(link.source, path)
+        link.state = "ok"
+    return actions
+
+
+def record(links: list[Link]) -> None:
+    """Add the links that point into this repository to the manifest.
+
+    The manifest stores what each symlink actually contains, so uninstall.py
+    can compare it with `readlink` as is.
+    """
+    try:
+        manifest = json.loads(MANIFEST.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+    # Drop entries that no longer point where they were installed to.
+    manifest = {
+        path: source
+        for path, source in manifest.items()
+        if os.path.islink(path) and os.readlink(path) == source
+    }
+    manifest.update(
+        {link.path: os.readlink(link.path) for link in links if link.state == "ok"}
+    )
+    MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+    MANIFEST.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def print_status(links: list[Link], show_all: bool) -> None:
+    icons = {
+        "ok": "✅",
+        "missing": "➕",
+        "wrong": "🔀",
+        "in the way": "⛔",
+        "no source": "❓",
+    }
+    drifted = [link for link in links if link.state != "ok"]
+    for link in links if show_all else drifted:
+        print(f"{icons[link.state]} {link.state:<10}  {link.target}")
+        if link.state == "wrong":
+            print(f"{'':14}→ {os.readlink(link.path)} (expected {link.source})")
+    print(f"🔗 {len(links)} link(s), {len(drifted)} drifted")
+
+
+def bench(repeat: int) -> None:
+    """Time an audit and an in-sync apply against `dotbot --only link`."""
+
+    def timed(fn) -> float:
+        t_start = time.perf_counter()
+        for _ in range(repeat):
+            fn()
+        return (time.perf_counter() - t_start) / repeat
+
+    def ours() -> None:
+        _condition_holds.cache_clear()
+        apply(audit(load_links()))
+
+    t_ours = timed(ours)
+    print(f"links.py audit + apply: {t_ours * 1000:8.1f} ms")
+    if not DOTBOT.exists():
+        print(f"dotbot not found at {DOTBOT}, run `git submodule update --init`")
+        return
+    cmd = [sys.executable, str(DOTBOT), "-Q", "-d", str(REPO), "-c", str(CONFIG)]
+    t_dotbot = timed(
+        lambda: subprocess.run([*cmd, "--only", "link"], check=False, cwd=REPO)
+    )
+    print(f"dotbot --only link:     {t_dotbot * 1000:8.1f} ms")
+    print(f"links.py is {t_dotbot / t_ours:.1f}x faster")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments and return the parsed namespace."""
+    parser = argparse.ArgumentParser(
+        description="Audit and repair the symlinks of install.conf.yaml."
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    status = subparsers.add_parser("status", help="Report links that drifted.")
+    status.add_argument("--all", action="store_true", help="Also list ok links.")
+    apply_parser = subparsers.add_parser(
+        "apply", help="Fix drifted links and record them in the manifest."
+    )
+    apply_parser.add_argument(
+        "--dry-run", "-n", action="store_true", help="Only show what would change."
+    )
+    subparsers.add_parser("record", help="Record the installed links.")
+    bench_parser = subparsers.add_parser(
+        "bench", help="Compare against `dotbot --only link`."
+    )
+    bench_parser.add_argument(
+        "--repeat", "-r", type=int, default=5, help="Runs to average (default: 5)."
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "bench":
+        bench(args.repeat)
+        return
+    links = audit(load_links())
+    if args.command == "apply":
+        actions = apply(links, dry_run=args.dry_run)
+        for link, action in actions:
+            print(f"{'🔗' if action == 'linked' else '⏭️'} {link.target}: {action}")
+        if not actions:
+            print("✅ All links are in place")
+        if not args.dry_run:
+            record(links)
+    elif args.command == "record":
+        record(links)
+    else:
+        print_status(links, show_all=getattr(args, "all", False))
+        if any(link.state != "ok" for link in links):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Shared Ollama backend with pooled connections and multi-host failover.
+
+Hosts come from `MY_OLLAMA_HOSTS` (comma-separated), falling back to
+`MY_OLLAMA_HOST`. With more than one host, a background thread polls each
+host's `/api/ps` for health and loaded models, and every request goes to the
+healthy host that already has the model loaded and the fewest requests in
+flight from this process. Connection errors and HTTP errors fail over to the
+next host, and a host whose request failed is tried last for a minute. Each
+host gets one pooled HTTP client that all agents share. Every request's usage
+and timing is recorded by llm_usage.py.
+
+Used by commit.py, fix_my_text_ollama.py, and voice_clipboard_assistant.py.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import httpx
+from openai import APIConnectionError, AsyncOpenAI
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.models import Model
+from pydantic_ai.models.fallback import FallbackModel
+from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.providers.openai import OpenAIProvider
+
+from llm_usage import RecordingModel
+
+DEFAULT_HOST = "http://localhost:11434"
+PROBE_INTERVAL = 10.0  # seconds between background health checks
+PROBE_TIMEOUT = 0.5  # seconds; a host that doesn't answer in time counts as down
+FAILURE_PENALTY = 60.0  # seconds a host is tried last after a failed request
+FAILOVER_ERRORS = (ModelHTTPError, APIConnectionError)
+
+
+def configured_hosts() -> list[str]:
+    """Return the Ollama hosts from `MY_OLLAMA_HOSTS` or `MY_OLLAMA_HOST`."""
+    value = os.getenv("MY_OLLAMA_HOSTS") or os.getenv("MY_OLLAMA_HOST", DEFAULT_HOST)
+    return [host.strip().rstrip("/") for host in value.split(",") if host.strip()]
+
+
+@dataclass
+class HostStatus:
+    """What is known about one host."""
+
+    healthy: bool = True  # Optimistic until a probe or request says otherwise
+    loaded_models: set[str] = field(default_factory=set)
+    latency: float = 0.0
+    in_flight: int = 0
+    checked_at: float = 0.0
+    failed_at: float = 0.0  # Last connection error or 5xx response
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response body that reports when it is closed, so streamed requests count as in flight."""
+
+    def __init__(
+        self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]
+    ) -> None:
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None  # type: ignore[assignment]
+
+
+class _CountingTransport(httpx.AsyncHTTPTransport):
+    """Transport that tracks in-flight requests and connection failures per host."""
+
+    def __init__(self, pool: HostPool, host: str) -> None:
+        super().__init__(retries=0)
+        self._hosts = pool  # Not `_pool`, which is httpx's connection pool
+        self._host = host
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        status = self._hosts.status[self._host]
+        status.in_flight += 1
+        try:
+            response = await super().handle_async_request(request)
+        except httpx.TransportError:
+            status.in_flight -= 1
+            status.healthy = False
+            status.failed_at = time.time()
+            raise
+        if response.status_code >= 500:
+            # `/api/ps` can still answer while generation fails, so the probe
+            # alone would keep such a host first in line.
+            status.failed_at = time.time()
+        self._hosts.last_host = self._host
+
+        def done() -> None:
+            status.in_flight -= 1
+
+        response.stream = _TrackedStream(response.stream, done)
+        return response
+
+
+class HostPool:
+    """The configured hosts, their status, and one pooled HTTP client per host."""
+
+    def __init__(self, hosts: list[str]) -> None:
+        self.hosts = hosts
+        self.status = {host: HostStatus() for host in hosts}
+        self.last_host: str | None = None
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._prober: threading.Thread | None = None
+
+    def client(self, host: str) -> httpx.AsyncClient:
+        """The shared HTTP client for `host`."""
+        if host not in self._clients:
+            self._clients[host] = httpx.AsyncClient(
+                transport=_CountingTransport(self, host),
+                timeout=httpx.Timeout(600, connect=5),
+            )
+        return self._clients[host]
+
+    def probe(self, host: str) -> None:
+        """Refresh the health and loaded models of `host` from `/api/ps`."""
+        status = self.status[host]
+        t_start = time.monotonic()
+        try:
+            response = httpx.get(f"{host}/api/ps", timeout=PROBE_TIMEOUT)
+            response.raise_for_status()
+            models = response.json().get("models", [])
+        except (httpx.HTTPError, ValueError):
+            status.healthy = False
+        else:
+            status.healthy = True
+            status.loaded_models = {m.get("model") or m.get("name") for m in models}
+            status.latency = time.monotonic() - t_start
+        status.checked_at = time.time()
+
+    def probe_all(self) -> None:
+        """Probe all hosts concurrently."""
+        with ThreadPoolExecutor(len(self.hosts)) as executor:
+            list(executor.map(self.probe, self.hosts))
+
+    def start_probing(self) -> None:
+        """Probe once now, then keep probing in a background thread."""
+        if len(self.hosts) < 2 or self._prober is not None:
+            return  # Nothing to choose between
+        self.probe_all()
+
+        def loop() -> None:
+            while True:
+                time.sleep(PROBE_INTERVAL)
+                self.probe_all()
+
+        self._prober = threading.Thread(target=loop, name="ollama-probe", daemon=True)
+        self._prober.start()
+
+    def ranked(self, model: str) -> list[str]:
+        """Hosts in order of preference for `model`."""
+        now = time.time()
+
+        def key(host: str) -> tuple:
+            status = self.status[host]
+            return (
+                not status.healthy,
+                now - status.failed_at < FAILURE_PENALTY,
+                model not in status.loaded_models,
+                status.in_flight,
+                status.latency,
+            )
+
+        return sorted(self.hosts, key=key)  # Stable, so ties keep the configured order
+
+    def describe(self) -> str:
+        """Comma-separated hosts, for error messages."""
+        return ", ".join(self.hosts)
+
+
+class PooledModel(FallbackModel):
+    """A model served by every host in the pool, tried in order of preference."""
+
+    def __init__(self, pool: HostPool, model_name: str) -> None:
+        self._pool = pool
+        self._name = model_name
+        self._by_host = {
+            # No client-side retries: failing over to the next host is faster.
+            # Recorded per host, so every attempt is attributed to the host it went to.
+            host: RecordingModel(
+                _openai_model(pool, host, model_name, max_retries=0), host=host
+            )
+            for host in pool.hosts
+        }
+        super().__init__(*self._by_host.values(), fallback_on=FAILOVER_ERRORS)
+
+    @property
+    def models(self) -> list[Model]:
+        # Re-ranked on every request, since load and health change over time.
+        return [self._by_host[host] for host in self._pool.ranked(self._name)]
+
+    @models.setter
+    def models(self, value: list[Model]) -> None:
+        pass  # The order is computed per request
+
+    @property
+    def model_name(self) -> str:
+        return self._name
+
+
+def _openai_model(
+    pool: HostPool, host: str, model_name: str, max_retries: int = 2
+) -> OpenAIModel:
+    client = AsyncOpenAI(
+        base_url=f"{host}/v1",
+        api_key="ollama",  # Required by the client, ignored by Ollama
+        http_client=pool.client(host),
+        max_retries=max_retries,
+    )
+    return OpenAIModel(
+        model_name=model_name, provider=OpenAIProvider(openai_client=client)
+    )
+
+
+_pool: HostPool | None = None
+
+
+def get_pool() -> HostPool:
+    """The process-wide host pool, created (and probed) on first use."""
+    global _pool
+    if _pool is None:
+        _pool = HostPool(configured_hosts())
+        _pool.start_probing()
+    return _pool
+
+
+def reset_pool() -> None:
+    """Forget the process-wide pool, so the next use re-reads the configured hosts.
+
+    The pooled clients are bound to the event loop they were first used in, so
+    callers that start a new event loop (like llm_harness.py) reset the pool first.
+    """
+    global _pool
+    _pool = None
+
+
+def served_by() -> str:
+    """Return ' on <host>' for the host that answered last, if there was a choice."""
+    if _pool is None or len(_pool.hosts) < 2 or _pool.last_host is None:
+        return ""
+    return f" on {_pool.last_host}"
+
+
+def build_model(model_name: str) -> Model:
+    """A model for pydantic-ai agents, backed by the shared host pool."""
+    pool = get_pool()
+    if len(pool.hosts) == 1:
+        host = pool.hosts[0]
+        return RecordingModel(_openai_model(pool, host, model_name), host=host)
+    return PooledModel(pool, model_name)
+
+
+if __name__ == "__main__":
+    pool = HostPool(configured_hosts())
+    pool.probe_all()
+    for host in pool.hosts:
+        status = pool.status[host]
+        state = "up" if status.healthy else "down"
+        loaded = ", ".join(sorted(status.loaded_models)) or "-"
+        print(f"{host}: {state} ({status.latency * 1000:.0f} ms), loaded: {loaded}")
@@ -0,0 +1,381 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "httpx",
+#   "pydantic",
+#   "pydantic-ai-slim[openai]",
+#   "pyperclip",
+#   "rich",
+# ]
+# ///
+"""Benchmark models on the text-correction and commit-message tasks.
+
+Runs every model against a bundled corpus (llm_benchmark_corpus.json) of text
+samples and git diffs with reference outputs, using the same prompts as
+fix_my_text_ollama.py and commit.py. For each model and task it reports the
+load time, time to first token, tokens per second, total latency, retries,
+and a simple quality score (similarity to the reference), as a table and JSON.
+
+Usage:
+    python llm_benchmark.py
+    python llm_benchmark.py --models gemma3:latest qwen3:8b --tasks correct --repeat 3
+    python llm_benchmark.py --base-url http://localhost:8080/v1 --models my-model
+
+Environment variables:
+    MY_OLLAMA_HOSTS, MY_OLLAMA_HOST: The Ollama hosts (see llm_backend.py); the
+    first one is benchmarked. Default is "http://localhost:11434".
+
+The load time is measured with Ollama's /api/generate endpoint and is left
+empty for other OpenAI-compatible servers. Use --cold to unload each model
+first, so the load time includes reading it from disk.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, NamedTuple
+
+import httpx
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse
+from rich.console import Console
+from rich.table import Table
+
+import commit
+import fix_my_text_ollama
+import llm_backend
+
+# --- Configuration ---
+CORPUS_FILE = Path(__file__).with_name("llm_benchmark_corpus.json")
+RESULTS_DIR = Path.home() / ".cache" / "dotfiles-llm" / "benchmarks"
+TASKS = ["correct", "commit"]
+DEFAULT_MODELS = [fix_my_text_ollama.DEFAULT_MODEL, commit.DEFAULT_MODEL]
+
+
+class SampleResult(NamedTuple):
+    """Measurements of a single model run on a single corpus sample."""
+
+    model: str
+    task: str
+    sample: int
+    ttft: float | None
+    total: float | None
+    output_tokens: int | None
+    tokens_per_second: float | None
+    retries: int
+    quality: float | None
+    error: str | None = None
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments and return the parsed namespace."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark models on the text-correction and commit-message tasks."
+    )
+    parser.add_argument(
+        "--models",
+        "-m",
+        nargs="+",
+        default=DEFAULT_MODELS,
+        help=f"The models to benchmark. Default is {' '.join(DEFAULT_MODELS)}.",
+    )
+    parser.add_argument(
+        "--tasks",
+        nargs="+",
+        choices=TASKS,
+        default=TASKS,
+        help="The tasks to run (default: all).",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=f"{llm_backend.configured_hosts()[0]}/v1",
+        help="Base URL of the OpenAI-compatible API (default: the first Ollama host + /v1).",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=CORPUS_FILE,
+        help=f"The corpus of samples and references (default: {CORPUS_FILE.name}).",
+    )
+    parser.add_argument(
+        "--repeat",
+        "-n",
+        type=int,
+        default=1,
+        help="Run every sample this many times (default: 1).",
+    )
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="Unload each model before measuring its load time (Ollama only).",
+    )
+    parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help=f"Where to write the JSON results (default: a timestamped file in {RESULTS_DIR}).",
+    )
+    return parser.parse_args()
+
+
+def build_agent(model: str, task: str) -> Agent:
+    """Construct an agent with the same backend, prompts, and output type as the real script."""
+    llm = llm_backend.build_model(model)
+    if task == "correct":
+        return Agent(
+            model=llm,
+            system_prompt=fix_my_text_ollama.SYSTEM_PROMPT,
+            instructions=fix_my_text_ollama.AGENT_INSTRUCTIONS,
+        )
+    return Agent(
+        model=llm,
+        system_prompt=commit.SYSTEM_PROMPT,
+        instructions=commit.AGENT_INSTRUCTIONS,
+        output_type=commit.ConventionalCommit,
+        retries=3,
+        output_retries=3,
+    )
+
+
+async def measure_load_time(
+    client: httpx.AsyncClient, base_url: str, model: str, cold: bool
+) -> float | None:
+    """Time loading `model` with Ollama's native API; None if that API isn't available."""
+    host = base_url.removesuffix("/").removesuffix("/v1")
+    try:
+        if cold:
+            await client.post(
+                f"{host}/api/generate", json={"model": model, "keep_alive": 0}
+            )
+        t_start = time.monotonic()
+        # An empty prompt only loads the model.
+        response = await client.post(
+            f"{host}/api/generate", json={"model": model, "prompt": "", "stream": False}
+        )
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return None
+    return time.monotonic() - t_start
+
+
+def score(task: str, output: Any, reference: str) -> float:
+    """Similarity of the output to the reference, between 0 and 1."""
+    if task == "correct":
+        return SequenceMatcher(None, str(output).strip(), reference).ratio()
+    # Half for the commit type, half for the similarity of the subject line.
+    ref_type, _, ref_subject = reference.partition(":")
+    type_score = float(output.commit_type == ref_type.split("(")[0].strip())
+    subject_score = SequenceMatcher(
+        None, output.subject.lower(), ref_subject.strip().lower()
+    ).ratio()
+    return (type_score + subject_score) / 2
+
+
+async def run_sample(
+    agent: Agent, model: str, task: str, index: int, prompt: str, reference: str
+) -> SampleResult:
+    """Run a single sample, timing the first streamed token and the full run."""
+    t_start = time.monotonic()
+    first_token_at = None
+    try:
+        async with agent.iter(prompt) as run:
+            async for node in run:
+                if not Agent.is_model_request_node(node):
+                    continue
+                async with node.stream(run.ctx) as request_stream:
+                    async for _ in request_stream:
+                        if first_token_at is None:
+                            first_token_at = time.monotonic()
+            assert run.result is not None
+            output = run.result.output
+            usage = run.usage()
+            # usage.requests counts streamed requests twice, so count the responses.
+            responses = sum(
+                isinstance(m, ModelResponse) for m in run.result.all_messages()
+            )
+    except Exception as e:
+        return SampleResult(model, task, index, None, None, None, None, 0, None, str(e))
+    total = time.monotonic() - t_start
+    ttft = first_token_at - t_start if first_token_at is not None else None
+    tokens = usage.response_tokens
+    generation = total - ttft if ttft is not None else total
+    tokens_per_second = tokens / generation if tokens and generation > 0 else None
+    return SampleResult(
+        model,
+        task,
+        index,
+        ttft,
+        total,
+        tokens,
+        tokens_per_second,
+        max(responses - 1, 0),
+        score(task, output, reference),
+    )
+
+
+async def run_benchmark(
+    args: argparse.Namespace, corpus: dict[str, list[dict[str, str]]], console: Console
+) -> tuple[dict[str, float | None], list[SampleResult]]:
+    """Run every model on every sample, one request at a time so timings don't interfere."""
+    load_times: dict[str, float | None] = {}
+    results: list[SampleResult] = []
+    async with httpx.AsyncClient(timeout=600) as client:
+        for model in args.models:
+            with console.status(f"[bold yellow]⏳ Loading {model}...[/bold yellow]"):
+                load_times[model] = await measure_load_time(
+                    client, args.base_url, model, args.cold
+                )
+            for task in args.tasks:
+                agent = build_agent(model, task)
+                samples = corpus[task]
+                for i, sample in enumerate(samples * args.repeat):
+                    prompt = sample["input"] if task == "correct" else sample["diff"]
+                    with console.status(
+                        f"[bold yellow]🤖 {model} · {task} · "
+                        f"{i + 1}/{len(samples) * args.repeat}[/bold yellow]"
+                    ):
+                        result = await run_sample(
+                            agent,
+                            model,
+                            task,
+                            i % len(samples),
+                            prompt,
+                            sample["reference"],
+                        )
+                    if result.error:
+                        console.print(f"[red]❌ {model} · {task}: {result.error}[/red]")
+                    results.append(result)
+    return load_times, results
+
+
+def _median(values: list[float | None]) -> float | None:
+    present = [v for v in values if v is not None]
+    return statistics.median(present) if present else None
+
+
+def summarize(
+    load_times: dict[str, float | None], results: list[SampleResult]
+) -> list[dict[str, Any]]:
+    """Aggregate the sample results per model and task."""
+    rows = []
+    for model, load_time in load_times.items():
+        for task in dict.fromkeys(r.task for r in results):
+            group = [r for r in results if r.model == model and r.task == task]
+            if not group:
+                continue
+            ok = [r for r in group if r.error is None]
+            rows.append(
+                {
+                    "model": model,
+                    "task": task,
+                    "samples": len(group),
+                    "errors": len(group) - len(ok),
+                    "load_time": load_time,
+                    "ttft": _median([r.ttft for r in ok]),
+                    "tokens_per_second": _median([r.tokens_per_second for r in ok]),
+                    "latency": _median([r.total for r in ok]),
+                    "retries": sum(r.retries for r in ok),
+                    "quality": statistics.mean(r.quality for r in ok) if ok else None,
+                }
+            )
+    return rows
+
+
+def print_summary(console: Console, rows: list[dict[str, Any]]) -> None:
+    """Print the comparison table and the best model per task."""
+
+    def fmt(value: float | None, spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    table = Table(title="Model comparison (medians over successful samples)")
+    table.add_column("Model", style="cyan")
+    table.add_column("Task")
+    for column in [
+        "Samples",
+        "Errors",
+        "Load (s)",
+        "TTFT (s)",
+        "Tok/s",
+        "Latency (s)",
+        "Retries",
+        "Quality",
+    ]:
+        table.add_column(column, justify="right")
+    for row in rows:
+        table.add_row(
+            row["model"],
+            row["task"],
+            str(row["samples"]),
+            str(row["errors"]),
+            fmt(row["load_time"], ".2f"),
+            fmt(row["ttft"], ".2f"),
+            fmt(row["tokens_per_second"], ".1f"),
+            fmt(row["latency"], ".2f"),
+            str(row["retries"]),
+            fmt(row["quality"], ".0%"),
+        )
+    console.print(table)
+
+    for task in dict.fromkeys(row["task"] for row in rows):
+        scored = [r for r in rows if r["task"] == task and r["quality"] is not None]
+        if not scored:
+            continue
+        # Highest quality first, the lowest latency breaks ties.
+        best = max(scored, key=lambda r: (round(r["quality"], 2), -(r["latency"] or 0)))
+        console.print(
+            f"🏆 [bold]{task}[/bold]: [cyan]{best['model']}[/cyan] "
+            f"(quality {best['quality']:.0%}, latency {fmt(best['latency'], '.2f')}s)"
+        )
+
+
+def main() -> None:
+    """Run the benchmark and write the table and JSON results."""
+    args = parse_args()
+    console = Console()
+    corpus = json.loads(args.corpus.read_text())
+    missing = [task for task in args.tasks if not corpus.get(task)]
+    if missing:
+        console.print(
+            f"[bold red]No samples for {', '.join(missing)} in {args.corpus}[/bold red]"
+        )
+        sys.exit(1)
+
+    # Benchmark a single server through the shared backend, so the numbers
+    # aren't mixed across hosts.
+    os.environ["MY_OLLAMA_HOSTS"] = args.base_url.removesuffix("/").removesuffix("/v1")
+    llm_backend.reset_pool()
+    try:
+        load_times, results = asyncio.run(run_benchmark(args, corpus, console))
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Benchmark interrupted.[/yellow]")
+        sys.exit(130)
+
+    rows = summarize(load_times, results)
+    print_summary(console, rows)
+
+    output = args.json or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps(
+            {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "base_url": args.base_url,
+                "corpus": str(args.corpus),
+                "summary": rows,
+                "samples": [r._asdict() for r in results],
+            },
+            indent=2,
+        )
+    )
+    console.print(f"[dim]Results written to {output}[/dim]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Bounded on-disk cache for LLM results, shared by the LLM scripts.
+
+Entries are keyed on hashes of the input text, the (normalized) instruction
+or task, the model, and a prompt version, so changing any of those misses
+the cache. The store is a single SQLite file with a TTL and LRU eviction,
+and it keeps hit/miss counters so the hit rate can be reported.
+
+Used by fix_my_text_ollama.py and voice_clipboard_assistant.py.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+
+CACHE_FILE = Path.home() / ".cache" / "dotfiles-llm" / "results.sqlite"
+DEFAULT_TTL = 7 * 24 * 3600  # seconds
+DEFAULT_MAX_ENTRIES = 2000
+
+
+def text_hash(text: str) -> str:
+    """Return the SHA-256 hex digest of `text`."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def prompt_version(*prompts: str) -> str:
+    """Short hash of the prompts, so editing a prompt invalidates old results."""
+    return text_hash("\0".join(prompts))[:12]
+
+
+def normalize_instruction(instruction: str) -> str:
+    """Lowercase, collapse whitespace, and drop trailing punctuation."""
+    return re.sub(r"\s+", " ", instruction).strip().rstrip(".!?").lower()
+
+
+def cache_key(*parts: str) -> str:
+    """Combine the parts (e.g. text hash, instruction, model, prompt version) into a key."""
+    return text_hash(json.dumps(parts))
+
+
+class ResultCache:
+    """SQLite-backed key/value store with a TTL, LRU eviction, and counters."""
+
+    def __init__(
+        self,
+        path: Path = CACHE_FILE,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=5, isolation_level=None)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            """
+        )
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value (refreshing its LRU position), or None on a miss."""
+        now = time.time()
+        row = self._db.execute(
+            "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or now - row[1] > self.ttl:
+            self.bump("misses")
+            return None
+        self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        self.bump("hits")
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        """Store a value, then drop expired and least recently used entries."""
+        now = time.time()
+        with self._db:
+            self._db.execute("BEGIN")
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._db.execute(
+                "DELETE FROM entries WHERE created_at < ?", (now - self.ttl,)
+            )
+            self._db.execute(
+                """
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,),
+            )
+
+    def bump(self, name: str, n: int = 1) -> None:
+        """Increment the counter `name` by `n`."""
+        self._db.execute(
+            """
+            INSERT INTO counters VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET value = value + excluded.value
+            """,
+            (name, n),
+        )
+
+    def counters(self) -> dict[str, int]:
+        """Return all counters."""
+        return dict(self._db.execute("SELECT name, value FROM counters"))
+
+    def hit_rate(self) -> float | None:
+        """Fraction of lookups that were hits, or None if nothing was looked up yet."""
+        counters = self.counters()
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        return hits / (hits + misses) if hits + misses else None
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def summary(self) -> str:
+        """One-line description of the cache size and hit rate."""
+        counters = self.counters()
+        hits, misses = counters.get("hits", 0), counters.get("misses", 0)
+        rate = self.hit_rate()
+        rate_str = f"{rate:.0%}" if rate is not None else "n/a"
+        return (
+            f"{len(self)} cached result(s), hit rate {rate_str} "
+            f"({hits} hit(s), {misses} miss(es))"
+        )
+
+    def close(self) -> None:
+        self._db.close()
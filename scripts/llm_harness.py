@@ -0,0 +1,304 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "wyoming==1.7.1",
+#   "numpy",
+#   "pyaudio",
+#   "pydantic",
+#   "pydantic-ai-slim[openai]",
+#   "pyperclip",
+#   "rich",
+# ]
+# ///
+"""Exercise the LLM scripts' core functions offline, against mock_llm_server.py.
+
+Starts a mock server in-process and runs, under load:
+    commit       commit.generate_commit_message (sequential, like the CLI)
+    correct      fix_my_text_ollama.correct_text (the coroutine behind process_text)
+    assistant    voice_clipboard_assistant.process_with_llm
+
+Samples come from llm_benchmark_corpus.json. For every scenario it reports the
+call latency, throughput, errors, and the client-side overhead: call latency
+minus the time the server spent on the call's requests.
+
+Usage:
+    python llm_harness.py
+    python llm_harness.py --iterations 50 --concurrency 8 --latency 0.05 --tps 200
+    python llm_harness.py --failure-rate 0.2 --scenarios correct
+
+Exits with status 1 if a scenario has errors although no failures were injected.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from rich.console import Console
+from rich.table import Table
+
+from mock_llm_server import MockConfig, start_server
+
+CORPUS_FILE = Path(__file__).with_name("llm_benchmark_corpus.json")
+SCENARIOS = ["commit", "correct", "assistant"]
+MODEL = "mock-model"
+INSTRUCTION = "Make this more formal."
+USAGE_DB = Path(tempfile.gettempdir()) / "llm_harness_usage.sqlite"
+
+
+class ScenarioResult(NamedTuple):
+    """Timings of one scenario."""
+
+    scenario: str
+    calls: int
+    errors: int
+    wall_time: float
+    latencies: list[float]
+    requests: int
+    service_time: float  # seconds the server spent on successful requests
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    @property
+    def overhead(self) -> float | None:
+        """Mean client-side time per successful call that the server didn't account for."""
+        if not self.latencies:
+            return None
+        # Only successful calls have a latency, so average over those alone.
+        return statistics.mean(self.latencies) - self.service_time / len(self.latencies)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments and return the parsed namespace."""
+    parser = argparse.ArgumentParser(
+        description="Run the LLM scripts' core functions against a mock server."
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=SCENARIOS,
+        default=SCENARIOS,
+        help="The scenarios to run (default: all).",
+    )
+    parser.add_argument(
+        "--iterations",
+        "-n",
+        type=int,
+        default=20,
+        help="Calls per scenario (default: 20).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        "-j",
+        type=int,
+        default=4,
+        help="Calls in flight for the async scenarios (default: 4).",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Server latency before the first token, in seconds.",
+    )
+    parser.add_argument(
+        "--tps",
+        type=float,
+        default=0.0,
+        help="Server tokens per second (default: instant).",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests that fail with HTTP 500.",
+    )
+    parser.add_argument(
+        "--disconnect-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of streamed responses cut off halfway.",
+    )
+    parser.add_argument(
+        "--json",
+        type=Path,
+        default=None,
+        help="Also write the results as JSON to this file.",
+    )
+    return parser.parse_args()
+
+
+def use_mock_server(config: MockConfig) -> None:
+    """Point the LLM backend at a fresh mock server."""
+    import llm_backend
+
+    server = start_server(config)
+    os.environ["MY_OLLAMA_HOSTS"] = server.url
+    # Record usage as the scripts do, but not into the real usage history.
+    os.environ.setdefault("LLM_USAGE_DB", str(USAGE_DB))
+    # The pooled clients belong to one event loop; each scenario starts its own.
+    llm_backend.reset_pool()
+
+
+async def _run_concurrently(
+    calls: list[Callable[[], Awaitable[Any]]], concurrency: int
+) -> tuple[list[float], int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def timed(call: Callable[[], Awaitable[Any]]) -> None:
+        nonlocal errors
+        async with semaphore:
+            t_start = time.monotonic()
+            try:
+                await call()
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.monotonic() - t_start)
+
+    await asyncio.gather(*(timed(call) for call in calls))
+    return latencies, errors
+
+
+def run_commit(args: argparse.Namespace, corpus: dict) -> tuple[list[float], int]:
+    import commit
+
+    agent = commit.build_agent(MODEL)
+    latencies: list[float] = []
+    errors = 0
+    for i in range(args.iterations):
+        diff = corpus["commit"][i % len(corpus["commit"])]["diff"]
+        try:
+            _, elapsed = commit.generate_commit_message(agent, diff)
+        except Exception:
+            errors += 1
+        else:
+            latencies.append(elapsed)
+    return latencies, errors
+
+
+def run_correct(args: argparse.Namespace, corpus: dict) -> tuple[list[float], int]:
+    import fix_my_text_ollama
+
+    agent = fix_my_text_ollama.build_agent(MODEL)
+    samples = [sample["input"] for sample in corpus["correct"]]
+    calls = [
+        lambda text=samples[i % len(samples)]: fix_my_text_ollama.correct_text(
+            agent, text, MODEL
+        )
+        for i in range(args.iterations)
+    ]
+    return asyncio.run(_run_concurrently(calls, args.concurrency))
+
+
+def run_assistant(args: argparse.Namespace, corpus: dict) -> tuple[list[float], int]:
+    import voice_clipboard_assistant
+
+    agent = voice_clipboard_assistant.build_agent(MODEL)
+    samples = [sample["input"] for sample in corpus["correct"]]
+    calls = [
+        lambda text=samples[i % len(samples)]: (
+            voice_clipboard_assistant.process_with_llm(agent, text, INSTRUCTION)
+        )
+        for i in range(args.iterations)
+    ]
+    return asyncio.run(_run_concurrently(calls, args.concurrency))
+
+
+RUNNERS = {"commit": run_commit, "correct": run_correct, "assistant": run_assistant}
+
+
+def run_scenario(
+    name: str, args: argparse.Namespace, corpus: dict, console: Console
+) -> ScenarioResult:
+    config = MockConfig(
+        args.latency, args.tps, args.failure_rate, args.disconnect_rate, [MODEL]
+    )
+    use_mock_server(config)
+    with console.status(f"[bold yellow]🤖 Running {name}...[/bold yellow]"):
+        t_start = time.monotonic()
+        latencies, errors = RUNNERS[name](args, corpus)
+        wall_time = time.monotonic() - t_start
+    return ScenarioResult(
+        name,
+        args.iterations,
+        errors,
+        wall_time,
+        latencies,
+        config.n_requests,
+        sum(config.service_times),
+    )
+
+
+def print_results(console: Console, results: list[ScenarioResult]) -> None:
+    def ms(value: float | None) -> str:
+        return "-" if value is None else f"{value * 1000:.1f}"
+
+    table = Table(title="LLM scripts against the mock server")
+    table.add_column("Scenario", style="cyan")
+    for column in [
+        "Calls",
+        "Errors",
+        "Requests",
+        "p50 (ms)",
+        "p95 (ms)",
+        "Calls/s",
+        "Overhead (ms)",
+    ]:
+        table.add_column(column, justify="right")
+    for r in results:
+        table.add_row(
+            r.scenario,
+            str(r.calls),
+            str(r.errors),
+            str(r.requests),
+            ms(r.percentile(0.5)),
+            ms(r.percentile(0.95)),
+            f"{r.calls / r.wall_time:.1f}" if r.wall_time else "-",
+            ms(r.overhead),
+        )
+    console.print(table)
+
+
+def main() -> None:
+    args = parse_args()
+    console = Console()
+    corpus = json.loads(CORPUS_FILE.read_text())
+    results = [run_scenario(name, args, corpus, console) for name in args.scenarios]
+    print_results(console, results)
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                [
+                    {
+                        **r._asdict(),
+                        "p50": r.percentile(0.5),
+                        "p95": r.percentile(0.95),
+                        "overhead": r.overhead,
+                    }
+                    for r in results
+                ],
+                indent=2,
+            )
+        )
+    injected = args.failure_rate > 0 or args.disconnect_rate > 0
+    if not injected and any(r.errors for r in results):
+        console.print("[bold red]❌ Errors without injected failures.[/bold red]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "pydantic-ai-slim[openai]",
+#   "rich",
+# ]
+# ///
+"""Local record of every LLM request made by the scripts, with token throughput.
+
+Each model request (through llm_backend.py) is stored in a small SQLite file:
+the script, model, host, input size, prompt and completion tokens, time to
+first token (streamed requests only), total time, and tokens per second. For
+streamed requests that is the decode speed after the first token; for plain
+requests it is end to end.
+With several hosts, every failover attempt is stored under the host it went to.
+
+    llm_usage.py stats              # per-model throughput and regressions
+    llm_usage.py stats --days 90 --model gemma3:latest
+
+Set `LLM_USAGE_DB` to use another file, or to `off` to record nothing.
+
+Used by llm_backend.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.usage import Usage
+
+USAGE_DB = Path.home() / ".cache" / "dotfiles-llm" / "usage.sqlite"
+RECENT_DAYS = 7  # The window compared against the rest of the period
+REGRESSION_THRESHOLD = 0.2  # Relative change that counts as a regression
+
+
+class UsageStore:
+    """SQLite table of LLM requests."""
+
+    def __init__(self, path: Path = USAGE_DB) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False
+        )
+        self._db.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            CREATE TABLE IF NOT EXISTS requests (
+                timestamp REAL NOT NULL,
+                script TEXT NOT NULL,
+                model TEXT NOT NULL,
+                host TEXT,
+                streamed INTEGER NOT NULL,
+                input_chars INTEGER NOT NULL,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER,
+                ttft REAL,
+                total REAL NOT NULL,
+                tokens_per_second REAL,
+                ok INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS requests_timestamp ON requests (timestamp);
+            """
+        )
+
+    def record(
+        self,
+        script: str,
+        model: str,
+        host: str | None,
+        streamed: bool,
+        input_chars: int,
+        usage: Usage | None,
+        ttft: float | None,
+        total: float,
+    ) -> None:
+        """Store one request; `usage` is None if it failed."""
+        completion_tokens = usage.response_tokens if usage else None
+        generation = total - ttft if ttft is not None else total
+        tokens_per_second = (
+            completion_tokens / generation
+            if completion_tokens and generation > 0
+            else None
+        )
+        self._db.execute(
+            "INSERT INTO requests VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                time.time(),
+                script,
+                model,
+                host,
+                streamed,
+                input_chars,
+                usage.request_tokens if usage else None,
+                completion_tokens,
+                ttft,
+                total,
+                tokens_per_second,
+                usage is not None,
+            ),
+        )
+
+    def rows(self, since: float, model: str | None = None) -> list[sqlite3.Row]:
+        """Requests since the `since` timestamp, oldest first."""
+        self._db.row_factory = sqlite3.Row
+        query = "SELECT * FROM requests WHERE timestamp >= ?"
+        params: list[Any] = [since]
+        if model:
+            query += " AND model = ?"
+            params.append(model)
+        return self._db.execute(query + " ORDER BY timestamp", params).fetchall()
+
+    def close(self) -> None:
+        self._db.close()
+
+
+_store: UsageStore | None = None
+
+
+def get_store() -> UsageStore | None:
+    """The process-wide store, or None if recording is turned off."""
+    global _store
+    if _store is None:
+        setting = os.getenv("LLM_USAGE_DB")
+        if setting == "off":
+            return None
+        _store = UsageStore(Path(setting) if setting else USAGE_DB)
+    return _store
+
+
+def _input_chars(messages: list[ModelMessage]) -> int:
+    """Characters of text in the request that is being answered."""
+    if not messages or not isinstance(messages[-1], ModelRequest):
+        return 0
+    return sum(
+        len(part.content)
+        for part in messages[-1].parts
+        if isinstance(getattr(part, "content", None), str)
+    )
+
+
+class RecordingModel(WrapperModel):
+    """Model wrapper that stores the usage and timing of every request."""
+
+    def __init__(self, wrapped: Model, host: str | None = None) -> None:
+        super().__init__(wrapped)
+        self._host = host  # The host `wrapped` sends its requests to
+        self._script = Path(sys.argv[0]).stem or "python"
+
+    def _record(
+        self,
+        messages: list[ModelMessage],
+        streamed: bool,
+        usage: Usage | None,
+        ttft: float | None,
+        total: float,
+    ) -> None:
+        try:
+            store = get_store()
+            if store is None:
+                return
+            store.record(
+                self._script,
+                self.model_name,
+                self._host,
+                streamed,
+                _input_chars(messages),
+                usage,
+                ttft,
+                total,
+            )
+        except (sqlite3.Error, OSError):
+            pass  # Accounting must never break the actual request
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        t_start = time.monotonic()
+        try:
+            response = await self.wrapped.request(
+                messages, model_settings, model_request_parameters
+            )
+        except Exception:
+            self._record(messages, False, None, None, time.monotonic() - t_start)
+            raise
+        self._record(messages, False, response.usage, None, time.monotonic() - t_start)
+        return response
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        t_start = time.monotonic()
+        ttft = None
+        usage = None
+        try:
+            async with self.wrapped.request_stream(
+                messages, model_settings, model_request_parameters
+            ) as response_stream:
+                # The OpenAI model waits for the first chunk before it returns the stream.
+                ttft = time.monotonic() - t_start
+                yield response_stream
+                usage = response_stream.usage()
+        finally:
+            self._record(messages, True, usage, ttft, time.monotonic() - t_start)
+
+
+# --- Stats ---
+
+
+def _median(values: list[float | None]) -> float | None:
+    present = [v for v in values if v is not None]
+    return statistics.median(present) if present else None
+
+
+def _change(recent: float | None, before: float | None) -> float | None:
+    if recent is None or not before:
+        return None
+    return recent / before - 1
+
+
+def print_stats(store: UsageStore, days: int, model: str | None) -> None:
+    """Per-model throughput, the recent window against the rest of the period, and weekly trends."""
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    now = time.time()
+    rows = store.rows(now - days * 86400, model)
+    if not rows:
+        console.print(
+            f"[yellow]No LLM requests recorded in the last {days} days.[/yellow]"
+        )
+        return
+
+    by_model: dict[str, list[sqlite3.Row]] = defaultdict(list)
+    for row in rows:
+        by_model[row["model"]].append(row)
+
+    recent_since = now - RECENT_DAYS * 86400
+    table = Table(
+        title=f"LLM usage, last {days} days (last {RECENT_DAYS} days vs. before)"
+    )
+    table.add_column("Model", style="cyan")
+    for column in [
+        "Requests",
+        "Errors",
+        "Prompt tok",
+        "Compl. tok",
+        "TTFT p50 (s)",
+        "Tok/s p50",
+        "Tok/s before",
+        "Change",
+        "Weekly tok/s",
+    ]:
+        table.add_column(column, justify="right")
+
+    def fmt(value: float | None, spec: str) -> str:
+        return "-" if value is None else format(value, spec)
+
+    for name, model_rows in sorted(by_model.items()):
+        ok = [r for r in model_rows if r["ok"]]
+        recent = [r for r in ok if r["timestamp"] >= recent_since]
+        before = [r for r in ok if r["timestamp"] < recent_since]
+        tps_recent = _median([r["tokens_per_second"] for r in recent])
+        tps_before = _median([r["tokens_per_second"] for r in before])
+        ttft_recent = _median([r["ttft"] for r in recent])
+        ttft_before = _median([r["ttft"] for r in before])
+        tps_change = _change(tps_recent, tps_before)
+        ttft_change = _change(ttft_recent, ttft_before)
+        regressed = (tps_change is not None and tps_change < -REGRESSION_THRESHOLD) or (
+            ttft_change is not None and ttft_change > REGRESSION_THRESHOLD
+        )
+        change = fmt(tps_change, "+.0%")
+        if regressed:
+            change = f"[bold red]{change} ⚠[/bold red]"
+
+        weeks: dict[int, list[float | None]] = defaultdict(list)
+        for r in ok:
+            weeks[int((now - r["timestamp"]) // (7 * 86400))].append(
+                r["tokens_per_second"]
+            )
+        trend = " → ".join(
+            fmt(_median(weeks[week]), ".0f") for week in sorted(weeks, reverse=True)
+        )
+
+        table.add_row(
+            name,
+            str(len(model_rows)),
+            str(len(model_rows) - len(ok)),
+            str(sum(r["prompt_tokens"] or 0 for r in ok)),
+            str(sum(r["completion_tokens"] or 0 for r in ok)),
+            fmt(ttft_recent, ".2f"),
+            fmt(tps_recent, ".1f"),
+            fmt(tps_before, ".1f"),
+            change,
+            trend,
+        )
+    console.print(table)
+
+    by_script: dict[str, int] = defaultdict(int)
+    by_host: dict[str, int] = defaultdict(int)
+    for row in rows:
+        by_script[row["script"]] += 1
+        by_host[row["host"] or "?"] += 1
+    console.print(
+        "[dim]By script: "
+        + ", ".join(f"{k} {v}" for k, v in sorted(by_script.items()))
+        + "\nBy host: "
+        + ", ".join(f"{k} {v}" for k, v in sorted(by_host.items()))
+        + "[/dim]"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show recorded LLM usage.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats = subparsers.add_parser(
+        "stats", help="Per-model throughput trends and regressions."
+    )
+    stats.add_argument(
+        "--days", type=int, default=30, help="How far back to look (default: 30)."
+    )
+    stats.add_argument("--model", "-m", help="Only show this model.")
+    args = parser.parse_args()
+
+    store = get_store()
+    if store is None:
+        sys.exit("Usage recording is turned off (LLM_USAGE_DB=off).")
+    if args.command == "stats":
+        print_stats(store, args.days, args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""Local stand-in for an Ollama / OpenAI-compatible server, for offline testing.
+
+Serves `/v1/chat/completions` (plain and streamed), `/v1/models`, and Ollama's
+`/api/ps` and `/api/generate`. Text requests are answered by echoing the last
+user message; requests with tools are answered with a call to the first tool,
+with arguments generated from its JSON schema (so structured outputs validate).
+
+Latency, decode speed, and failures can be injected to see how the scripts
+behave against a slow or flaky host.
+
+Usage:
+    python mock_llm_server.py --port 11435 --latency 0.2 --tps 50 --failure-rate 0.1
+    MY_OLLAMA_HOST=http://localhost:11435 python fix_my_text_ollama.py
+
+Used by llm_harness.py.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+DEFAULT_PORT = 11435
+TOKEN = re.compile(r"\S+\s*|\s+")
+
+
+class MockConfig:
+    """Behavior of the mock server; can be changed while it runs."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tokens_per_second: float = 0.0,
+        failure_rate: float = 0.0,
+        disconnect_rate: float = 0.0,
+        models: list[str] | None = None,
+    ) -> None:
+        self.latency = latency  # seconds before the first token
+        self.tokens_per_second = tokens_per_second  # 0 means instant
+        self.failure_rate = failure_rate  # fraction of requests answered with a 500
+        self.disconnect_rate = disconnect_rate  # fraction of streams cut off halfway
+        self.models = models or []  # reported as loaded by /api/ps
+        self.n_requests = 0
+        self.n_failures = 0
+        self.service_times: list[float] = []  # seconds per completed request
+        self._lock = threading.Lock()
+
+    def record(self, failed: bool, service_time: float) -> None:
+        with self._lock:
+            self.n_requests += 1
+            self.n_failures += failed
+            if not failed:
+                self.service_times.append(service_time)
+
+
+def sample_value(schema: dict[str, Any], defs: dict[str, Any]) -> Any:
+    """A minimal value that validates against `schema`."""
+    if "$ref" in schema:
+        return sample_value(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "default" in schema:
+        return schema["default"]
+    options = schema.get("anyOf") or schema.get("oneOf")
+    if options:
+        typed = [o for o in options if o.get("type") != "null"] or options
+        return sample_value(typed[0], defs)
+    kind = schema.get("type", "string")
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {
+            name: sample_value(properties[name], defs)
+            for name in schema.get("required", properties)
+        }
+    return {
+        "string": "mock",
+        "integer": 0,
+        "number": 0.0,
+        "boolean": True,
+        "array": [],
+        "null": None,
+    }.get(kind, "mock")
+
+
+def _text_of(message: dict[str, Any]) -> str:
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        return "".join(part.get("text", "") for part in content)
+    return content
+
+
+def build_reply(request: dict[str, Any]) -> tuple[str | None, dict[str, Any] | None]:
+    """Return the reply text, or a tool call, for a chat completion request."""
+    tools = request.get("tools") or []
+    if tools:
+        function = tools[0]["function"]
+        parameters = function.get("parameters", {})
+        arguments = sample_value(parameters, parameters.get("$defs", {}))
+        return None, {"name": function["name"], "arguments": json.dumps(arguments)}
+    user_messages = [m for m in request.get("messages", []) if m.get("role") == "user"]
+    return (_text_of(user_messages[-1]) if user_messages else ""), None
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Request handler; the server's `config` controls its behavior."""
+
+    # Keep-alive, so client connection pooling is exercised.
+    protocol_version = "HTTP/1.1"
+    server: "MockServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Quiet; this runs under load
+
+    def _send_json(self, data: Any, status: int = 200) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self) -> None:
+        config = self.server.config
+        if self.path == "/api/ps":
+            models = [{"name": m, "model": m} for m in config.models]
+            self._send_json({"models": models})
+        elif self.path == "/v1/models":
+            models = [
+                {"id": m, "object": "model", "owned_by": "mock"} for m in config.models
+            ]
+            self._send_json({"object": "list", "data": models})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self) -> None:
+        request = self._read_json()
+        if self.path == "/api/generate":
+            time.sleep(self.server.config.latency)
+            self._send_json(
+                {"model": request.get("model"), "response": "", "done": True}
+            )
+        elif self.path == "/v1/chat/completions":
+            self._chat_completion(request)
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def _chat_completion(self, request: dict[str, Any]) -> None:
+        config = self.server.config
+        t_start = time.monotonic()
+        failed = random.random() < config.failure_rate
+        time.sleep(config.latency)
+        if failed:
+            config.record(True, 0.0)
+            self._send_json({"error": {"message": "injected failure"}}, 500)
+            return
+
+        text, tool_call = build_reply(request)
+        reply = text if text is not None else tool_call["arguments"]
+        tokens = TOKEN.findall(reply) or [""]
+        prompt_tokens = sum(
+            len(TOKEN.findall(_text_of(m))) for m in request.get("messages", [])
+        )
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "created": int(time.time()),
+            "model": request.get("model", "mock"),
+        }
+        finish_reason = "tool_calls" if tool_call else "stop"
+
+        if not request.get("stream"):
+            time.sleep(
+                len(tokens) / config.tokens_per_second
+                if config.tokens_per_second
+                else 0
+            )
+            message: dict[str, Any] = {"role": "assistant", "content": text}
+            if tool_call:
+                message["tool_calls"] = [
+                    {"id": "call_0", "type": "function", "function": tool_call}
+                ]
+            choice = {"index": 0, "message": message, "finish_reason": finish_reason}
+            self._send_json(
+                {
+                    **base,
+                    "object": "chat.completion",
+                    "choices": [choice],
+                    "usage": usage,
+                }
+            )
+            config.record(False, time.monotonic() - t_start)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send_event(data: str) -> None:
+            payload = f"data: {data}\n\n".encode()
+            self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+            self.wfile.flush()
+
+        def send_chunk(
+            delta: dict[str, Any], finish: str | None = None, **extra: Any
+        ) -> None:
+            choice = {"index": 0, "delta": delta, "finish_reason": finish}
+            send_event(
+                json.dumps(
+                    {
+                        **base,
+                        "object": "chat.completion.chunk",
+                        "choices": [choice],
+                        **extra,
+                    }
+                )
+            )
+
+        disconnect_at = (
+            len(tokens) // 2 if random.random() < config.disconnect_rate else None
+        )
+        for i, token in enumerate(tokens):
+            if i == disconnect_at:
+                config.record(True, 0.0)
+                self.close_connection = True
+                return  # Cut off without the terminating chunk
+            if tool_call:
+                function = {"arguments": token}
+                if i == 0:
+                    function["name"] = tool_call["name"]
+                delta = {
+                    "tool_calls": [
+                        {
+                            "index": 0,
+                            "id": "call_0",
+                            "type": "function",
+                            "function": function,
+                        }
+                    ]
+                }
+            else:
+                delta = {"content": token}
+            if i == 0:
+                delta["role"] = "assistant"
+            send_chunk(delta)
+            if config.tokens_per_second:
+                time.sleep(1 / config.tokens_per_second)
+        send_chunk({}, finish_reason)
+        if request.get("stream_options", {}).get("include_usage"):
+            send_event(
+                json.dumps(
+                    {
+                        **base,
+                        "object": "chat.completion.chunk",
+                        "choices": [],
+                        "usage": usage,
+                    }
+                )
+            )
+        send_event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+        config.record(False, time.monotonic() - t_start)
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: MockConfig) -> None:
+        super().__init__(address, MockHandler)
+        self.config = config
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_server(
+    config: MockConfig, host: str = "127.0.0.1", port: int = 0
+) -> MockServer:
+    """Start the server in a background thread; port 0 picks a free port."""
+    server = MockServer((host, port), config)
+    threading.Thread(target=server.serve_forever, name="mock-llm", daemon=True).start()
+    return server
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments and return the parsed namespace."""
+    parser = argparse.ArgumentParser(
+        description="Run a mock OpenAI-compatible server for offline testing."
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind to.")
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port (default: {DEFAULT_PORT}).",
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds before the first token."
+    )
+    parser.add_argument(
+        "--tps", type=float, default=0.0, help="Tokens per second (default: instant)."
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of requests that fail with HTTP 500.",
+    )
+    parser.add_argument(
+        "--disconnect-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of streamed responses cut off halfway.",
+    )
+    parser.add_argument(
+        "--models",
+        nargs="*",
+        default=[],
+        help="Models to report as loaded in /api/ps.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    config = MockConfig(
+        args.latency, args.tps, args.failure_rate, args.disconnect_rate, args.models
+    )
+    server = MockServer((args.host, args.port), config)
+    print(f"Mock LLM server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {config.n_requests} request(s), {config.n_failures} failure(s)")
+
+
+if __name__ == "__main__":
+    main()
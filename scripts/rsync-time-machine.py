@@ -0,0 +1,328 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "rich",
+# ]
+# ///
+"""Back up the source trees with rsync-time-machine, several at a time.
+
+The trees are independent, so they run concurrently, limited by `--jobs`:
+one or two for a spinning disk, more for an SSD. rsync is asked for
+`--info=progress2` and `--stats`, which gives a per-tree progress and, at the
+end, the bytes and files transferred per second for each tree. A summary of
+the run is written as JSON.
+
+rsync-time-machine only passes rsync's output on with `--verbose`, one line at
+a time behind its own prefix, so in snapshot mode the progress moves per line
+rather than live. Its rsync flags are set explicitly because its defaults
+include `--human-readable`, whose "1.23G" sizes can't be summed.
+
+Needs rsync 3.1 or newer (the one from Homebrew on macOS) for `--info`.
+
+Usage:
+    rsync-time-machine.py
+    rsync-time-machine.py --trees dotfiles Code -j 1
+    rsync-time-machine.py --dest-root /tmp/backups --plain-rsync --source-root /tmp/src
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from rich.console import Console
+from rich.live import Live
+from rich.table import Table
+
+TREES = ["dotfiles", "Code", "Sync", "Lightroom"]
+SOURCE_ROOT = Path.home()
+DEST_ROOT = Path("/Volumes/4TB")
+SUMMARY_DIR = Path.home() / ".cache" / "dotfiles" / "backups"
+RSYNC_FLAGS = "--info=progress2 --stats --no-inc-recursive"
+# rsync-time-machine's default flags without --human-readable (and --stats,
+# which is in RSYNC_FLAGS).
+TIME_MACHINE_FLAGS = (
+    "-D --numeric-ids --links --hard-links --one-file-system --itemize-changes"
+    " --times --recursive --perms --owner --group"
+)
+# What rsync-time-machine --verbose puts before each line of rsync's output
+TIME_MACHINE_PREFIX = re.compile(r"^rsync-time-machine(?:\.py)?: Command output: ")
+ANSI_CODE = re.compile(r"\x1b\[[0-9;]*m")
+
+# "  1,234,567  45%   12.34MB/s    0:00:10 (xfr#12, to-chk=88/100)"
+PROGRESS = re.compile(r"^\s*([\d,.]+[KMGT]?)\s+(\d+)%\s+(\S+/s)")
+# Exact counts only: a human-readable "1.23G" must not be read as 123.
+_COUNT = r"([\d,.]+)(?![\w,.])"
+STATS = {
+    "files": re.compile(rf"^Number of files: {_COUNT}"),
+    "files_transferred": re.compile(
+        rf"^Number of (?:regular )?files transferred: {_COUNT}"
+    ),
+    "total_size": re.compile(rf"^Total file size: {_COUNT}"),
+    "bytes_transferred": re.compile(rf"^Total transferred file size: {_COUNT}"),
+    "bytes_sent": re.compile(rf"^Total bytes sent: {_COUNT}"),
+}
+
+
+@dataclass
+class TreeResult:
+    """Progress and statistics of the backup of one tree."""
+
+    name: str
+    source: str
+    dest: str
+    status: str = "⏳ waiting"
+    percent: int = 0
+    rate: str = ""  # rsync's current transfer rate
+    returncode: int | None = None
+    elapsed: float = 0.0
+    stats: dict[str, int] = field(default_factory=dict)
+    tail: list[str] = field(default_factory=list)  # last lines, for failures
+
+    def per_second(self, key: str) -> float | None:
+        if key not in self.stats or not self.elapsed:
+            return None
+        return self.stats[key] / self.elapsed
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments and return the parsed namespace."""
+    parser = argparse.ArgumentParser(
+        description="Back up the source trees with rsync-time-machine, in parallel."
+    )
+    parser.add_argument(
+        "--trees",
+        nargs="+",
+        default=TREES,
+        help=f"Directories under the source root to back up (default: {' '.join(TREES)}).",
+    )
+    parser.add_argument(
+        "--source-root",
+        type=Path,
+        default=SOURCE_ROOT,
+        help="Where the trees are (default: ~).",
+    )
+    parser.add_argument(
+        "--dest-root",
+        type=Path,
+        default=DEST_ROOT,
+        help=f"Where the backups go (default: {DEST_ROOT}).",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=2,
+        help="Trees backed up at the same time; 1-2 for HDDs, more for SSDs (default: 2).",
+    )
+    parser.add_argument(
+        "--plain-rsync",
+        action="store_true",
+        help="Mirror with plain `rsync -a` instead of rsync-time-machine snapshots.",
+    )
+    parser.add_argument(
+        "--summary",
+        type=Path,
+        default=None,
+        help=f"Where to write the JSON summary (default: {SUMMARY_DIR}/<time>.json).",
+    )
+    return parser.parse_args()
+
+
+def backup_command(source: Path, dest: Path, plain: bool) -> list[str]:
+    if plain:
+        return [
+            "rsync",
+            "-a",
+            "--delete",
+            *RSYNC_FLAGS.split(),
+            f"{source}/",
+            str(dest),
+        ]
+    return [
+        "rsync-time-machine",
+        "--verbose",  # Without it, rsync's output is swallowed
+        f"--rsync-set-flags={TIME_MACHINE_FLAGS} {RSYNC_FLAGS}",
+        str(source),
+        str(dest),
+    ]
+
+
+def parse_line(result: TreeResult, line: str) -> None:
+    """Update the progress or statistics of a tree from one line of output.
+
+    Takes plain rsync output as well as rsync-time-machine's `--verbose` echo of it.
+    """
+    line = TIME_MACHINE_PREFIX.sub("", ANSI_CODE.sub("", line))
+    match = PROGRESS.match(line)
+    if match:
+        result.percent = int(match[2])
+        result.rate = match[3]
+        return
+    for key, pattern in STATS.items():
+        match = pattern.match(line.strip())
+        if match:
+            result.stats[key] = int(re.sub(r"[,.]", "", match[1]))
+            return
+    result.tail = [*result.tail[-19:], line]
+
+
+async def back_up(
+    result: TreeResult, args: argparse.Namespace, semaphore: asyncio.Semaphore
+) -> None:
+    """Run the backup of one tree, following its progress."""
+    async with semaphore:
+        result.status = "🔄 running"
+        t_start = time.monotonic()
+        try:
+            if args.plain_rsync:
+                # rsync-time-machine needs an existing destination with its
+                # backup marker, so only plain rsync gets one created.
+                Path(result.dest).mkdir(parents=True, exist_ok=True)
+            process = await asyncio.create_subprocess_exec(
+                *backup_command(
+                    Path(result.source), Path(result.dest), args.plain_rsync
+                ),
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+            )
+        except OSError as e:
+            result.status = f"❌ {e}"
+            return
+        assert process.stdout is not None
+        buffer = ""
+        # progress2 rewrites its line with \r, so split on both line endings.
+        while chunk := await process.stdout.read(65536):
+            buffer += chunk.decode(errors="replace")
+            *lines, buffer = re.split(r"[\r\n]", buffer)
+            for line in lines:
+                if line.strip():
+                    parse_line(result, line)
+        if buffer.strip():
+            parse_line(result, buffer)
+        result.returncode = await process.wait()
+        result.elapsed = time.monotonic() - t_start
+        if result.returncode == 0:
+            result.status = "✅ done"
+            result.percent = 100
+        else:
+            result.status = f"❌ exit status {result.returncode}"
+
+
+def _size(value: float | None, unit: str = "B") -> str:
+    if value is None:
+        return "-"
+    for prefix in ["", "K", "M", "G"]:
+        if value < 1024 or prefix == "G":
+            return f"{value:.1f} {prefix}{unit}"
+        value /= 1024
+    return "-"
+
+
+def progress_table(results: list[TreeResult]) -> Table:
+    table = Table(title="💾 Backing up")
+    table.add_column("Tree", style="cyan")
+    table.add_column("Status")
+    table.add_column("Progress", justify="right")
+    table.add_column("Rate", justify="right")
+    for r in results:
+        table.add_row(r.name, r.status, f"{r.percent}%", r.rate)
+    return table
+
+
+def summary_table(results: list[TreeResult]) -> Table:
+    table = Table(title="📊 Backup summary")
+    table.add_column("Tree", style="cyan")
+    for column in [
+        "Time (s)",
+        "Files",
+        "Transferred",
+        "Size",
+        "Changed",
+        "Bytes/s",
+        "Files/s",
+    ]:
+        table.add_column(column, justify="right")
+    for r in results:
+        table.add_row(
+            r.name,
+            f"{r.elapsed:.1f}",
+            str(r.stats.get("files", "-")),
+            str(r.stats.get("files_transferred", "-")),
+            _size(r.stats.get("total_size")),
+            _size(r.stats.get("bytes_transferred")),
+            _size(r.per_second("bytes_transferred"), "B/s"),
+            "-"
+            if r.per_second("files_transferred") is None
+            else f"{r.per_second('files_transferred'):.1f}",
+        )
+    return table
+
+
+async def back_up_all(args: argparse.Namespace, console: Console) -> list[TreeResult]:
+    results = [
+        TreeResult(
+            name,
+            str(args.source_root.expanduser() / name),
+            str(args.dest_root.expanduser() / name),
+        )
+        for name in args.trees
+    ]
+    semaphore = asyncio.Semaphore(max(args.jobs, 1))
+    tasks = [asyncio.create_task(back_up(r, args, semaphore)) for r in results]
+    with Live(progress_table(results), console=console, refresh_per_second=4) as live:
+        while not all(task.done() for task in tasks):
+            await asyncio.wait(tasks, timeout=0.25)
+            live.update(progress_table(results))
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    console = Console()
+    t_start = time.monotonic()
+    results = asyncio.run(back_up_all(args, console))
+    wall_time = time.monotonic() - t_start
+
+    for r in results:
+        if r.returncode != 0 and r.tail:
+            console.rule(f"[red]{r.name}")
+            console.print("\n".join(r.tail), markup=False, highlight=False)
+    console.print(summary_table(results))
+    serial = sum(r.elapsed for r in results)
+    console.print(
+        f"Wall time {wall_time:.1f}s, {serial:.1f}s if the trees ran one at a time"
+    )
+
+    summary = args.summary or SUMMARY_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    summary.parent.mkdir(parents=True, exist_ok=True)
+    summary.write_text(
+        json.dumps(
+            {
+                "started": time.time() - wall_time,
+                "wall_time": wall_time,
+                "jobs": args.jobs,
+                "trees": [
+                    {
+                        **{k: v for k, v in asdict(r).items() if k != "tail"},
+                        "bytes_per_second": r.per_second("bytes_transferred"),
+                        "files_per_second": r.per_second("files_transferred"),
+                    }
+                    for r in results
+                ],
+            },
+            indent=2,
+        )
+    )
+    console.print(f"[dim]Summary written to {summary}[/dim]")
+    if any(r.returncode != 0 for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""Profile shell startup and build a single precompiled init file.
+
+`profile` sources configs/shell/main.sh (or `--file`) with xtrace and a
+timestamp in PS4, then ranks where the time goes:
+- per fragment: everything a line of main.sh runs, including what it sources,
+- per file: the time spent on that file's own lines,
+- per command: the slowest lines, summed over how often they ran.
+A command's time is the gap until the next traced line, so it includes the
+external programs it starts (`pgrep`, `brew shellenv`, ...). The total,
+measured without xtrace, is appended to a history file to track it over time.
+
+`bundle` concatenates the fragments that main.sh sources into one file per
+shell (init.bash and init.zsh, the latter `zcompile`d), keeping main.sh's
+other conditions around them. They are rebuilt only when main.sh or a
+fragment changed. main.sh sources the bundle instead of the fragments when
+DOTFILES_SHELL_BUNDLE is set and the bundle is newer than every fragment.
+
+Only needs Python 3.9+.
+
+Usage:
+    python3 scripts/shell-profile.py profile [--shell bash] [--top 20]
+    python3 scripts/shell-profile.py profile --file ~/.cache/dotfiles/shell/init.zsh
+    python3 scripts/shell-profile.py bundle [--force]
+    python3 scripts/shell-profile.py history
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+SHELL_DIR = Path(__file__).resolve().parent.parent / "configs" / "shell"
+MAIN = SHELL_DIR / "main.sh"
+CACHE_DIR = Path.home() / ".cache" / "dotfiles" / "shell"
+HISTORY = CACHE_DIR / "startup-history.jsonl"
+
+PS4 = {
+    "bash": "+${EPOCHREALTIME} ${BASH_SOURCE[0]:-}:${LINENO}> ",
+    "zsh": "+%D{%s.%6.} %x:%I> ",
+}
+# Conditions in main.sh that a per-shell bundle resolves when it is built.
+SHELL_CHECKS = {"bash": '[ -n "$BASH_VERSION" ]', "zsh": '[ -n "$ZSH_VERSION" ]'}
+TRACE_LINE = re.compile(r"^\++(\d+[.,]\d+) (.*?):(\d+)> (.*)$")
+# `[ -n "$ZSH_VERSION" ] && source ~/dotfiles/configs/shell/05_zsh_completions.sh`
+SOURCE_LINE = re.compile(r"^(?:(?P<condition>.+?)\s*&&\s*)?source\s+(?P<path>\S+)")
+
+
+class TraceLine(NamedTuple):
+    """One command of the xtrace output, with the time until the next one."""
+
+    timestamp: float
+    file: str
+    line: int
+    command: str
+    elapsed: float
+
+
+def _command(shell: str, file: Path, trace: bool) -> list[str]:
+    script = f"source {_quote(str(file))}"
+    if trace:
+        script = f"PS4={_quote(PS4[shell])}; set -x; {script}; set +x"
+    # Skip the rc files, so the profiled file is the only thing that is sourced.
+    # bash is not interactive, or 00_prefer_zsh.sh would replace it with zsh.
+    flags = ["-f", "-i"] if shell == "zsh" else ["--norc", "--noprofile"]
+    return [shell, *flags, "-c", script]
+
+
+def _quote(text: str) -> str:
+    return "'" + text.replace("'", "'\\''") + "'"
+
+
+def _environment() -> dict[str, str]:
+    # Profile the fragments themselves, not the bundle that main.sh may source.
+    return {**os.environ, "DOTFILES_SHELL_BUNDLE": ""}
+
+
+def run_trace(shell: str, file: Path) -> list[TraceLine]:
+    """Source `file` with xtrace and return the timed commands."""
+    result = subprocess.run(
+        _command(shell, file, trace=True),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=_environment(),
+        check=False,
+    )
+    parsed = []
+    for raw in result.stderr.decode(errors="replace").splitlines():
+        match = TRACE_LINE.match(raw)
+        if match:  # Other lines are the commands' own output on stderr
+            timestamp, file_name, line, command = match.groups()
+            parsed.append(
+                (float(timestamp.replace(",", ".")), file_name, int(line), command)
+            )
+    return [
+        TraceLine(
+            t, f, line, command, (parsed[i + 1][0] if i + 1 < len(parsed) else t) - t
+        )
+        for i, (t, f, line, command) in enumerate(parsed)
+    ]
+
+
+def measure_startup(shell: str, file: Path, repeat: int) -> float:
+    """Median seconds to source `file` without xtrace."""
+    times = []
+    for _ in range(repeat):
+        t_start = time.perf_counter()
+        subprocess.run(
+            _command(shell, file, trace=False),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=_environment(),
+            check=False,
+        )
+        times.append(time.perf_counter() - t_start)
+    return statistics.median(times)
+
+
+def fragment_times(trace: list[TraceLine], file: Path) -> dict[str, float]:
+    """Inclusive time of every line of `file`: until its next line, or the end."""
+    top = [t for t in trace if os.path.basename(t.file) == file.name]
+    end = trace[-1].timestamp + trace[-1].elapsed if trace else 0.0
+    times: dict[str, float] = {}
+    for i, t in enumerate(top):
+        next_timestamp = top[i + 1].timestamp if i + 1 < len(top) else end
+        match = SOURCE_LINE.match(t.command)
+        name = os.path.basename(match["path"]) if match else t.command
+        times[name] = times.get(name, 0.0) + next_timestamp - t.timestamp
+    return times
+
+
+def _print_table(title: str, rows: list[tuple[str, float]], total: float) -> None:
+    print(f"\n{title}")
+    for name, seconds in rows:
+        share = seconds / total if total else 0
+        print(f"  {seconds * 1000:8.1f} ms  {share:5.1%}  {name}")
+
+
+def profile(args: argparse.Namespace) -> None:
+    file = args.file.expanduser()
+    trace = run_trace(args.shell, file)
+    if not trace:
+        sys.exit(f"❌ No xtrace output from {args.shell}; is it installed?")
+    traced_total = trace[-1].timestamp - trace[0].timestamp
+
+    fragments = fragment_times(trace, file)
+    by_file: dict[str, float] = defaultdict(float)
+    by_command: dict[tuple[str, int], list] = {}
+    for t in trace:
+        by_file[t.file or "-c"] += t.elapsed
+        entry = by_command.setdefault((t.file, t.line), [0.0, 0, t.command])
+        entry[0] += t.elapsed
+        entry[1] += 1
+
+    def top(items: dict[str, float]) -> list[tuple[str, float]]:
+        return sorted(items.items(), key=lambda item: -item[1])[: args.top]
+
+    home = str(Path.home())
+    _print_table(f"📄 Fragments of {file.name}", top(fragments), traced_total)
+    _print_table(
+        "📁 Files (own lines)",
+        [(f.replace(home, "~"), s) for f, s in top(by_file)],
+        traced_total,
+    )
+    commands = sorted(by_command.items(), key=lambda item: -item[1][0])[: args.top]
+    _print_table(
+        "🔥 Commands",
+        [
+            (
+                f"{os.path.basename(f)}:{line} {command[:60]}"
+                + (f" (×{count})" if count > 1 else ""),
+                seconds,
+            )
+            for (f, line), (seconds, count, command) in commands
+        ],
+        traced_total,
+    )
+
+    total = measure_startup(args.shell, file, args.repeat)
+    print(
+        f"\n⏱️ {args.shell} sources {file.name} in {total * 1000:.1f} ms"
+        f" (median of {args.repeat}, {traced_total * 1000:.1f} ms with xtrace)"
+    )
+    previous = [
+        r for r in read_history() if r["shell"] == args.shell and r["file"] == str(file)
+    ]
+    if previous:
+        change = total / previous[-1]["total"] - 1
+        print(f"   {change:+.0%} since {time.ctime(previous[-1]['timestamp'])}")
+    append_history(
+        {
+            "timestamp": time.time(),
+            "host": socket.gethostname(),
+            "shell": args.shell,
+            "file": str(file),
+            "total": total,
+            "fragments": fragments,
+        }
+    )
+
+
+def read_history() -> list[dict]:
+    try:
+        with open(HISTORY) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except (OSError, ValueError):
+        return []
+
+
+def append_history(record: dict) -> None:
+    HISTORY.parent.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def print_history() -> None:
+    records = read_history()
+    if not records:
+        print("No profiles recorded yet, run `profile` first.")
+        return
+    for r in records:
+        print(
+            f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(r['timestamp']))}"
+            f"  {r['host']:<16} {r['shell']:<5} {r['total'] * 1000:7.1f} ms"
+            f"  {os.path.basename(r['file'])}"
+        )
+
+
+# --- Bundle ---
+
+
+def bundle_inputs() -> list[tuple[str | None, Path]]:
+    """The (condition, fragment) pairs that main.sh sources, in order."""
+    inputs = []
+    for line in MAIN.read_text().splitlines():
+        match = SOURCE_LINE.match(line)  # Unindented: not the bundle's own `source`
+        if match:
+            inputs.append(
+                (match["condition"], SHELL_DIR / os.path.basename(match["path"]))
+            )
+    return inputs
+
+
+def bundle_path(shell: str) -> Path:
+    return CACHE_DIR / f"init.{shell}"
+
+
+def _zcompile(path: Path) -> None:
+    if shutil.which("zsh"):
+        subprocess.run(["zsh", "-c", f"zcompile {_quote(str(path))}"], check=False)
+
+
+def build_bundle(force: bool = False) -> list[Path]:
+    """Write the bundles that are out of date (and compile the zsh one); return them."""
+    inputs = bundle_inputs()
+    digest = hashlib.sha256(MAIN.read_bytes())
+    for _, fragment in inputs:
+        digest.update(fragment.read_bytes())
+    stamp = f"# inputs: {digest.hexdigest()}"
+    written = []
+    for shell, shell_check in SHELL_CHECKS.items():
+        path = bundle_path(shell)
+        if not force and path.exists():
+            with open(path) as f:
+                current = stamp in (
+                    f.readline().rstrip("\n"),
+                    f.readline().rstrip("\n"),
+                )
+            if current:
+                # main.sh compares mtimes, so a touched but unchanged fragment
+                # would otherwise keep it from using the bundle.
+                path.touch()
+                if shell == "zsh":
+                    # zsh only loads a .zwc that is newer than its source.
+                    _zcompile(path)
+                continue
+
+        parts = [
+            "# Generated by scripts/shell-profile.py bundle from configs/shell, do not edit.",
+            stamp,
+        ]
+        for condition, fragment in inputs:
+            if condition in SHELL_CHECKS.values() and condition != shell_check:
+                # Leave out the other shell's fragments: it may not even parse them.
+                continue
+            body = fragment.read_text().rstrip("\n")
+            parts.append(f"\n# --- {fragment.name} ---")
+            if condition and condition != shell_check:
+                body = f"if {condition}; then\n{body}\nfi"
+            parts.append(body)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("\n".join(parts) + "\n")
+        tmp.replace(path)
+        if shell == "zsh":
+            _zcompile(path)
+        written.append(path)
+    return written
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments and return the parsed namespace."""
+    parser = argparse.ArgumentParser(
+        description="Profile shell startup and build a precompiled init file."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    profile_parser = subparsers.add_parser(
+        "profile", help="Rank the fragments and commands by startup time."
+    )
+    profile_parser.add_argument(
+        "--shell",
+        choices=sorted(PS4),
+        default="zsh" if shutil.which("zsh") else "bash",
+        help="The shell to profile (default: zsh if installed).",
+    )
+    profile_parser.add_argument(
+        "--file",
+        type=Path,
+        default=MAIN,
+        help="The file to source (default: configs/shell/main.sh).",
+    )
+    profile_parser.add_argument(
+        "--top", type=int, default=15, help="Rows per table (default: 15)."
+    )
+    profile_parser.add_argument(
+        "--repeat",
+        "-r",
+        type=int,
+        default=5,
+        help="Startups to time without xtrace (default: 5).",
+    )
+    bundle_parser = subparsers.add_parser(
+        "bundle", help="Build the single init file if a fragment changed."
+    )
+    bundle_parser.add_argument(
+        "--force", action="store_true", help="Rebuild even if nothing changed."
+    )
+    subparsers.add_parser("history", help="Show the recorded startup times.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.command == "profile":
+        profile(args)
+    elif args.command == "bundle":
+        written = build_bundle(args.force)
+        for path in written:
+            print(f"✅ Wrote {path}")
+        if not written:
+            print(f"✅ The bundles in {CACHE_DIR} are up to date")
+    else:
+        print_history()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# dependencies = [
+#   "rich",
+# ]
+# ///
+"""Sync the dotfiles on all remote machines in parallel.
+
+Every host gets `sync-local-dotfiles` copied over and run, as before, but the
+hosts are processed concurrently and one SSH connection per host is shared by
+the copy and the run (ControlMaster). A host that hangs is killed after its
+timeout instead of holding up the rest.
+
+Usage:
+    sync-dotfiles                    # pull and update submodules on every host
+    sync-dotfiles install            # also run ./install
+    sync-dotfiles --hosts pi3 pc -j 2 --timeout 120
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from rich.console import Console
+from rich.live import Live
+from rich.table import Table
+
+HOSTS = [
+    "ubuntu-proxmox",
+    "ubuntu-hetzner",
+    "debian-truenas",
+    "debian-proxmox",
+    "docker-truenas",
+    "docker-proxmox",
+    "pi3",
+    "dietpi",
+    "pc",
+]
+SYNC_SCRIPT = Path.home() / ".local" / "bin" / "sync-local-dotfiles"
+CONTROL_DIR = Path.home() / ".ssh" / "sockets"
+LOG_TAIL = 20  # Lines of output shown for a failed host
+
+
+@dataclass
+class HostResult:
+    """Progress and outcome of one host."""
+
+    host: str
+    status: str = "⏳ waiting"
+    last_line: str = ""
+    ok: bool | None = None
+    t_start: float | None = None
+    t_end: float | None = None
+    steps: dict[str, float] = field(default_factory=dict)  # step -> seconds
+    log: deque[str] = field(default_factory=lambda: deque(maxlen=LOG_TAIL))
+
+    @property
+    def elapsed(self) -> float | None:
+        if self.t_start is None:
+            return None
+        return (self.t_end or time.monotonic()) - self.t_start
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments and return the parsed namespace."""
+    parser = argparse.ArgumentParser(
+        description="Sync the dotfiles on all remote machines in parallel."
+    )
+    parser.add_argument(
+        "mode",
+        nargs="?",
+        choices=["sync", "install"],
+        default="sync",
+        help="'install' also runs ./install on the hosts (default: sync).",
+    )
+    parser.add_argument(
+        "--hosts", nargs="+", default=HOSTS, help="Hosts to sync (default: all)."
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=len(HOSTS),
+        help="Hosts processed at the same time (default: all).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=600,
+        help="Seconds before a host is given up on (default: 600).",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=int,
+        default=10,
+        help="Seconds to wait for an SSH connection (default: 10).",
+    )
+    return parser.parse_args()
+
+
+def ssh_options(connect_timeout: int) -> list[str]:
+    """Options that let scp and ssh share one connection per host."""
+    return [
+        "-o",
+        "ControlMaster=auto",
+        "-o",
+        f"ControlPath={CONTROL_DIR}/%C",
+        "-o",
+        "ControlPersist=60",
+        "-o",
+        f"ConnectTimeout={connect_timeout}",
+        # No password prompts: they would interleave between hosts.
+        "-o",
+        "BatchMode=yes",
+    ]
+
+
+async def run_step(result: HostResult, step: str, *cmd: str) -> None:
+    """Run one command for a host, following its output; raise if it fails."""
+    result.status = step
+    t_start = time.monotonic()
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        start_new_session=True,  # So a timeout can kill what the command started
+    )
+    try:
+        assert process.stdout is not None
+        async for raw in process.stdout:
+            line = raw.decode(errors="replace").rstrip()
+            if line:
+                result.log.append(line)
+                result.last_line = line
+        await process.wait()
+    finally:
+        if process.returncode is None:  # Cancelled by the timeout
+            os.killpg(process.pid, signal.SIGKILL)
+            await process.wait()
+        result.steps[step] = time.monotonic() - t_start
+    if process.returncode != 0:
+        raise RuntimeError(f"{step} exited with status {process.returncode}")
+
+
+async def sync_host(
+    result: HostResult,
+    args: argparse.Namespace,
+    semaphore: asyncio.Semaphore,
+) -> None:
+    """Copy `sync-local-dotfiles` to a host and run it there."""
+    options = ssh_options(args.connect_timeout)
+    host = result.host
+    async with semaphore:
+        result.t_start = time.monotonic()
+        try:
+            async with asyncio.timeout(args.timeout):
+                await run_step(result, "🔌 connecting", "ssh", *options, host, "true")
+                await run_step(
+                    result,
+                    "📤 copying",
+                    "scp",
+                    *options,
+                    str(SYNC_SCRIPT),
+                    f"{host}:.local/bin/sync-local-dotfiles",
+                )
+                await run_step(
+                    result,
+                    "🔄 syncing",
+                    "ssh",
+                    *options,
+                    host,
+                    f"~/.local/bin/sync-local-dotfiles {args.mode}",
+                )
+        except TimeoutError:
+            result.ok = False
+            result.status = f"⌛ timed out after {args.timeout:.0f}s"
+        except (RuntimeError, OSError) as e:
+            result.ok = False
+            result.status = f"❌ {e}"
+        else:
+            result.ok = True
+            result.status = "✅ done"
+        finally:
+            result.t_end = time.monotonic()
+
+
+def status_table(results: list[HostResult]) -> Table:
+    table = Table(title="📡 Syncing dotfiles")
+    table.add_column("Host", style="cyan")
+    table.add_column("Status")
+    table.add_column("Time (s)", justify="right")
+    table.add_column("Output", style="dim", overflow="ellipsis", no_wrap=True)
+    for r in results:
+        elapsed = r.elapsed
+        table.add_row(
+            r.host,
+            r.status,
+            "-" if elapsed is None else f"{elapsed:.1f}",
+            r.last_line[:80],
+        )
+    return table
+
+
+def timing_table(results: list[HostResult]) -> Table:
+    steps = ["🔌 connecting", "📤 copying", "🔄 syncing"]
+    table = Table(title="⏱️ Timing")
+    table.add_column("Host", style="cyan")
+    for step in steps:
+        table.add_column(f"{step[2:]} (s)", justify="right")
+    table.add_column("Total (s)", justify="right")
+    for r in sorted(results, key=lambda r: r.elapsed or 0, reverse=True):
+        table.add_row(
+            r.host,
+            *(f"{r.steps[s]:.1f}" if s in r.steps else "-" for s in steps),
+            "-" if r.elapsed is None else f"{r.elapsed:.1f}",
+        )
+    return table
+
+
+async def sync_all(args: argparse.Namespace, console: Console) -> list[HostResult]:
+    results = [HostResult(host) for host in args.hosts]
+    semaphore = asyncio.Semaphore(max(args.jobs, 1))
+    tasks = [asyncio.create_task(sync_host(r, args, semaphore)) for r in results]
+    with Live(status_table(results), console=console, refresh_per_second=4) as live:
+        while not all(task.done() for task in tasks):
+            await asyncio.wait(tasks, timeout=0.25)
+            live.update(status_table(results))
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    console = Console()
+    console.print(f"🛠️ Running in {args.mode} mode")
+    if not SYNC_SCRIPT.exists():
+        sys.exit(f"❌ {SYNC_SCRIPT} not found, run ./install first")
+    CONTROL_DIR.mkdir(parents=True, exist_ok=True)
+    os.chmod(CONTROL_DIR, 0o700)
+
+    t_start = time.monotonic()
+    results = asyncio.run(sync_all(args, console))
+    wall_time = time.monotonic() - t_start
+
+    for r in results:
+        if not r.ok and r.log:
+            console.rule(f"[red]{r.host}")
+            console.print("\n".join(r.log), markup=False, highlight=False)
+    console.print(timing_table(results))
+    serial = sum(r.elapsed or 0 for r in results)
+    console.print(
+        f"Wall time {wall_time:.1f}s, {serial:.1f}s if the hosts ran one at a time"
+    )
+
+    successful = [r.host for r in results if r.ok]
+    failed = [r.host for r in results if not r.ok]
+    console.print("📊 SUMMARY 📊")
+    console.print("--------------")
+    console.print(
+        f"✅ Successful ({len(successful)}): {' '.join(successful)}", soft_wrap=True
+    )
+    console.print(f"❌ Failed ({len(failed)}): {' '.join(failed)}", soft_wrap=True)
+    console.print("--------------")
+    if failed:
+        console.print("⚠️ Some hosts failed. Check the logs above for details.")
+        sys.exit(1)
+    console.print("🎉 All hosts processed successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Fast local check for text that obviously needs no correction.
+
+Text passes when every word is in a dictionary and no simple punctuation or
+repeated-word rule fires; only text that fails is worth an LLM round trip.
+
+The dictionary is a sorted, newline-separated word list built once from the
+system word list and memory-mapped, so loading it costs nothing and lookups
+are a binary search over the mapped bytes.
+
+Used by fix_my_text_ollama.py.
+"""
+
+import mmap
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+WORDLIST_SOURCES = [
+    Path("/usr/share/dict/words"),
+    Path("/usr/share/dict/american-english"),
+    Path("/usr/share/dict/british-english"),
+]
+DICT_FILE = Path.home() / ".cache" / "dotfiles-llm" / "words.sorted"
+
+# Things that are not prose and should not be spell checked.
+NON_PROSE = re.compile(
+    r"`[^`]*`"  # inline code
+    r"|\b\w+://\S+"  # URLs
+    r"|\S+@\S+\.\w+"  # email addresses
+    r"|\b\S*[/\\]\S*"  # paths
+)
+WORD = re.compile(r"[A-Za-z][A-Za-z']*")
+SUFFIXES = ("'s", "s", "es", "ies", "ed", "d", "ing", "ly", "er", "est")
+
+RULES = {
+    "repeated word": re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE),
+    "space before punctuation": re.compile(r"\w[ \t]+[,;:!?]|\w[ \t]+\.(?=\s|$)"),
+    "missing space after punctuation": re.compile(r"[a-z][,;!?][A-Za-z]"),
+    "lowercase sentence start": re.compile(r"(?<!\.\.)[.!?]\s+[a-z]|^\s*[a-z]"),
+    "lowercase 'i'": re.compile(r"\bi\b"),
+    "doubled punctuation": re.compile(r"(?<!\.)[,;:]{2,}|(?<!\.)\.\.(?!\.)"),
+}
+
+
+def _wordlist_source() -> Path | None:
+    env = os.getenv("FIX_MY_TEXT_WORDLIST")
+    candidates = [Path(env)] if env else WORDLIST_SOURCES
+    return next((p for p in candidates if p.is_file()), None)
+
+
+def build_dictionary(source: Path, target: Path = DICT_FILE) -> None:
+    """Write the lowercased, deduplicated words of `source` to `target`, sorted by bytes."""
+    words = {
+        line.strip().lower().encode()
+        for line in source.read_text(errors="ignore").splitlines()
+        if line.strip()
+    }
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    tmp.write_bytes(b"\n".join(sorted(words)))
+    tmp.replace(target)
+
+
+class WordSet:
+    """Membership test over a sorted, newline-separated, memory-mapped word list."""
+
+    def __init__(self, path: Path) -> None:
+        with path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __contains__(self, word: str) -> bool:
+        target = word.encode()
+        mm = self._mm
+        lo, hi = 0, len(mm)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mm.rfind(b"\n", lo, mid) + 1 or lo
+            end = mm.find(b"\n", start)
+            if end == -1:
+                end = len(mm)
+            line = mm[start:end]
+            if line == target:
+                return True
+            if line < target:
+                lo = end + 1
+            else:
+                hi = start
+        return False
+
+    def knows(self, word: str) -> bool:
+        """Whether `word`, or `word` without a common suffix, is in the dictionary."""
+        word = word.lower().strip("'")
+        if word in self:
+            return True
+        for suffix in SUFFIXES:
+            if not word.endswith(suffix) or len(word) < len(suffix) + 3:
+                continue
+            stem = word[: -len(suffix)]
+            # "running" -> "run", "making" -> "make", "parties" -> "party"
+            candidates = [stem, stem + "e", stem + "y"]
+            if stem[-1] == stem[-2]:
+                candidates.append(stem[:-1])
+            if any(candidate in self for candidate in candidates):
+                return True
+        return False
+
+
+def load_wordset() -> WordSet | None:
+    """Return the dictionary, (re)building it when the source word list changed."""
+    source = _wordlist_source()
+    if source is None:
+        return None
+    if (
+        not DICT_FILE.exists()
+        or DICT_FILE.stat().st_mtime < source.stat().st_mtime
+        or DICT_FILE.stat().st_size == 0
+    ):
+        build_dictionary(source)
+    return WordSet(DICT_FILE)
+
+
+def find_issues(text: str, words: WordSet, limit: int = 5) -> list[str]:
+    """Return up to `limit` reasons why `text` may need a correction."""
+    prose = NON_PROSE.sub(" ", text)
+    issues = []
+    for name, pattern in RULES.items():
+        match = pattern.search(prose)
+        if match:
+            issues.append(f"{name}: {match.group(0).strip()!r}")
+    tokens = WORD.findall(prose)
+    # A capitalized word that is not in the dictionary counts as a name only when
+    # it is repeated, so a single capitalized typo like "Teh" is still caught.
+    names = Counter(token for token in tokens if token[0].isupper())
+    for token in tokens:
+        # Acronyms and identifiers are not dictionary words.
+        if any(c.isupper() for c in token[1:]) or len(token) == 1:
+            continue
+        if names[token] < 2 and not words.knows(token):
+            issues.append(f"unknown word: {token!r}")
+        if len(issues) >= limit:
+            break
+    return issues[:limit]
+
+
+if __name__ == "__main__":
+    import sys
+
+    wordset = load_wordset()
+    if wordset is None:
+        sys.exit("No word list found; set FIX_MY_TEXT_WORDLIST.")
+    text = sys.stdin.read()
+    issues = find_issues(text, wordset)
+    print("\n".join(issues) if issues else "No issues found.")
@@ -5,6 +5,7 @@
 #   "pyaudio",  # We need PyAudio to access the microphone
 #   "rich",  # For nice terminal output
 #   "pyperclip",
+#   "numpy",  # For resampling the mic, and voice activity detection
 # ]
 # ///
 """
@@ -34,22 +35,26 @@ To create a hotkey toggle for this script, set up a Keyboard Maestro macro with:
 
 This creates a single hotkey that toggles transcription on/off with visual feedback.
 *Note that Keyboard Maestro requires notification permission to show the notification.*
+
+CONTINUOUS DICTATION:
+With --continuous, the audio is cut into utterances at pauses, and every utterance
+is sent as its own Transcribe request. The server finalizes an utterance while the
+next one is being recorded, and each transcript is appended to the clipboard
+and/or --output file as soon as it arrives. A failed utterance only loses itself.
 """
 import argparse
 import asyncio
 import logging
 import signal
 import wave
+from collections import deque
 from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from pathlib import Path
 from typing import Generator
 
 import pyaudio
-import pyperclip
 from rich.console import Console
-from rich.live import Live
-from rich.text import Text
 
 from wyoming.asr import (
     Transcribe,
@@ -61,6 +66,15 @@ from wyoming.asr import (
 from wyoming.audio import AudioChunk, AudioStart, AudioStop
 from wyoming.client import AsyncClient
 
+import clipboard
+from audio_capture import (
+    AudioStats,
+    Resampler,
+    capture_audio,
+    level,
+    live_status,
+    native_format,
+)
 
 HERE = Path(__file__).parent
 
@@ -68,10 +82,20 @@ HERE = Path(__file__).parent
 SERVER_IP = "192.168.1.143"
 SERVER_PORT = 10300
 FORMAT = pyaudio.paInt16
-CHANNELS = 1  # mono
-RATE = 16000
+CHANNELS = 1  # mono, as sent to the server (the mic is downmixed)
+RATE = 16000  # as sent to the server (the mic is resampled)
 CHUNK_SIZE = 1024
 
+# --- Continuous mode ---
+SILENCE = 0.8  # seconds of silence that end an utterance
+MAX_SEGMENT = 30.0  # seconds after which an utterance is cut regardless
+PRE_ROLL = 0.3  # seconds of audio kept from before the speech onset
+SPEECH_RATIO = 3.0  # speech is this many times louder than the noise floor
+MIN_SPEECH_RMS = 300.0  # ...and at least this loud (of 32768)
+NOISE_ADAPT = 0.05  # how fast the noise floor follows non-speech chunks
+NOISE_RISE = 0.005  # ...and speech chunks (a time constant of about 13 s)
+TRANSCRIPT_TIMEOUT = 60.0  # seconds to wait for the transcript of an utterance
+
 # --- Helper Functions & Context Managers ---
 
 
@@ -119,6 +143,30 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Copy the final transcript to the clipboard.",
     )
+    continuous = parser.add_argument_group("continuous dictation")
+    continuous.add_argument(
+        "--continuous",
+        action="store_true",
+        help="Transcribe every utterance separately, cut at pauses.",
+    )
+    continuous.add_argument(
+        "--silence",
+        type=float,
+        default=SILENCE,
+        help=f"Seconds of silence that end an utterance (default: {SILENCE}).",
+    )
+    continuous.add_argument(
+        "--max-segment",
+        type=float,
+        default=MAX_SEGMENT,
+        help=f"Longest utterance in seconds (default: {MAX_SEGMENT:.0f}).",
+    )
+    continuous.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Append every transcript to this file as it arrives.",
+    )
     return parser.parse_args()
 
 
@@ -164,7 +212,12 @@ def list_input_devices(pa: pyaudio.PyAudio, console: Console | None) -> None:
     for i in range(pa.get_device_count()):
         info = pa.get_device_info_by_index(i)
         if info.get("maxInputChannels", 0) > 0:
-            _print(console, f"  [yellow]{i}[/yellow]: {info['name']}")
+            _print(
+                console,
+                f"  [yellow]{i}[/yellow]: {info['name']}"
+                f" [dim]({info['defaultSampleRate']:.0f} Hz,"
+                f" {info['maxInputChannels']} ch)[/dim]",
+            )
 
 
 # --- Core Application Logic ---
@@ -172,33 +225,21 @@ def list_input_devices(pa: pyaudio.PyAudio, console: Console | None) -> None:
 
 async def send_audio(
     client: AsyncClient,
-    stream: pyaudio.Stream,
+    audio_queue: asyncio.Queue[bytes | None],
     wav_file: wave.Wave_write | None,
-    stop_event: asyncio.Event,
+    stats: AudioStats,
     logger: logging.Logger,
     console: Console | None,
 ) -> None:
-    """Read from mic, write to WAV, and send to server."""
+    """Take captured (and any buffered) audio, write to WAV, and send to server."""
     logger.debug("Sending Transcribe request")
     await client.write_event(Transcribe().event())
     logger.debug("Sending AudioStart")
     await client.write_event(AudioStart(rate=RATE, width=2, channels=CHANNELS).event())
 
     try:
-        if console is not None:
-            live = Live(
-                Text("Streaming...", style="blue"),
-                console=console,
-                transient=True,
-                refresh_per_second=10,
-            )
-        else:
-            live = nullcontext()
-
-        with live:
-            counter = 0
-            while not stop_event.is_set():
-                chunk = await asyncio.to_thread(stream.read, CHUNK_SIZE)
+        async with live_status(stats, console, "Streaming..."):
+            while (chunk := await audio_queue.get()) is not None:
                 if wav_file:
                     wav_file.writeframes(chunk)
 
@@ -208,38 +249,25 @@ async def send_audio(
                         rate=RATE, width=2, channels=CHANNELS, audio=chunk
                     ).event()
                 )
-                counter += 1
-                if console is not None:
-                    live.update(
-                        Text(
-                            f"Streaming... ({counter * CHUNK_SIZE / RATE:.1f}s)",
-                            style="blue",
-                        )
-                    )
+                stats.add_sent(chunk)
     finally:
         logger.debug("Sending AudioStop")
         await client.write_event(AudioStop().event())
 
 
-async def receive_text(
-    client: AsyncClient,
-    logger: logging.Logger,
-    console: Console | None,
-    args: argparse.Namespace,
-) -> None:
-    """Receive transcription events and handle final transcript."""
-    transcript_text = ""
+async def read_transcript(
+    client: AsyncClient, logger: logging.Logger, console: Console | None
+) -> str:
+    """Read transcription events until the final transcript and return its text."""
     while True:
         event = await client.read_event()
         if event is None:
             logger.debug("Server closed the connection")
-            break
+            return ""
         if Transcript.is_type(event.type):
             transcript = Transcript.from_event(event)
-            transcript_text = transcript.text
-            _print(console, f"\n[bold green]Transcript:[/bold green] {transcript_text}")
-            logger.info("Transcript [final]: %s", transcript_text)
-            break
+            logger.info("Transcript [final]: %s", transcript.text)
+            return transcript.text
         elif TranscriptChunk.is_type(event.type):
             chunk = TranscriptChunk.from_event(event)
             _print(console, chunk.text, end="")
@@ -248,16 +276,28 @@ async def receive_text(
             logger.debug("Received TranscriptStart")
         elif TranscriptStop.is_type(event.type):
             logger.debug("Received TranscriptStop")
-            break
+            return ""
         else:
             logger.debug("Received non-transcript event type=%s", event.type)
 
+
+async def receive_text(
+    client: AsyncClient,
+    logger: logging.Logger,
+    console: Console | None,
+    args: argparse.Namespace,
+) -> None:
+    """Receive transcription events and handle final transcript."""
+    transcript_text = await read_transcript(client, logger, console)
+    if transcript_text:
+        _print(console, f"\n[bold green]Transcript:[/bold green] {transcript_text}")
+
     if args.clipboard and transcript_text:
         try:
-            pyperclip.copy(transcript_text)
+            clipboard.copy(transcript_text)
             logger.info("Copied transcript to clipboard.")
             _print(console, "[italic green]Copied to clipboard.[/italic green]")
-        except pyperclip.PyperclipException as e:
+        except clipboard.ClipboardError as e:
             logger.error("Could not copy to clipboard: %s", e)
             _print(
                 console, f"[bold red]Error:[/bold red] Could not copy to clipboard: {e}"
@@ -269,6 +309,170 @@ def _print(console: Console | None, message: str, end: str = "\n") -> None:
         console.print(message, end=end)
 
 
+class SpeechDetector:
+    """Energy-based voice activity detection, to cut the audio at pauses."""
+
+    def __init__(self) -> None:
+        # Start from a quiet room: the first chunk may already be speech.
+        self.noise_floor = MIN_SPEECH_RMS / SPEECH_RATIO
+
+    def is_speech(self, chunk: bytes) -> bool:
+        rms, _ = level(chunk)
+        speech = rms > max(self.noise_floor * SPEECH_RATIO, MIN_SPEECH_RMS)
+        # Follow the background noise. Speech pulls the floor up too, but slowly:
+        # a steady noise above MIN_SPEECH_RMS (a fan, a mic at high gain) would
+        # otherwise count as speech forever, and utterances only end at --max-segment.
+        weight = NOISE_RISE if speech else NOISE_ADAPT
+        self.noise_floor += weight * (rms - self.noise_floor)
+        return speech
+
+
+async def start_utterance(uri: str) -> AsyncClient:
+    """Open a connection with a new Transcribe request for one utterance."""
+    client = AsyncClient.from_uri(uri)
+    await client.connect()
+    await client.write_event(Transcribe().event())
+    await client.write_event(AudioStart(rate=RATE, width=2, channels=CHANNELS).event())
+    return client
+
+
+async def finish_utterance(
+    client: AsyncClient, number: int, logger: logging.Logger
+) -> str:
+    """End the audio of an utterance and wait for its transcript."""
+    try:
+        await client.write_event(AudioStop().event())
+        # Transcripts are written in order, so one that never comes would block the rest.
+        async with asyncio.timeout(TRANSCRIPT_TIMEOUT):
+            return await read_transcript(client, logger, None)
+    except TimeoutError:
+        logger.error(
+            "Utterance %d lost: no transcript after %.0f s", number, TRANSCRIPT_TIMEOUT
+        )
+        return ""
+    except (OSError, ConnectionError) as e:
+        logger.error("Utterance %d failed: %s", number, e)
+        return ""
+    finally:
+        await client.disconnect()
+
+
+async def write_transcripts(
+    results: asyncio.Queue[asyncio.Task[str] | None],
+    args: argparse.Namespace,
+    logger: logging.Logger,
+    console: Console | None,
+) -> None:
+    """Append the transcripts as they arrive, in the order they were spoken."""
+    transcripts: list[str] = []
+    number = 0
+    while (task := await results.get()) is not None:
+        number += 1
+        text = (await task).strip()
+        if not text:
+            continue
+        transcripts.append(text)
+        _print(console, f"[bold green]{number}:[/bold green] {text}")
+        if args.output:
+            with args.output.open("a") as f:
+                f.write(text + "\n")
+        if args.clipboard:
+            try:
+                await clipboard.copy_async(" ".join(transcripts))
+            except clipboard.ClipboardError as e:
+                logger.error("Could not copy to clipboard: %s", e)
+
+
+async def dictate(
+    uri: str,
+    audio_queue: asyncio.Queue[bytes | None],
+    wav_file: wave.Wave_write | None,
+    stats: AudioStats,
+    args: argparse.Namespace,
+    logger: logging.Logger,
+    console: Console | None,
+) -> None:
+    """Stream every utterance in its own Transcribe request, cut at pauses.
+
+    An utterance is finalized in the background while the next one is
+    captured; `write_transcripts` puts the results back in order.
+    """
+    chunk_seconds = CHUNK_SIZE / RATE
+    silence_chunks = max(1, round(args.silence / chunk_seconds))
+    max_chunks = max(1, round(args.max_segment / chunk_seconds))
+    pre_roll: deque[bytes] = deque(maxlen=max(1, round(PRE_ROLL / chunk_seconds)))
+    detector = SpeechDetector()
+    results: asyncio.Queue[asyncio.Task[str] | None] = asyncio.Queue()
+    writer = asyncio.create_task(write_transcripts(results, args, logger, console))
+
+    client: AsyncClient | None = None
+    in_utterance = False  # Also while a failed utterance runs to its end
+    number = silent = length = 0
+    try:
+        async with live_status(stats, console, "Listening..."):
+            while (chunk := await audio_queue.get()) is not None:
+                stats.add_sent(chunk)
+                if wav_file:
+                    wav_file.writeframes(chunk)
+                speech = detector.is_speech(chunk)
+                if not in_utterance:
+                    if not speech:
+                        pre_roll.append(chunk)
+                        continue
+                    in_utterance = True
+                    number += 1
+                    silent = length = 0
+                    logger.debug("Utterance %d started", number)
+                    try:
+                        client = await start_utterance(uri)
+                    except OSError as e:
+                        logger.error("Could not start utterance %d: %s", number, e)
+                        _print(
+                            console,
+                            f"[bold red]Utterance {number} lost:[/bold red] {e}",
+                        )
+                    pending = [*pre_roll, chunk]
+                    pre_roll.clear()
+                else:
+                    pending = [chunk]
+
+                if client is not None:
+                    try:
+                        for audio in pending:
+                            await client.write_event(
+                                AudioChunk(
+                                    rate=RATE, width=2, channels=CHANNELS, audio=audio
+                                ).event()
+                            )
+                    except (OSError, ConnectionError) as e:
+                        logger.error("Utterance %d failed: %s", number, e)
+                        _print(
+                            console,
+                            f"[bold red]Utterance {number} lost:[/bold red] {e}",
+                        )
+                        await client.disconnect()
+                        client = None
+                length += 1
+                silent = 0 if speech else silent + 1
+                if silent >= silence_chunks or length >= max_chunks:
+                    logger.debug("Utterance %d ended after %d chunk(s)", number, length)
+                    if client is not None:
+                        results.put_nowait(
+                            asyncio.create_task(
+                                finish_utterance(client, number, logger)
+                            )
+                        )
+                    client = None
+                    in_utterance = False
+    finally:
+        if client is not None:
+            results.put_nowait(
+                asyncio.create_task(finish_utterance(client, number, logger))
+            )
+        results.put_nowait(None)
+        await writer
+
+
 async def run_transcription(
     args: argparse.Namespace,
     logger: logging.Logger,
@@ -276,33 +480,35 @@ async def run_transcription(
     stop_event: asyncio.Event,
     console: Console | None,
 ) -> None:
-    """Connects to server and manages transcription lifecycle."""
-    uri = f"tcp://{args.server_ip}:{args.server_port}"
-    logger.info("Connecting to Wyoming server at %s", uri)
-    _print(console, f"Connecting to Wyoming server at [cyan]{uri}[/cyan]...")
+    """Connects to server and manages transcription lifecycle.
 
+    The microphone is opened before connecting, so speech during connection
+    setup is buffered and flushed to the server once the connection is up.
+    """
+    uri = f"tcp://{args.server_ip}:{args.server_port}"
     client = AsyncClient.from_uri(uri)
     output_wav = (
         HERE / f"recording_{datetime.now().strftime('%Y%m%d_%H%M%S')}.wav"
         if args.save_recording
         else None
     )
+    wav_manager = wave.open(str(output_wav), "wb") if output_wav else nullcontext()
+    # Open the mic at its own format; chunks are converted to RATE mono.
+    native_rate, native_channels = native_format(p, args.device_index)
+    resampler = Resampler(native_rate, native_channels, RATE)
+    frames = resampler.input_frames(CHUNK_SIZE)
+    logger.debug("Capturing at %d Hz, %d channel(s)", native_rate, native_channels)
+    stats = AudioStats()
 
     try:
-        await client.connect()
-        logger.info("Connection established")
-        _print(console, "[green]Connection successful.[/green] Listening...")
-
-        wav_manager = wave.open(output_wav, "wb") if output_wav else nullcontext()
-
         with (
             open_pyaudio_stream(
                 p,
                 format=FORMAT,
-                channels=CHANNELS,
-                rate=RATE,
+                channels=native_channels,
+                rate=native_rate,
                 input=True,
-                frames_per_buffer=CHUNK_SIZE,
+                frames_per_buffer=frames,
                 input_device_index=args.device_index,
             ) as stream,
             wav_manager as wav_file,
@@ -313,12 +519,36 @@ async def run_transcription(
                 wav_file.setsampwidth(2)
                 wav_file.setframerate(RATE)
 
-            send_task = asyncio.create_task(
-                send_audio(client, stream, wav_file, stop_event, logger, console)
-            )
-            recv_task = asyncio.create_task(receive_text(client, logger, console, args))
+            async with capture_audio(
+                stream, frames, stop_event, logger, resampler, stats
+            ) as audio_queue:
+                if args.continuous:
+                    _print(
+                        console,
+                        f"Listening... sending every utterance to [cyan]{uri}[/cyan]",
+                    )
+                    await dictate(
+                        uri, audio_queue, wav_file, stats, args, logger, console
+                    )
+                    return
+
+                logger.info("Connecting to Wyoming server at %s", uri)
+                _print(
+                    console,
+                    f"Listening... connecting to Wyoming server at [cyan]{uri}[/cyan]",
+                )
+                await client.connect()
+                logger.info("Connection established")
+                _print(console, "[green]Connection successful.[/green]")
+
+                send_task = asyncio.create_task(
+                    send_audio(client, audio_queue, wav_file, stats, logger, console)
+                )
+                recv_task = asyncio.create_task(
+                    receive_text(client, logger, console, args)
+                )
 
-            await asyncio.gather(send_task, recv_task)
+                await asyncio.gather(send_task, recv_task)
 
     finally:
         logger.info("run_transcription finally block reached.")
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Update the submodules to their remote branches, in parallel and shallow.
+
+Does what `git submodule update --init --recursive --remote` does in the
+install flow, but:
+- submodules are updated concurrently (`--jobs`), with `--depth 1` fetches,
+- a submodule is skipped if its checkout already matches the remote branch,
+  as reported by `git ls-remote` (cached for `--cache-ttl` seconds),
+- the time and outcome of every submodule are reported.
+
+Only needs Python 3.9+ and git, so it can run before anything is installed.
+
+Usage:
+    python3 scripts/update-submodules.py
+    python3 scripts/update-submodules.py -j 4 --full-history submodules/oh-my-zsh
+    python3 scripts/update-submodules.py --repo /path/to/superproject --cache-ttl 0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parent.parent
+CACHE_FILE = Path.home() / ".cache" / "dotfiles" / "ls-remote.json"
+CACHE_TTL = 300  # Seconds a remote HEAD is trusted without asking again
+
+
+@dataclass
+class Submodule:
+    """A submodule of the superproject and the outcome of its update."""
+
+    name: str
+    path: str
+    url: str
+    branch: str | None = None  # None means the remote HEAD
+    status: str = "pending"
+    detail: str = ""
+    elapsed: float = 0.0
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command-line arguments and return the parsed namespace."""
+    parser = argparse.ArgumentParser(
+        description="Update the submodules in parallel with shallow fetches."
+    )
+    parser.add_argument(
+        "paths", nargs="*", help="Only update these submodules (default: all)."
+    )
+    parser.add_argument(
+        "--repo",
+        type=Path,
+        default=REPO,
+        help="The superproject (default: this dotfiles repository).",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=8,
+        help="Submodules updated at the same time (default: 8).",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=CACHE_TTL,
+        help=f"Seconds to trust a cached ls-remote result (default: {CACHE_TTL}).",
+    )
+    parser.add_argument(
+        "--full-history",
+        action="store_true",
+        help="Fetch the full history instead of only the latest commit.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Update every submodule, even if it matches its remote.",
+    )
+    return parser.parse_args()
+
+
+async def git(*args: str, cwd: Path) -> tuple[int, str]:
+    """Run git and return its exit status and combined output."""
+    process = await asyncio.create_subprocess_exec(
+        "git",
+        *args,
+        cwd=cwd,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    stdout, _ = await process.communicate()
+    assert process.returncode is not None
+    return process.returncode, stdout.decode(errors="replace").strip()
+
+
+async def list_submodules(repo: Path) -> list[Submodule]:
+    """The top-level submodules declared in .gitmodules."""
+    returncode, output = await git(
+        "config",
+        "--file",
+        ".gitmodules",
+        "--get-regexp",
+        r"^submodule\..*\.(path|url|branch)$",
+        cwd=repo,
+    )
+    if returncode != 0:
+        return []
+    config: dict[str, dict[str, str]] = {}
+    for line in output.splitlines():
+        key, _, value = line.partition(" ")
+        name, _, attribute = key[len("submodule.") :].rpartition(".")
+        config.setdefault(name, {})[attribute] = value
+    return [
+        Submodule(name, c["path"], c["url"], c.get("branch"))
+        for name, c in config.items()
+        if "path" in c and "url" in c
+    ]
+
+
+def load_cache() -> dict[str, dict]:
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(cache: dict[str, dict]) -> None:
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_FILE.write_text(json.dumps(cache, indent=2))
+    except OSError:
+        pass  # The cache only saves network round trips
+
+
+async def remote_head(
+    submodule: Submodule, repo: Path, cache: dict[str, dict], ttl: float
+) -> str | None:
+    """The commit of the submodule's remote branch, from the cache if it is fresh."""
+    ref = f"refs/heads/{submodule.branch}" if submodule.branch else "HEAD"
+    key = f"{submodule.url} {ref}"
+    entry = cache.get(key)
+    if entry and time.time() - entry["checked"] < ttl:
+        return entry["sha"]
+    returncode, output = await git("ls-remote", submodule.url, ref, cwd=repo)
+    if returncode != 0 or not output:
+        return None
+    sha = output.split()[0]
+    cache[key] = {"sha": sha, "checked": time.time()}
+    return sha
+
+
+async def local_head(submodule: Submodule, repo: Path) -> str | None:
+    path = repo / submodule.path
+    if not (path / ".git").exists():
+        return None  # Not initialized yet
+    returncode, output = await git("rev-parse", "HEAD", cwd=path)
+    return output if returncode == 0 else None
+
+
+async def update(
+    submodule: Submodule,
+    args: argparse.Namespace,
+    cache: dict[str, dict],
+    semaphore: asyncio.Semaphore,
+) -> None:
+    """Update one submodule unless it already matches its remote."""
+    async with semaphore:
+        t_start = time.monotonic()
+        try:
+            before = await local_head(submodule, args.repo)
+            if not args.force and before is not None:
+                remote = await remote_head(submodule, args.repo, cache, args.cache_ttl)
+                if remote == before:
+                    submodule.status = "up to date"
+                    return
+            depth = [] if args.full_history else ["--depth", "1"]
+            returncode, output = await git(
+                "submodule",
+                "update",
+                "--init",
+                "--recursive",
+                "--remote",
+                *depth,
+                "--",
+                submodule.path,
+                cwd=args.repo,
+            )
+            if returncode != 0:
+                submodule.status = "failed"
+                submodule.detail = output.splitlines()[-1] if output else ""
+                return
+            after = await local_head(submodule, args.repo)
+            if before == after:
+                submodule.status = "up to date"
+            else:
+                submodule.status = "updated"
+                old = before[:7] if before else "new"
+                submodule.detail = f"{old} → {after[:7] if after else '?'}"
+        finally:
+            submodule.elapsed = time.monotonic() - t_start
+
+
+async def update_all(args: argparse.Namespace) -> list[Submodule]:
+    submodules = await list_submodules(args.repo)
+    if args.paths:
+        wanted = {p.rstrip("/") for p in args.paths}
+        submodules = [s for s in submodules if s.path in wanted]
+    if not submodules:
+        return []
+    # Sync the URLs and register the submodules first: these write the
+    # superproject's .git/config, which the parallel updates must not race on.
+    await git("submodule", "sync", "--recursive", cwd=args.repo)
+    await git("submodule", "init", "--", *(s.path for s in submodules), cwd=args.repo)
+    cache = load_cache()
+    semaphore = asyncio.Semaphore(max(args.jobs, 1))
+    await asyncio.gather(*(update(s, args, cache, semaphore) for s in submodules))
+    save_cache(cache)
+    return submodules
+
+
+def main() -> None:
+    args = parse_args()
+    t_start = time.monotonic()
+    submodules = asyncio.run(update_all(args))
+    wall_time = time.monotonic() - t_start
+
+    icons = {"updated": "🔄", "up to date": "✅", "failed": "❌"}
+    width = max((len(s.path) for s in submodules), default=0)
+    for s in sorted(submodules, key=lambda s: s.elapsed, reverse=True):
+        icon = icons.get(s.status, "❓")
+        print(f"{icon} {s.path:<{width}}  {s.elapsed:6.2f}s  {s.status} {s.detail}")
+    serial = sum(s.elapsed for s in submodules)
+    print(
+        f"📦 {len(submodules)} submodule(s) in {wall_time:.1f}s"
+        f" ({serial:.1f}s if they ran one at a time)"
+    )
+    if any(s.status == "failed" for s in submodules):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
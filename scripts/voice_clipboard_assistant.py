@@ -6,6 +6,7 @@
 #   "rich",
 #   "pyperclip",
 #   "pydantic-ai-slim[openai]",
+#   "numpy",
 # ]
 # ///
 """
@@ -16,10 +17,12 @@ This script combines functionalities from transcribe.py and fix_my_text_ollama.p
 WORKFLOW:
 1. The script starts and immediately copies the current content of the clipboard.
 2. It then starts listening for a voice command via the microphone.
+   Recording starts immediately and is buffered while the ASR connection is set up.
 3. The user triggers a stop signal (e.g., via a Keyboard Maestro hotkey sending SIGINT).
 4. The script stops recording and finalizes the transcription of the voice command.
 5. It sends the original clipboard text and the transcribed command to a local LLM.
 6. The LLM processes the text based on the instruction (either editing it or answering a question).
+   Long texts with an editing instruction are split into paragraph chunks that are processed concurrently.
 7. The resulting text is then copied back to the clipboard.
 
 KEYBOARD MAESTRO INTEGRATION:
@@ -43,28 +46,42 @@ To create a hotkey toggle for this script, set up a Keyboard Maestro macro with:
      source "$HOME/.dotbins/shell/zsh.sh" 2>/dev/null || true  # Adds uv to PATH
      ${HOME}/dotfiles/scripts/voice_clipboard_assistant.py --device-index 1 --quiet &
    - Select "Display results in a notification"
+
+SESSION MODE:
+With --session, consecutive invocations keep the conversation with the LLM in an on-disk session file,
+so follow-ups like "shorter" or "now in German" only send the new instruction and Ollama can reuse its
+cached context. A session continues while the clipboard still holds (roughly) the last result, and is
+reset when it expires (--session-ttl) or the clipboard changes to unrelated content. Runs in session
+mode do not use the result cache.
+
+TRACING:
+Every run appends its phase timings (clipboard read, PyAudio init, ASR connect, recording,
+transcript wait, LLM time-to-first-token and generation, clipboard write) as one JSON line
+to --trace-file. Run with --report to see per-phase percentiles across all recorded runs.
 """
 
 import argparse
 import asyncio
+import difflib
+import json
 import logging
-import os
+import re
 import signal
 import sys
 import time
-from contextlib import contextmanager, nullcontext
+import uuid
+from contextlib import contextmanager, nullcontext, suppress
+from pathlib import Path
 from typing import Generator
 
 import pyaudio
-import pyperclip
+from pydantic import ValidationError
 from pydantic_ai import Agent
-from pydantic_ai.models.openai import OpenAIModel
-from pydantic_ai.providers.openai import OpenAIProvider
+from pydantic_ai.messages import ModelMessage, ModelMessagesTypeAdapter, ModelRequest
 from rich.console import Console
-from rich.live import Live
 from rich.panel import Panel
 from rich.status import Status
-from rich.text import Text
+from rich.table import Table
 from wyoming.asr import (
     Transcribe,
     Transcript,
@@ -75,13 +92,55 @@ from wyoming.asr import (
 from wyoming.audio import AudioChunk, AudioStart, AudioStop
 from wyoming.client import AsyncClient
 
+import clipboard
+from audio_capture import (
+    AudioStats,
+    Resampler,
+    capture_audio,
+    live_status,
+    native_format,
+)
+from llm_backend import build_model, get_pool, served_by
+from llm_cache import (
+    ResultCache,
+    cache_key,
+    normalize_instruction,
+    prompt_version,
+    text_hash,
+)
+
 # --- Configuration ---
 ASR_SERVER_IP = "192.168.1.143"
 ASR_SERVER_PORT = 10300
-MY_OLLAMA_HOST = os.getenv("MY_OLLAMA_HOST", "http://localhost:11434")
 DEFAULT_MODEL = "devstral:24b"
 
-# PyAudio settings
+# Long-text chunking settings
+MAX_CHUNK_CHARS = 4000
+CHUNK_OVERLAP_CHARS = 300
+MAX_CONCURRENT_REQUESTS = 3
+
+# Session mode
+SESSION_FILE = Path.home() / ".cache" / "voice_clipboard_assistant" / "session.json"
+SESSION_TTL = 600  # seconds
+SESSION_SIMILARITY = 0.8  # Minimum similarity between clipboard and last result
+SESSION_MAX_COMPARE_CHARS = 20_000  # Longer texts only continue a session unchanged
+SESSION_MAX_MESSAGES = 20  # Older exchanges are dropped from the stored history
+
+# Phase tracing
+TRACE_FILE = Path.home() / ".cache" / "voice_clipboard_assistant" / "traces.jsonl"
+TRACE_PHASES = [
+    "clipboard_read",
+    "pyaudio_init",
+    "asr_connect",
+    "recording",
+    "transcript_wait",
+    "cache_lookup",
+    "llm_ttft",
+    "llm_generation",
+    "clipboard_write",
+]
+
+# PyAudio settings; the mic is captured at its own format and converted to these
 FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 16000
@@ -110,6 +169,47 @@ Analyze the instruction to determine if it's a command to edit the text or a que
 Return ONLY the resulting text (either the edit or the answer), with no extra formatting or commentary.
 """
 
+# Used for a follow-up in session mode when the clipboard still holds the last result.
+FOLLOWUP_PROMPT_TEMPLATE = """
+<instruction>
+{instruction}
+</instruction>
+
+Apply this instruction to your previous result.
+"""
+
+# Used when a long text is edited chunk by chunk.
+CHUNK_PROMPT_TEMPLATE = """
+<preceding-context>
+{context}
+</preceding-context>
+
+<original-text>
+{original_text}
+</original-text>
+
+<instruction>
+{instruction}
+</instruction>
+
+The <original-text> is one part of a longer document. The <preceding-context> is only there for reference:
+apply the instruction to the <original-text> only, and do not repeat the context in your output.
+"""
+
+# Instructions that ask something *about* the text need to see all of it at once.
+QUESTION_PATTERN = re.compile(
+    r"^\s*(what|who|why|how|when|where|which|is|are|does|"
+    r"summari[sz]e|explain|list|describe|extract|count|give me|tell me)\b"
+    r"|\b(summary|key points|tl;?dr)\b",
+    re.IGNORECASE,
+)
+PARAGRAPH_SEPARATOR = re.compile(r"(\n[ \t]*\n\s*)")
+
+# Part of the result cache key, so changing a prompt invalidates cached results.
+PROMPT_VERSION = prompt_version(
+    SYSTEM_PROMPT, AGENT_INSTRUCTIONS, FOLLOWUP_PROMPT_TEMPLATE, CHUNK_PROMPT_TEMPLATE
+)
+
 
 # --- Helper Functions & Context Managers ---
 
@@ -149,6 +249,64 @@ def parse_args() -> argparse.Namespace:
         default=DEFAULT_MODEL,
         help=f"The Ollama model to use. Default is {DEFAULT_MODEL}.",
     )
+    parser.add_argument(
+        "--max-chunk-chars",
+        type=int,
+        default=MAX_CHUNK_CHARS,
+        help=f"Edit texts longer than this in paragraph chunks (default: {MAX_CHUNK_CHARS}).",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=MAX_CONCURRENT_REQUESTS,
+        help=f"Maximum number of chunk requests in flight (default: {MAX_CONCURRENT_REQUESTS}).",
+    )
+    # Session arguments
+    parser.add_argument(
+        "--session",
+        action="store_true",
+        help="Keep the conversation across invocations on the same clipboard text.",
+    )
+    parser.add_argument(
+        "--session-ttl",
+        type=float,
+        default=SESSION_TTL,
+        help=f"Seconds of inactivity after which a session expires (default: {SESSION_TTL}).",
+    )
+    parser.add_argument(
+        "--session-file",
+        type=Path,
+        default=SESSION_FILE,
+        help=f"Where the session is stored (default: {SESSION_FILE}).",
+    )
+    # Cache arguments
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't look up or store results in the result cache.",
+    )
+    parser.add_argument(
+        "--cache-stats",
+        action="store_true",
+        help="Show the result cache size and hit rate and exit.",
+    )
+    # Tracing arguments
+    parser.add_argument(
+        "--trace-file",
+        type=Path,
+        default=TRACE_FILE,
+        help=f"JSONL file to append phase timings to (default: {TRACE_FILE}).",
+    )
+    parser.add_argument(
+        "--no-trace",
+        action="store_true",
+        help="Don't record phase timings for this run.",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Show per-phase latency percentiles from --trace-file and exit.",
+    )
     # General arguments
     parser.add_argument("--log-file", help="Path to log file (default: stdout only).")
     parser.add_argument(
@@ -184,13 +342,199 @@ def _print(console: Console | None, message, **kwargs):
         console.print(message, **kwargs)
 
 
-def get_clipboard_text(logger: logging.Logger, console: Console | None) -> str | None:
+class Tracer:
+    """Collect timed spans for a single run and append them to a JSONL file."""
+
+    def __init__(self, path: Path | None) -> None:
+        self.path = path
+        self.run_id = uuid.uuid4().hex
+        self.timestamp = time.time()
+        self.t0 = time.monotonic()
+        self.spans: list[dict] = []
+
+    def add(self, name: str, start: float, end: float) -> None:
+        """Record a span from `time.monotonic()` timestamps."""
+        self.spans.append(
+            {
+                "name": name,
+                "start": round(start - self.t0, 4),
+                "duration": round(end - start, 4),
+            }
+        )
+
+    @contextmanager
+    def span(self, name: str) -> Generator[None, None, None]:
+        """Time the enclosed block as a span called `name`."""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.monotonic())
+
+    def write(self, **metadata) -> None:
+        """Append this run as one JSON line, if anything was recorded."""
+        if self.path is None or not self.spans:
+            return
+        record = {
+            "run_id": self.run_id,
+            "timestamp": self.timestamp,
+            "total": round(time.monotonic() - self.t0, 4),
+            "spans": self.spans,
+            **metadata,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Linearly interpolated percentile of an already sorted list."""
+    k = (len(sorted_values) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def print_trace_report(path: Path, console: Console | None) -> None:
+    """Print per-phase latency percentiles across all runs in the trace file."""
+    if not path.exists():
+        _print(console, f"[yellow]No traces recorded yet at {path}.[/yellow]")
+        return
+    durations: dict[str, list[float]] = {}
+    n_runs = 0
+    with path.open() as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            n_runs += 1
+            durations.setdefault("total", []).append(record["total"])
+            for span in record["spans"]:
+                durations.setdefault(span["name"], []).append(span["duration"])
+
+    table = Table(title=f"Phase latency over {n_runs} run(s) (seconds)")
+    table.add_column("Phase", style="cyan")
+    for column in ["n", "mean", "p50", "p90", "p99", "max"]:
+        table.add_column(column, justify="right")
+    known = [name for name in TRACE_PHASES if name in durations]
+    other = sorted(set(durations) - set(TRACE_PHASES) - {"total"})
+    for name in [*known, *other, "total"]:
+        values = sorted(durations.get(name, []))
+        if not values:
+            continue
+        table.add_row(
+            name,
+            str(len(values)),
+            f"{sum(values) / len(values):.3f}",
+            *(f"{_percentile(values, q):.3f}" for q in (0.5, 0.9, 0.99)),
+            f"{values[-1]:.3f}",
+        )
+    if console is not None:
+        console.print(table)
+
+
+class Session:
+    """LLM message history shared by consecutive runs on the same clipboard lineage."""
+
+    def __init__(self, path: Path, model: str) -> None:
+        self.path = path
+        self.model = model
+        self.messages: list[ModelMessage] = []
+        self.last_output: str | None = None
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        model: str,
+        clipboard_text: str,
+        ttl: float,
+        logger: logging.Logger,
+    ) -> "Session":
+        """
+        Load the stored session if it is still valid for `clipboard_text`.
+        Otherwise return an empty session that will replace the stored one.
+        """
+        session = cls(path, model)
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return session
+
+        try:
+            if time.time() - data["updated_at"] > ttl:
+                logger.info("Session expired, starting a new one.")
+            elif data["model"] != model:
+                logger.info("Model changed, starting a new session.")
+            elif not cls._same_lineage(clipboard_text, data["last_output"]):
+                logger.info("Clipboard holds unrelated text, starting a new session.")
+            else:
+                messages = ModelMessagesTypeAdapter.validate_python(data["messages"])
+                session.messages = messages
+                session.last_output = data["last_output"]
+                logger.info("Continuing session with %d message(s).", len(messages))
+        except (KeyError, TypeError, ValidationError):
+            # Written by an older version or damaged; it is replaced after this run.
+            logger.warning("Ignoring unreadable session file %s.", path)
+        return session
+
+    @staticmethod
+    def _same_lineage(clipboard_text: str, last_output: str) -> bool:
+        """Whether the clipboard is the last result, possibly with small manual edits."""
+        if clipboard_text == last_output:
+            return True
+        if max(len(clipboard_text), len(last_output)) > SESSION_MAX_COMPARE_CHARS:
+            return False  # ratio() is quadratic in the worst case
+        matcher = difflib.SequenceMatcher(None, clipboard_text, last_output)
+        return (
+            matcher.real_quick_ratio() >= SESSION_SIMILARITY
+            and matcher.quick_ratio() >= SESSION_SIMILARITY
+            and matcher.ratio() >= SESSION_SIMILARITY
+        )
+
+    @property
+    def is_followup(self) -> bool:
+        return bool(self.messages)
+
+    def update(self, messages: list[ModelMessage], output: str) -> None:
+        """
+        Store the history after a run, together with its result.
+        Only the first request, which holds the system prompt, and the most recent
+        exchanges are kept, so long sessions don't grow the prompt without bound.
+        """
+        if len(messages) > SESSION_MAX_MESSAGES:
+            recent = messages[-(SESSION_MAX_MESSAGES - 1) :]
+            while recent and not isinstance(recent[0], ModelRequest):
+                recent = recent[1:]
+            messages = [messages[0], *recent]
+        self.messages = messages
+        self.last_output = output
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "updated_at": time.time(),
+            "model": self.model,
+            "last_output": output,
+            "messages": ModelMessagesTypeAdapter.dump_python(messages, mode="json"),
+        }
+        self.path.write_text(json.dumps(data))
+
+    def clear(self) -> None:
+        """Forget the stored session."""
+        self.messages = []
+        self.last_output = None
+        self.path.unlink(missing_ok=True)
+
+
+async def get_clipboard_text(
+    logger: logging.Logger, console: Console | None
+) -> str | None:
     """
     Retrieves text from the clipboard.
     Returns the text or None if clipboard is empty or an error occurs.
     """
     try:
-        original_text = pyperclip.paste()
+        original_text = await clipboard.paste_async()
         if not original_text or not original_text.strip():
             _print(
                 console,
@@ -198,7 +542,7 @@ def get_clipboard_text(logger: logging.Logger, console: Console | None) -> str |
             )
             return None
         return original_text
-    except pyperclip.PyperclipException as e:
+    except clipboard.ClipboardError as e:
         logger.error("Could not read from clipboard: %s", e)
         _print(console, f"[bold red]❌ Error reading from clipboard:[/bold red] {e}")
         return None
@@ -233,7 +577,12 @@ def list_input_devices(pa: pyaudio.PyAudio, console: Console | None) -> None:
     for i in range(pa.get_device_count()):
         info = pa.get_device_info_by_index(i)
         if info.get("maxInputChannels", 0) > 0:
-            _print(console, f"  [yellow]{i}[/yellow]: {info['name']}")
+            _print(
+                console,
+                f"  [yellow]{i}[/yellow]: {info['name']}"
+                f" [dim]({info['defaultSampleRate']:.0f} Hz,"
+                f" {info['maxInputChannels']} ch)[/dim]",
+            )
 
 
 # --- ASR (Transcription) Logic ---
@@ -241,41 +590,25 @@ def list_input_devices(pa: pyaudio.PyAudio, console: Console | None) -> None:
 
 async def send_audio(
     client: AsyncClient,
-    stream: pyaudio.Stream,
-    stop_event: asyncio.Event,
+    audio_queue: asyncio.Queue[bytes | None],
+    stats: AudioStats,
     logger: logging.Logger,
     console: Console | None,
 ):
-    """Read from mic and send to Wyoming server."""
+    """Send captured (and any buffered) audio to the Wyoming server."""
     await client.write_event(Transcribe().event())
     await client.write_event(AudioStart(rate=RATE, width=2, channels=CHANNELS).event())
 
     try:
-        live_cm = (
-            Live(
-                Text("Listening...", style="blue"),
-                console=console,
-                transient=True,
-                refresh_per_second=10,
-            )
-            if console
-            else nullcontext()
-        )
-        with live_cm as live:
-            seconds_streamed = 0
-            while not stop_event.is_set():
-                chunk = await asyncio.to_thread(stream.read, CHUNK_SIZE, False)
+        async with live_status(stats, console, "Listening..."):
+            while (chunk := await audio_queue.get()) is not None:
                 await client.write_event(
                     AudioChunk(
                         rate=RATE, width=2, channels=CHANNELS, audio=chunk
                     ).event()
                 )
                 logger.debug("Sent %d byte(s) of audio", len(chunk))
-                if console:
-                    seconds_streamed += len(chunk) / (RATE * CHANNELS * 2)
-                    live.update(
-                        Text(f"Listening... ({seconds_streamed:.1f}s)", style="blue")
-                    )
+                stats.add_sent(chunk)
     finally:
         await client.write_event(AudioStop().event())
         logger.debug("Sent AudioStop")
@@ -312,48 +645,60 @@ async def receive_text(
     return transcript_text
 
 
-async def get_voice_instruction(
+async def connect_asr(
     args: argparse.Namespace,
     logger: logging.Logger,
-    p: pyaudio.PyAudio,
-    stop_event: asyncio.Event,
     console: Console | None,
-) -> str | None:
-    """Connects to ASR server and returns the transcribed instruction."""
+    tracer: Tracer,
+) -> AsyncClient | None:
+    """Connect to the ASR server, returning None if the connection fails."""
     uri = f"tcp://{args.asr_server_ip}:{args.asr_server_port}"
     logger.info("Connecting to Wyoming server at %s", uri)
-
+    client = AsyncClient.from_uri(uri)
     try:
-        async with AsyncClient.from_uri(uri) as client:
-            logger.info("ASR connection established")
-            _print(console, "[green]Listening for your command...[/green]")
-
-            with open_pyaudio_stream(
-                p,
-                format=FORMAT,
-                channels=CHANNELS,
-                rate=RATE,
-                input=True,
-                frames_per_buffer=CHUNK_SIZE,
-                input_device_index=args.device_index,
-            ) as stream:
-                send_task = asyncio.create_task(
-                    send_audio(client, stream, stop_event, logger, console)
-                )
-                recv_task = asyncio.create_task(receive_text(client, logger, console))
-                done, pending = await asyncio.wait(
-                    [send_task, recv_task], return_when=asyncio.ALL_COMPLETED
-                )
-                for task in pending:
-                    task.cancel()
-                # The result of recv_task is the transcript string
-                return next(t.result() for t in done if t is recv_task)
+        with tracer.span("asr_connect"):
+            await client.connect()
     except ConnectionRefusedError:
         _print(
             console,
             f"[bold red]ASR Connection refused.[/bold red] Is the server at {uri} running?",
         )
         return None
+    except Exception as e:
+        logger.exception("Could not connect to the ASR server: %s", e)
+        _print(console, f"[bold red]Transcription error:[/bold red] {e}")
+        return None
+    logger.info("ASR connection established")
+    return client
+
+
+async def get_voice_instruction(
+    client: AsyncClient,
+    audio_queue: asyncio.Queue[bytes | None],
+    stats: AudioStats,
+    logger: logging.Logger,
+    console: Console | None,
+    tracer: Tracer,
+    t_record: float,
+) -> str | None:
+    """Streams the captured audio to the ASR server and returns the transcribed instruction."""
+    _print(console, "[green]Listening for your command...[/green]")
+    try:
+        send_task = asyncio.create_task(
+            send_audio(client, audio_queue, stats, logger, console)
+        )
+        recv_task = asyncio.create_task(receive_text(client, logger, console))
+        # Recording ends when AudioStop is sent, then we wait for the transcript.
+        try:
+            await send_task
+        except BaseException:
+            recv_task.cancel()
+            raise
+        t_stopped = time.monotonic()
+        tracer.add("recording", t_record, t_stopped)
+        transcript = await recv_task
+        tracer.add("transcript_wait", t_stopped, time.monotonic())
+        return transcript
     except Exception as e:
         logger.exception("An error occurred during transcription: %s", e)
         _print(console, f"[bold red]Transcription error:[/bold red] {e}")
@@ -365,21 +710,133 @@ async def get_voice_instruction(
 
 def build_agent(model: str) -> Agent:
     """Construct and return a PydanticAI agent configured for local Ollama."""
-    ollama_provider = OpenAIProvider(base_url=f"{MY_OLLAMA_HOST}/v1")
-    ollama_model = OpenAIModel(model_name=model, provider=ollama_provider)
     return Agent(
-        model=ollama_model,
+        model=build_model(model),
         system_prompt=SYSTEM_PROMPT,
         instructions=AGENT_INSTRUCTIONS,
     )
 
 
+def is_question(instruction: str) -> bool:
+    """Return True if the instruction asks about the text rather than editing it."""
+    return instruction.rstrip().endswith("?") or bool(
+        QUESTION_PATTERN.search(instruction)
+    )
+
+
+def split_into_chunks(text: str, max_chars: int) -> list[str]:
+    """
+    Split text on paragraph boundaries into chunks of roughly `max_chars`.
+    Separators stay attached to their paragraph, so `"".join(chunks) == text`.
+    A Markdown heading starts a new chunk once the current one is half full.
+    """
+    parts = PARAGRAPH_SEPARATOR.split(text)
+    # Pair each paragraph with the separator that follows it.
+    blocks = [
+        parts[i] + (parts[i + 1] if i + 1 < len(parts) else "")
+        for i in range(0, len(parts), 2)
+    ]
+    chunks: list[str] = []
+    current = ""
+    for block in blocks:
+        starts_section = (
+            block.lstrip().startswith("#") and len(current) > max_chars // 2
+        )
+        if current and (len(current) + len(block) > max_chars or starts_section):
+            chunks.append(current)
+            current = ""
+        current += block
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _chunk_context(previous_chunk: str, overlap_chars: int) -> str:
+    """Return the tail of the previous chunk, starting at a word boundary."""
+    tail = previous_chunk.strip()[-overlap_chars:]
+    if len(tail) == overlap_chars and " " in tail:
+        tail = tail.split(" ", 1)[1]
+    return tail
+
+
+async def _run_agent(
+    agent: Agent,
+    user_input: str,
+    first_token_at: list[float],
+    session: Session | None = None,
+) -> str:
+    """
+    Stream a single agent run, appending the time of its first token to `first_token_at`.
+    With a session, the run continues its history and the session is updated afterwards.
+    """
+    message_history = session.messages if session is not None else None
+    async with agent.run_stream(user_input, message_history=message_history) as result:
+        async for _ in result.stream_text(delta=True):
+            if not first_token_at:
+                first_token_at.append(time.monotonic())
+        output = await result.get_output()
+    if session is not None:
+        session.update(result.all_messages(), output)
+    return output
+
+
+async def _process_chunks(
+    agent: Agent,
+    chunks: list[str],
+    instruction: str,
+    max_concurrency: int,
+    first_token_at: list[float],
+) -> str:
+    """Edit chunks concurrently and stitch the results back together in order."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def process_chunk(i: int) -> str:
+        chunk = chunks[i]
+        core = chunk.strip()
+        if not core:
+            return chunk
+        context = _chunk_context(chunks[i - 1], CHUNK_OVERLAP_CHARS) if i else ""
+        user_input = CHUNK_PROMPT_TEMPLATE.format(
+            context=context, original_text=core, instruction=instruction
+        )
+        async with semaphore:
+            output = await _run_agent(agent, user_input, first_token_at)
+        # Keep the original surrounding whitespace so paragraphs stay separated.
+        leading = chunk[: len(chunk) - len(chunk.lstrip())]
+        trailing = chunk[len(chunk.rstrip()) :]
+        return f"{leading}{output.strip()}{trailing}"
+
+    results = await asyncio.gather(*(process_chunk(i) for i in range(len(chunks))))
+    return "".join(results)
+
+
 async def process_with_llm(
-    agent: Agent, original_text: str, instruction: str
+    agent: Agent,
+    original_text: str,
+    instruction: str,
+    max_chunk_chars: int = MAX_CHUNK_CHARS,
+    max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    tracer: Tracer | None = None,
+    session: Session | None = None,
 ) -> tuple[str, float]:
-    """Run the agent asynchronously and return corrected text and elapsed time."""
+    """Run the agent asynchronously and return corrected text and elapsed time.
+
+    Long texts with an editing instruction are split on paragraph boundaries and
+    processed in concurrent chunks; questions always see the full text.
+    In a session follow-up, only the instruction is sent on top of the history.
+    """
     t_start = time.monotonic()
-    user_input = f"""
+    first_token_at: list[float] = []
+    chunks = (
+        split_into_chunks(original_text, max_chunk_chars)
+        if len(original_text) > max_chunk_chars and not is_question(instruction)
+        else [original_text]
+    )
+    if session is not None and session.is_followup:
+        if original_text == session.last_output:
+            user_input = FOLLOWUP_PROMPT_TEMPLATE.format(instruction=instruction)
+        else:  # The result was edited by hand, so send the current version along
+            user_input = f"""
 <original-text>
 {original_text}
 </original-text>
@@ -388,9 +845,30 @@ async def process_with_llm(
 {instruction}
 </instruction>
 """
-    result = await agent.run(user_input)
+        output = await _run_agent(agent, user_input, first_token_at, session)
+    elif len(chunks) > 1:
+        if session is not None:
+            session.clear()  # Chunked runs have no single history to continue
+        output = await _process_chunks(
+            agent, chunks, instruction, max_concurrency, first_token_at
+        )
+    else:
+        user_input = f"""
+<original-text>
+{original_text}
+</original-text>
+
+<instruction>
+{instruction}
+</instruction>
+"""
+        output = await _run_agent(agent, user_input, first_token_at, session)
     t_end = time.monotonic()
-    return result.output, t_end - t_start
+    if tracer is not None:
+        t_first = first_token_at[0] if first_token_at else t_end
+        tracer.add("llm_ttft", t_start, t_first)
+        tracer.add("llm_generation", t_first, t_end)
+    return output, t_end - t_start
 
 
 async def process_and_update_clipboard(
@@ -399,27 +877,55 @@ async def process_and_update_clipboard(
     console: Console | None,
     original_text: str,
     instruction: str,
+    tracer: Tracer,
+    session: Session | None,
 ):
     """
     Processes the text with the LLM, updates the clipboard, and displays the result.
     In quiet mode, only the result is printed to stdout.
     """
     agent = build_agent(args.model)
+    # Sessions bypass the cache: follow-ups depend on the history, and a hit would
+    # neither start nor extend the session.
+    cache = None if args.no_cache or session is not None else ResultCache()
+    key = cache_key(
+        text_hash(original_text),
+        normalize_instruction(instruction),
+        args.model,
+        PROMPT_VERSION,
+    )
     try:
-        status_cm = (
-            Status(
-                f"[bold yellow]🤖 Applying instruction with {args.model}...[/bold yellow]",
-                console=console,
-            )
-            if console
-            else nullcontext()
-        )
-        with status_cm:
-            result_text, elapsed = await process_with_llm(
-                agent, original_text, instruction
+        cached_text = None
+        if cache is not None:
+            with tracer.span("cache_lookup"):
+                cached_text = cache.get(key)
+        if cached_text is not None:
+            result_text, elapsed = cached_text, 0.0
+            logger.info("Result served from cache.")
+        else:
+            status_cm = (
+                Status(
+                    f"[bold yellow]🤖 Applying instruction with {args.model}...[/bold yellow]",
+                    console=console,
+                )
+                if console
+                else nullcontext()
             )
+            with status_cm:
+                result_text, elapsed = await process_with_llm(
+                    agent,
+                    original_text,
+                    instruction,
+                    max_chunk_chars=args.max_chunk_chars,
+                    max_concurrency=args.max_concurrency,
+                    tracer=tracer,
+                    session=session,
+                )
+            if cache is not None:
+                cache.set(key, result_text)
 
-        pyperclip.copy(result_text)
+        with tracer.span("clipboard_write"):
+            await clipboard.copy_async(result_text)
         logger.info("Copied result to clipboard.")
 
         if console:
@@ -428,9 +934,15 @@ async def process_and_update_clipboard(
                     result_text,
                     title="[bold green]✨ Result (Copied to Clipboard)[/bold green]",
                     border_style="green",
-                    subtitle=f"[dim]took {elapsed:.2f}s[/dim]",
+                    subtitle=(
+                        "[dim]from cache[/dim]"
+                        if cached_text is not None
+                        else f"[dim]took {elapsed:.2f}s{served_by()}[/dim]"
+                    ),
                 )
             )
+            if cache is not None:
+                console.print(f"[dim]🗄️  Cache: {cache.summary()}[/dim]")
         else:
             # Quiet mode: print result to stdout for Keyboard Maestro to capture
             print(result_text)
@@ -443,7 +955,7 @@ async def process_and_update_clipboard(
         )
         _print(
             console,
-            f"   Please check your Ollama server at [cyan]{MY_OLLAMA_HOST}[/cyan]",
+            f"   Please check your Ollama server at [cyan]{get_pool().describe()}[/cyan]",
         )
         sys.exit(1)
 
@@ -457,27 +969,37 @@ async def main() -> None:
     logger = setup_logging(args)
     console = Console() if not args.quiet else None
 
+    if args.report:
+        print_trace_report(args.trace_file, console or Console())
+        return
+    if args.cache_stats:
+        print(f"🗄️  {ResultCache().summary()}")
+        return
+
+    tracer = Tracer(None if args.no_trace or args.list_devices else args.trace_file)
+    try:
+        await run_assistant(args, logger, console, tracer)
+    finally:
+        tracer.write(model=args.model)
+
+
+async def run_assistant(
+    args: argparse.Namespace,
+    logger: logging.Logger,
+    console: Console | None,
+    tracer: Tracer,
+) -> None:
+    """Read the clipboard, listen for an instruction, and apply it.
+
+    The microphone starts recording right away; the clipboard read and the ASR
+    connection happen concurrently while audio is buffered.
+    """
+    t_init = time.monotonic()
     with pyaudio_context() as p:
         if args.list_devices:
             list_input_devices(p, console)
             return
 
-        original_text = get_clipboard_text(logger, console)
-        if not original_text:
-            return
-
-        _print(console, Panel(original_text, title="[cyan]📝 Text to Process[/cyan]"))
-        if args.device_index is not None:
-            _print(
-                console,
-                f"🎤 Using device [bold yellow]{args.device_index}[/bold yellow]",
-            )
-        else:
-            _print(
-                console,
-                "[bold yellow]⚠️  No --device-index specified. Using default system input.[/bold yellow]",
-            )
-
         loop = asyncio.get_running_loop()
         stop_event = asyncio.Event()
 
@@ -489,14 +1011,85 @@ async def main() -> None:
         loop.add_signal_handler(signal.SIGINT, shutdown_handler)
         loop.add_signal_handler(signal.SIGTERM, shutdown_handler)
 
-        instruction = await get_voice_instruction(args, logger, p, stop_event, console)
+        # Open the mic at its own format; chunks are converted to RATE mono.
+        native_rate, native_channels = native_format(p, args.device_index)
+        resampler = Resampler(native_rate, native_channels, RATE)
+        frames = resampler.input_frames(CHUNK_SIZE)
+        logger.debug("Capturing at %d Hz, %d channel(s)", native_rate, native_channels)
+        stats = AudioStats()
+        with open_pyaudio_stream(
+            p,
+            format=FORMAT,
+            channels=native_channels,
+            rate=native_rate,
+            input=True,
+            frames_per_buffer=frames,
+            input_device_index=args.device_index,
+        ) as stream:
+            t_record = time.monotonic()
+            tracer.add("pyaudio_init", t_init, t_record)
+            async with capture_audio(
+                stream, frames, stop_event, logger, resampler, stats
+            ) as audio_queue:
+                connect_task = asyncio.create_task(
+                    connect_asr(args, logger, console, tracer)
+                )
+                with tracer.span("clipboard_read"):
+                    original_text = await get_clipboard_text(logger, console)
+                if not original_text:
+                    connect_task.cancel()
+                    client = None
+                    with suppress(asyncio.CancelledError):
+                        client = await connect_task
+                    if client is not None:
+                        await client.disconnect()
+                    return
+
+                _print(
+                    console,
+                    Panel(original_text, title="[cyan]📝 Text to Process[/cyan]"),
+                )
+                if args.device_index is not None:
+                    _print(
+                        console,
+                        f"🎤 Using device [bold yellow]{args.device_index}[/bold yellow]",
+                    )
+                else:
+                    _print(
+                        console,
+                        "[bold yellow]⚠️  No --device-index specified. Using default system input.[/bold yellow]",
+                    )
+
+                client = await connect_task
+                if client is None:
+                    return
+                try:
+                    instruction = await get_voice_instruction(
+                        client, audio_queue, stats, logger, console, tracer, t_record
+                    )
+                finally:
+                    await client.disconnect()
 
         if not instruction or not instruction.strip():
             _print(console, "[yellow]No instruction was transcribed. Exiting.[/yellow]")
             return
 
+        session = (
+            Session.load(
+                args.session_file,
+                args.model,
+                original_text,
+                args.session_ttl,
+                logger,
+            )
+            if args.session
+            else None
+        )
+        if session is not None and session.is_followup:
+            _print(console, "[dim]🔁 Continuing previous session[/dim]")
+
         await process_and_update_clipboard(
-            args, logger, console, original_text, instruction
+            args, logger, console, original_text, instruction, tracer, session
         )
 
 
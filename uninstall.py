@@ -1,18 +1,31 @@
 #!/usr/bin/env -S uv run --with pyyaml
 
+import json
 import os
 
 import yaml
 
 CONFIG = "install.conf.yaml"
+# Written by scripts/links.py: the links that were installed, and their sources.
+MANIFEST = os.path.expanduser("~/.local/state/dotfiles/links.json")
 
-stream = open(CONFIG)
-conf = yaml.load(stream, yaml.FullLoader)
+if os.path.exists(MANIFEST):
+    with open(MANIFEST) as f:
+        manifest = json.load(f)
+    for realpath, source in manifest.items():
+        # Only remove links that still point where they were installed to.
+        if os.path.islink(realpath) and os.readlink(realpath) == source:
+            print("Removing ", realpath)
+            os.unlink(realpath)
+    os.remove(MANIFEST)
+else:
+    stream = open(CONFIG)
+    conf = yaml.load(stream, yaml.FullLoader)
 
-for section in conf:
-    if "link" in section:
-        for target in section["link"]:
-            realpath = os.path.expanduser(target)
-            if os.path.islink(realpath):
-                print("Removing ", realpath)
-                os.unlink(realpath)
+    for section in conf:
+        if "link" in section:
+            for target in section["link"]:
+                realpath = os.path.expanduser(target)
+                if os.path.islink(realpath):
+                    print("Removing ", realpath)
+                    os.unlink(realpath)